@@ -1,30 +1,47 @@
 import sys
 import os
-import customtkinter as ctk
+import multiprocessing
 
+if __name__ == "__main__":
+    # The vision worker process starts the exe again - hand over to it
+    # before the GUI modules are loaded (no-op when not frozen)
+    multiprocessing.freeze_support()
+
+# Import the profiler first so that everything after it is measured
+from src.core.startup_profiler import profiler, import_timing_requested
 
+if import_timing_requested():
+    profiler.enable_import_timing()
 
-from src.core.config import Config
-from src.gui.main_window import HarvestBotGUI
+with profiler.phase("imports"):
+    import customtkinter as ctk
+
+    from src.core.config import Config
+    from src.gui.main_window import HarvestBotGUI
 
 def main():
     """
     Initializes and runs the Magic Garden Bot application.
     """
     # Load the configuration at the very start
-    Config.load()
+    with profiler.phase("config"):
+        Config.load()
 
     # Set up customtkinter appearance
     ctk.set_appearance_mode("Dark")
     ctk.set_default_color_theme("blue")
 
     # Set up the main GUI window
-    root = ctk.CTk()
+    with profiler.phase("window"):
+        root = ctk.CTk()
     
     # The HarvestBotGUI class now handles all application logic.
     # We just need to create an instance of it.
     app = HarvestBotGUI(root)
     
+    # Heavy automation modules are warmed up after the first paint
+    profiler.watch_first_paint(root, app.on_first_paint)
+
     # Check for updates on startup (runs silently in background)
     app.check_for_updates_on_startup()
 
@@ -34,6 +51,12 @@ def main():
     except KeyboardInterrupt:
         print("\nApplication closed.")
         root.destroy()
+    finally:
+        # Stop background jobs (the bot run, downloads) so exit does not wait on them
+        from src.core.jobs import executor
+        executor.shutdown()
+        # Write any debounced config changes before exiting
+        Config.flush()
 
 if __name__ == "__main__":
     try:
@@ -12,12 +12,15 @@ import pyautogui
 import time
 import sys
 import os
+from collections import deque
 from pynput.keyboard import Controller, Key
 
 import numpy as np
-from PIL import ImageGrab
 
 from . import state
+from . import vision
+from . import capture
+from . import vision_worker
 from .config import Config
 
 # Failsafe - moving mouse to top-left corner will stop the script
@@ -76,48 +79,37 @@ def resource_path(relative_path):
 
 def _capture_screen(bottom_half=False):
     """
-    Capture the screen and return as numpy array.
+    Capture the configured capture target and return it as numpy array.
     
     Args:
-        bottom_half: If True, only capture bottom half of screen
+        bottom_half: If True, only capture the bottom half of the target
         
     Returns:
-        tuple: (screenshot_np, offset_y, offset_x)
+        tuple: (screenshot_np, offset_y, offset_x) - the offsets are the
+            absolute screen position of the top-left pixel (negative on
+            monitors left of or above the primary one)
     """
-    try:
-        # Try to capture all screens (works on Windows with multiple monitors)
-        screenshot = ImageGrab.grab(all_screens=True)
-    except Exception:
-        # Fallback to default if all_screens not supported
-        screenshot = ImageGrab.grab()
-    
-    screenshot_np = np.array(screenshot)
-    
-    if bottom_half:
-        screen_height = screenshot_np.shape[0]
-        screenshot_np = screenshot_np[screen_height // 2:, :, :]
-        return screenshot_np, screen_height // 2, 0
-    
-    return screenshot_np, 0, 0
+    screenshot_np, (left, top) = capture.target.grab(bottom_half)
+    return screenshot_np, top, left
 
 
-def _load_template(image_path, grayscale=True):
+def get_template(image_path, grayscale=True):
     """
-    Load a template image for matching.
+    Return a template from the registry, loading it on first use.
     
     Args:
         image_path: Path to the template image
         grayscale: If True, load as grayscale
         
     Returns:
-        numpy.ndarray or None: Loaded template or None if failed
+        vision.Template or None: Template (image and binary version) or
+            None if it could not be loaded
     """
     if not CV2_AVAILABLE:
         return None
     
     full_path = resource_path(image_path)
-    mode = cv2.IMREAD_GRAYSCALE if grayscale else cv2.IMREAD_COLOR
-    template = cv2.imread(full_path, mode)
+    template = vision.templates.get(full_path, grayscale)
     
     if template is None:
         print(f"ERROR: Could not load template image: {full_path}")
@@ -125,13 +117,53 @@ def _load_template(image_path, grayscale=True):
     return template
 
 
+def warm_up_vision():
+    """
+    Load all templates and warm up OpenCV against a dummy frame of the capture target's size.
+    
+    The thread benchmark is skipped if the bot is already running.
+    
+    Returns:
+        dict or None: See vision.warm_up()
+    """
+    try:
+        left, top, right, bottom = capture.target.bbox()
+        frame_size = (right - left, bottom - top)
+    except Exception:
+        frame_size = None
+    return vision.warm_up(
+        resource_path(Config.IMAGE_FOLDER), frame_size,
+        abort_benchmark=lambda: state.bot_running
+    )
+
+
+def reserve_vision_buffers():
+    """
+    Allocate the calling thread's detection buffers for the capture target.
+    
+    Called on the bot thread when a run starts (see vision.reserve_buffers).
+    """
+    if not CV2_AVAILABLE:
+        return
+    try:
+        left, top, right, bottom = capture.target.bbox()
+        frame_size = (right - left, bottom - top)
+    except Exception:
+        frame_size = vision.DEFAULT_FRAME_SIZE
+    vision.reserve_buffers(frame_size)
+
+
 def _match_template(screenshot_np, template, grayscale=True, threshold=True):
     """
     Perform template matching on a screenshot.
     
+    The converted screenshot and the match result are written into reused
+    buffers (see vision.BufferPool), and the binary template comes from
+    the registry, so a check allocates nothing once the buffers exist.
+    
     Args:
         screenshot_np: Screenshot as numpy array (RGB format)
-        template: Template image as numpy array
+        template: vision.Template from get_template()
         grayscale: If True, convert to grayscale
         threshold: If True, apply binary threshold for better matching
         
@@ -143,24 +175,45 @@ def _match_template(screenshot_np, template, grayscale=True, threshold=True):
     """
     # Convert to grayscale if needed
     if grayscale:
-        screenshot_gray = cv2.cvtColor(screenshot_np, cv2.COLOR_RGB2GRAY)
+        screenshot_gray = vision.to_gray(screenshot_np)
         if threshold:
-            _, screenshot_processed = cv2.threshold(screenshot_gray, 200, 255, cv2.THRESH_BINARY)
-            _, template_processed = cv2.threshold(template, 200, 255, cv2.THRESH_BINARY)
+            screenshot_processed = vision.to_binary(screenshot_gray)
+            template_processed = template.binary
         else:
             screenshot_processed = screenshot_gray
-            template_processed = template
+            template_processed = template.image
     else:
-        screenshot_processed = cv2.cvtColor(screenshot_np, cv2.COLOR_RGB2BGR)
-        template_processed = template
+        screenshot_processed = vision.to_bgr(screenshot_np)
+        template_processed = template.image
     
     # Perform template matching
-    result = cv2.matchTemplate(screenshot_processed, template_processed, cv2.TM_CCOEFF_NORMED)
+    max_loc, max_val = vision.match(screenshot_processed, template_processed)
     
-    # Find the maximum match
-    _, max_val, _, max_loc = cv2.minMaxLoc(result)
+    return max_loc, max_val, template.shape
+
+
+def _find_template(template, grayscale=True, bottom_half=False):
+    """
+    Find the best match of a template in a new capture.
+    
+    Uses the vision worker process when it is running and watches this
+    template (it matches the whole capture target, grayscale and
+    thresholded); otherwise, or if the worker does not answer in time,
+    captures and matches in this process.
+    
+    Returns:
+        tuple: (x, y, max_val) with x, y in screen coordinates
+    """
+    if grayscale and not bottom_half and vision_worker.worker.handles(template.name):
+        detected = vision_worker.worker.detect(template.name)
+        if detected is not None:
+            x, y, max_val, _ = detected
+            return x, y, max_val
     
-    return max_loc, max_val, template.shape[:2]
+    screenshot_np, offset_y, offset_x = _capture_screen(bottom_half)
+    vision.buffers.count_detection(screenshot_np)
+    max_loc, max_val, _ = _match_template(screenshot_np, template, grayscale)
+    return max_loc[0] + offset_x, max_loc[1] + offset_y, max_val
 
 
 def locate_image(image, confidence, bottom_half=False, grayscale=True):
@@ -185,19 +238,17 @@ def locate_image(image, confidence, bottom_half=False, grayscale=True):
     
     try:
         # Load template
-        template = _load_template(image, grayscale)
+        template = get_template(image, grayscale)
         if template is None:
             return None
         
-        # Capture screen
-        screenshot_np, offset_y, offset_x = _capture_screen(bottom_half)
-        
-        # Match template
-        max_loc, max_val, (h, w) = _match_template(screenshot_np, template, grayscale)
+        # Capture and match
+        x, y, max_val = _find_template(template, grayscale, bottom_half)
+        h, w = template.shape
         
         # Check confidence threshold
         if max_val >= confidence:
-            return (max_loc[0] + offset_x, max_loc[1] + offset_y, w, h)
+            return (x, y, w, h)
         
         return None
         
@@ -231,19 +282,17 @@ def locate_image_with_confidence(image, confidence, bottom_half=False, grayscale
     
     try:
         # Load template
-        template = _load_template(image, grayscale)
+        template = get_template(image, grayscale)
         if template is None:
             return None, 0.0
         
-        # Capture screen
-        screenshot_np, offset_y, offset_x = _capture_screen(bottom_half)
-        
-        # Match template
-        max_loc, max_val, (h, w) = _match_template(screenshot_np, template, grayscale)
+        # Capture and match
+        x, y, max_val = _find_template(template, grayscale, bottom_half)
+        h, w = template.shape
         
         # Return location if above threshold, always return confidence
         if max_val >= confidence:
-            return (max_loc[0] + offset_x, max_loc[1] + offset_y, w, h), max_val
+            return (x, y, w, h), max_val
         
         return None, max_val
         
@@ -253,6 +302,36 @@ def locate_image_with_confidence(image, confidence, bottom_half=False, grayscale
         return None, 0.0
 
 
+# =============================================================================
+# VISION WORKER
+# =============================================================================
+
+# Templates the vision worker matches on every frame (the per-plot checks)
+WORKER_DETECTORS = ("inventory_full.png", "harvest_button.png")
+
+
+def start_vision_worker():
+    """
+    Start the vision worker process if VISION_WORKER_ENABLED is set.
+    
+    Returns:
+        bool: True if the worker is running
+    """
+    if not Config.VISION_WORKER_ENABLED or not CV2_AVAILABLE:
+        return False
+    detectors = {}
+    for file_name in WORKER_DETECTORS:
+        template = get_template(os.path.join(Config.IMAGE_FOLDER, file_name))
+        if template is not None:
+            detectors[template.name] = template.path
+    return vision_worker.worker.start(detectors)
+
+
+def stop_vision_worker():
+    """Stop the vision worker process (no-op if it is not running)."""
+    vision_worker.worker.stop()
+
+
 # =============================================================================
 # IMAGE DETECTION CHECKS
 # =============================================================================
@@ -295,6 +374,174 @@ def check_harvest_button():
     return locate_image(image_path, confidence=Config.CONFIDENCE, grayscale=True) is not None
 
 
+# =============================================================================
+# MOTION DETECTION UTILITIES
+# =============================================================================
+
+# Size of the centered screen region watched for player/camera motion,
+# as a fraction of the screen width and height
+PLAYER_ROI_FRACTION = 0.25
+
+# Pixel step used to downsample motion frames (higher = cheaper)
+MOTION_DOWNSAMPLE = 4
+
+_player_roi = {'target': None, 'bbox': None}
+
+
+def _get_player_roi_bbox():
+    """Return the (left, top, right, bottom) box around the capture target's center."""
+    target_bbox = capture.target.bbox()
+    if _player_roi['target'] != target_bbox:
+        left, top, right, bottom = target_bbox
+        roi_w = int((right - left) * PLAYER_ROI_FRACTION)
+        roi_h = int((bottom - top) * PLAYER_ROI_FRACTION)
+        roi_left = left + (right - left - roi_w) // 2
+        roi_top = top + (bottom - top - roi_h) // 2
+        _player_roi.update(target=target_bbox, bbox=(roi_left, roi_top, roi_left + roi_w, roi_top + roi_h))
+    return _player_roi['bbox']
+
+
+def capture_player_roi():
+    """
+    Capture a small, downsampled grayscale frame around the player.
+    
+    The game camera keeps the character centered, so movement shows up
+    as change in the middle of the screen.
+    
+    Returns:
+        numpy.ndarray: 2D uint8 array
+    """
+    frame = capture.grab_region(_get_player_roi_bbox())
+    frame = frame[::MOTION_DOWNSAMPLE, ::MOTION_DOWNSAMPLE]
+    if CV2_AVAILABLE:
+        return cv2.cvtColor(np.ascontiguousarray(frame[:, :, :3]), cv2.COLOR_RGB2GRAY)
+    return frame[:, :, :3].mean(axis=2).astype(np.uint8)
+
+
+def frame_difference(frame_a, frame_b):
+    """
+    Mean absolute difference between two motion frames.
+    
+    Returns:
+        float: 0.0 (identical) to 1.0 (completely different)
+    """
+    if CV2_AVAILABLE:
+        return float(cv2.absdiff(frame_a, frame_b).mean()) / 255.0
+    diff = np.abs(frame_a.astype(np.int16) - frame_b.astype(np.int16))
+    return float(diff.mean()) / 255.0
+
+
+# Frame difference that counts as the view having started to move
+MOTION_START_THRESHOLD = 0.01
+
+# Frame difference between consecutive frames below which the view is still
+SETTLE_THRESHOLD = 0.004
+
+# Consecutive still frames required before motion counts as settled
+SETTLE_STILL_FRAMES = 2
+
+# Pause between settle polls (seconds)
+SETTLE_POLL_INTERVAL = 0.01
+
+# Settle times kept for percentile statistics
+SETTLE_HISTORY = 200
+
+_settle_times = deque(maxlen=SETTLE_HISTORY)
+_settle_totals = {'count': 0, 'timeouts': 0, 'total_time': 0.0}
+
+
+def wait_for_motion_settle(reference, timeout):
+    """
+    Wait until the view around the player has moved and come to rest.
+    
+    Motion has settled once the view differs from the reference frame and
+    SETTLE_STILL_FRAMES consecutive frames are (nearly) identical. If that
+    does not happen within the timeout (e.g. the move was blocked), the
+    full timeout is used, so this is never slower than a fixed delay.
+    
+    Args:
+        reference: Frame captured with capture_player_roi() before the keypress
+        timeout: Maximum time to wait in seconds
+        
+    Returns:
+        float: Seconds waited (not counting time paused)
+    
+    Raises:
+        Cancelled: If the run is stopped while waiting
+    """
+    start = time.perf_counter()
+    deadline = start + timeout
+    previous = reference
+    moved = False
+    still_frames = 0
+    settled = False
+    
+    while time.perf_counter() < deadline:
+        frame = capture_player_roi()
+        if not moved:
+            moved = frame_difference(reference, frame) >= MOTION_START_THRESHOLD
+        elif frame_difference(previous, frame) <= SETTLE_THRESHOLD:
+            still_frames += 1
+            if still_frames >= SETTLE_STILL_FRAMES:
+                settled = True
+                break
+        else:
+            still_frames = 0
+        previous = frame
+        
+        remaining = deadline - time.perf_counter()
+        if remaining > 0:
+            # Cut short by STOP and held by PAUSE; time paused does not count
+            interval = min(SETTLE_POLL_INTERVAL, remaining)
+            slept_from = time.perf_counter()
+            state.cancel_token.wait(interval)
+            held = time.perf_counter() - slept_from - interval
+            if held > SETTLE_POLL_INTERVAL:
+                start += held
+                deadline += held
+    
+    elapsed = time.perf_counter() - start
+    _settle_times.append(elapsed)
+    _settle_totals['count'] += 1
+    _settle_totals['total_time'] += elapsed
+    if not settled:
+        _settle_totals['timeouts'] += 1
+    return elapsed
+
+
+def get_settle_stats():
+    """
+    Summarise the settle times measured by wait_for_motion_settle().
+    
+    Returns:
+        dict: count, timeouts, avg_ms, and min/median/p95/max over recent moves
+    """
+    count = _settle_totals['count']
+    recent = sorted(_settle_times)
+    if not recent:
+        return {'count': 0, 'timeouts': 0, 'avg_ms': 0.0,
+                'min_ms': 0.0, 'median_ms': 0.0, 'p95_ms': 0.0, 'max_ms': 0.0}
+    
+    def percentile(p):
+        return recent[min(len(recent) - 1, int(p * len(recent)))] * 1000
+    
+    return {
+        'count': count,
+        'timeouts': _settle_totals['timeouts'],
+        'avg_ms': _settle_totals['total_time'] / count * 1000,
+        'min_ms': recent[0] * 1000,
+        'median_ms': percentile(0.5),
+        'p95_ms': percentile(0.95),
+        'max_ms': recent[-1] * 1000,
+    }
+
+
+def reset_settle_stats():
+    """Clear the settle time statistics."""
+    _settle_times.clear()
+    _settle_totals.update(count=0, timeouts=0, total_time=0.0)
+
+
 # =============================================================================
 # INPUT UTILITIES
 # =============================================================================
@@ -349,7 +596,7 @@ def press_hotkey(key1, key2, delay=0.5):
         time.sleep(0.05)
         keyboard.release(key2)
         keyboard.release(key1)
-        time.sleep(delay)
+        state.cancel_token.wait(delay)
     except Exception as e:
         state.stats['errors'] += 1
         print(f"Error pressing hotkey {key1} + {key2}: {e}")
@@ -0,0 +1,293 @@
+"""
+Delay auto-tuning for the Magic Garden Bot.
+
+Calibration finds the fastest MOVE_DELAY and HARVEST_DELAY that still
+work reliably on this machine and game session:
+- Delays are stepped down until an input is missed, then the last
+  reliable value plus a safety margin is written back to Config
+- Missed moves are detected by frame differencing around the player
+  (no change after a keypress) and by position verification (a
+  there-and-back move must end on the same view it started from)
+- Missed harvests are detected by the harvest button still showing after
+  the configured number of presses
+
+The character must stand on the top-left plot (0, 0) when calibration
+starts. The move search ends on a missed input, so the character is
+walked back against the left wall before the harvest search. Scheduled
+tasks (selling, auto-buy) never run during calibration.
+"""
+
+import time
+
+from pynput.keyboard import Key
+
+from . import state
+from . import automation
+from . import game_actions
+from .config import Config
+
+
+# =============================================================================
+# TUNING PARAMETERS
+# =============================================================================
+
+# Delay multiplier applied after each reliable step (smaller = faster search)
+STEP_FACTOR = 0.8
+
+# Lowest delay tried when no range is registered for the key (seconds)
+MIN_DELAY = 0.05
+
+# Margin added on top of the fastest reliable delay
+SAFETY_MARGIN = 0.15
+
+# Number of samples that must all succeed for a delay to count as reliable
+MOVE_TRIALS = 6
+HARVEST_TRIALS = 3
+
+# Frame difference above which a keypress is considered to have moved the view
+MOTION_THRESHOLD = 0.02
+
+# Frame difference below which two settled views count as the same position
+SAME_VIEW_THRESHOLD = 0.01
+
+# Time allowed for the game to come to rest between samples (seconds)
+SETTLE_TIME = 0.5
+
+
+# =============================================================================
+# SAMPLES
+# =============================================================================
+
+def _measure_capture_time(samples=3):
+    """Average time of one player ROI capture, subtracted from move gaps."""
+    start = time.perf_counter()
+    for _ in range(samples):
+        automation.capture_player_roi()
+    return (time.perf_counter() - start) / samples
+
+
+def _move_sample(delay, capture_time):
+    """
+    Move right then left with the given delay between the keypresses.
+    
+    A frame is grabbed just before the second keypress (the capture time
+    is taken out of the wait so the gap stays at `delay`).
+    
+    Returns:
+        bool: True if both moves registered
+    """
+    start_view = automation.capture_player_roi()
+    
+    automation.press_key('d')
+    state.cancel_token.wait(max(0.0, delay - capture_time))
+    mid_view = automation.capture_player_roi()
+    automation.press_key('a')
+    state.cancel_token.wait(delay)
+    
+    state.cancel_token.wait(SETTLE_TIME)
+    end_view = automation.capture_player_roi()
+    
+    moved = automation.frame_difference(start_view, mid_view) >= MOTION_THRESHOLD
+    returned = automation.frame_difference(start_view, end_view) <= SAME_VIEW_THRESHOLD
+    return moved and returned
+
+
+def _harvest_sample(delay, plots):
+    """
+    Harvest the next ripe plot with the given delay between presses.
+    
+    Plots without a visible harvest button give no information and are
+    skipped.
+    
+    Args:
+        delay: Delay between harvest presses
+        plots: Iterator over snake-order moves (see _walk_plots)
+    
+    Returns:
+        bool or None: True if the plot was cleared, None if no plots are left
+    """
+    for _ in plots:
+        if not state.bot_running:
+            return None
+        if not automation.check_harvest_button():
+            continue
+        
+        for _ in range(Config.HARVEST_COUNT):
+            automation.press_key(Key.space)
+            state.cancel_token.wait(delay)
+        
+        state.cancel_token.wait(SETTLE_TIME)
+        return not automation.check_harvest_button()
+    return None
+
+
+def _walk_plots(logger):
+    """
+    Yield once per plot while walking the grid in snake order.
+    
+    Moves use the (already tuned) MOVE_DELAY and keep state.current_position
+    up to date.
+    """
+    for row in range(Config.ROWS):
+        cols = range(Config.COLUMNS) if row % 2 == 0 else range(Config.COLUMNS - 1, -1, -1)
+        for i, col in enumerate(cols):
+            yield row, col
+            if i < Config.COLUMNS - 1:
+                game_actions.move('d' if row % 2 == 0 else 'a', logger=logger, safe_points=False)
+        if row < Config.ROWS - 1:
+            game_actions.move('s', logger=logger, safe_points=False)
+
+
+def _rehome(logger):
+    """
+    Put the character back on (0, 0) after the move search.
+    
+    Move samples only go right and back, and a sample that missed its 'a'
+    leaves the character to the right of the first plot. Walking left
+    against the wall for the whole row width undoes any number of those;
+    presses against the wall do nothing.
+    """
+    logger("🎯 Returning to the top-left plot...", "info")
+    for _ in range(Config.COLUMNS):
+        if not state.bot_running:
+            return
+        automation.press_key('a')
+        state.cancel_token.wait(Config.MOVE_DELAY)
+    state.cancel_token.wait(SETTLE_TIME)
+    state.current_position['row'] = 0
+    state.current_position['col'] = 0
+
+
+# =============================================================================
+# SEARCH
+# =============================================================================
+
+def _is_reliable(sample, trials):
+    """
+    Run samples until one fails.
+    
+    Returns:
+        bool or None: True if all trials succeeded, None if samples ran out
+    """
+    for _ in range(trials):
+        if not state.bot_running:
+            return None
+        result = sample()
+        if result is None:
+            return None
+        if not result:
+            return False
+    return True
+
+
+def _report(key, delay, result, logger):
+    """Log the outcome of testing one delay value."""
+    if result is not None:
+        outcome = "reliable" if result else "missed inputs"
+        logger(f"🎯 {key} {delay:.3f}s: {outcome}", "info")
+
+
+def _tune_delay(key, sample_at, trials, logger):
+    """
+    Find the fastest reliable delay for a config key.
+    
+    Starts at the current value. If that already misses inputs, the delay
+    is stepped up first; otherwise it is stepped down until inputs are
+    missed or the minimum is reached.
+    
+    Args:
+        key: 'MOVE_DELAY' or 'HARVEST_DELAY'
+        sample_at: Function(delay) -> bool or None running one sample
+        trials: Number of samples that must succeed
+        logger: Logging function
+    
+    Returns:
+        float or None: Fastest reliable delay, or None if undetermined
+    """
+    min_delay, max_delay = Config.get_range(key, (MIN_DELAY, 1.0))
+    delay = getattr(Config, key)
+    
+    reliable = _is_reliable(lambda: sample_at(delay), trials)
+    _report(key, delay, reliable, logger)
+    
+    # Back off until the starting point is reliable
+    while reliable is False and delay < max_delay:
+        delay = min(max_delay, delay / STEP_FACTOR)
+        reliable = _is_reliable(lambda: sample_at(delay), trials)
+        _report(key, delay, reliable, logger)
+    
+    if not reliable:
+        return None
+    
+    # Step down while every sample still succeeds
+    best = delay
+    while best > min_delay:
+        candidate = max(min_delay, best * STEP_FACTOR)
+        result = _is_reliable(lambda: sample_at(candidate), trials)
+        _report(key, candidate, result, logger)
+        if not result:
+            break
+        best = candidate
+    
+    return best
+
+
+def _with_margin(key, delay):
+    """Add the safety margin and clamp into the registered range."""
+    min_delay, max_delay = Config.get_range(key, (MIN_DELAY, 1.0))
+    return round(min(max_delay, max(min_delay, delay * (1 + SAFETY_MARGIN))), 3)
+
+
+# =============================================================================
+# CALIBRATION
+# =============================================================================
+
+def run_calibration(logger=print):
+    """
+    Tune MOVE_DELAY, then HARVEST_DELAY, and save the results to Config.
+    
+    Args:
+        logger: Logging function
+    
+    Returns:
+        dict: The config values that were changed
+    """
+    logger("🎯 Calibrating delays - keep the game window focused...", "info")
+    state.current_position['row'] = 0
+    state.current_position['col'] = 0
+    changed = {}
+    
+    # Movement: shuttle between the first two plots
+    capture_time = _measure_capture_time()
+    move_delay = _tune_delay(
+        'MOVE_DELAY', lambda d: _move_sample(d, capture_time), MOVE_TRIALS, logger
+    )
+    if move_delay is not None and state.bot_running:
+        changed.update(Config.set('MOVE_DELAY', _with_margin('MOVE_DELAY', move_delay)))
+        game_actions._apply_config_changes(force=True)
+    elif state.bot_running:
+        logger("⚠️ Could not find a reliable move delay - keeping the current value", "warning")
+    
+    # The last move sample usually missed an input - start the walk from a known plot
+    if state.bot_running:
+        _rehome(logger)
+    
+    # Harvesting: one ripe plot per sample, walking the grid
+    plots = _walk_plots(logger)
+    harvest_delay = _tune_delay(
+        'HARVEST_DELAY', lambda d: _harvest_sample(d, plots), HARVEST_TRIALS, logger
+    )
+    if harvest_delay is not None and state.bot_running:
+        changed.update(Config.set('HARVEST_DELAY', _with_margin('HARVEST_DELAY', harvest_delay)))
+    elif state.bot_running:
+        logger("⚠️ Not enough ripe plots to tune the harvest delay - keeping the current value", "warning")
+    
+    if state.bot_running:
+        game_actions.return_to_start(logger, safe_points=False)
+    
+    if changed:
+        summary = ", ".join(f"{key}={value}" for key, value in changed.items())
+        logger(f"✓ Calibration complete: {summary}", "success")
+    else:
+        logger("✓ Calibration complete: current delays kept", "success")
+    return changed
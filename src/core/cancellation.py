@@ -0,0 +1,127 @@
+"""
+Interruptible waits for the Magic Garden Bot.
+
+Every wait in the automation loops goes through a CancellationToken so
+that STOP and PAUSE take effect within milliseconds instead of after the
+current sleep:
+- wait() returns after the requested time, blocks while paused and
+  raises Cancelled as soon as the token is cancelled
+- Waits while keys are held down pass honour_pause=False: they still
+  stop on cancel but never hold the bot with a key pressed, so PAUSE
+  always hands back a keyboard without stuck modifiers
+- Cancelled derives from BaseException so the broad `except Exception`
+  handlers in the game loops do not swallow it
+- The time from cancel() to the bot thread exiting is measured
+"""
+
+import threading
+import time
+
+
+class Cancelled(BaseException):
+    """Raised inside the bot thread when the current run was stopped."""
+
+
+class CancellationToken:
+    """Cancel/pause signal shared between the GUI and the bot thread."""
+    
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._paused = False
+        self._cond = threading.Condition()
+        self.cancel_time = None
+    
+    # =========================================================================
+    # CONTROL (GUI THREAD)
+    # =========================================================================
+    
+    def reset(self):
+        """Clear the cancel and pause state for a new run."""
+        with self._cond:
+            self._cancelled.clear()
+            self._paused = False
+            self.cancel_time = None
+    
+    def cancel(self):
+        """Cancel the run and wake every pending wait."""
+        with self._cond:
+            if not self._cancelled.is_set():
+                self.cancel_time = time.perf_counter()
+            self._cancelled.set()
+            self._cond.notify_all()
+    
+    def pause(self):
+        """Hold the bot at its next wait."""
+        with self._cond:
+            self._paused = True
+            self._cond.notify_all()
+    
+    def resume(self):
+        """Release a paused bot."""
+        with self._cond:
+            self._paused = False
+            self._cond.notify_all()
+    
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+    
+    @property
+    def paused(self):
+        return self._paused
+    
+    # =========================================================================
+    # WAITING (BOT THREAD)
+    # =========================================================================
+    
+    def check(self):
+        """Raise Cancelled if the run was stopped."""
+        if self._cancelled.is_set():
+            raise Cancelled()
+    
+    def wait(self, seconds, honour_pause=True):
+        """
+        Sleep for the given time, interruptibly.
+        
+        Time spent paused does not count towards the wait.
+        
+        Args:
+            seconds: Time to sleep
+            honour_pause: If False, the wait ignores PAUSE and only stops on
+                cancel (used between key_down and key_up)
+        
+        Raises:
+            Cancelled: As soon as the token is cancelled
+        """
+        deadline = time.monotonic() + max(0.0, seconds)
+        with self._cond:
+            while True:
+                if self._cancelled.is_set():
+                    raise Cancelled()
+                if self._paused and honour_pause:
+                    paused_at = time.monotonic()
+                    self._cond.wait()
+                    deadline += time.monotonic() - paused_at
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                self._cond.wait(remaining)
+    
+    def wait_until(self, deadline):
+        """Sleep until a time.time() deadline (see wait())."""
+        self.wait(deadline - time.time())
+    
+    def wait_while_paused(self):
+        """Block while paused; raise Cancelled if the run is stopped."""
+        self.wait(0)
+    
+    def stop_latency(self):
+        """
+        Seconds since cancel() was called, or None if not cancelled.
+        
+        Called when the bot thread exits to measure how quickly STOP acted.
+        """
+        if self.cancel_time is None:
+            return None
+        return time.perf_counter() - self.cancel_time
@@ -0,0 +1,310 @@
+"""
+Capture targets for the Magic Garden Bot.
+
+Screenshots used to cover the whole virtual desktop, so a three-monitor
+setup was captured, converted and searched although the game occupies a
+single window. A capture target limits that work to one area:
+- 'desktop': every monitor (the old behaviour)
+- 'monitor': one monitor, CAPTURE_MONITOR (1 = primary)
+- 'rect': a fixed rectangle, CAPTURE_RECT [left, top, width, height]
+- 'window': the first window whose title contains CAPTURE_WINDOW_TITLE
+
+The geometry is cached and resolved again every GEOMETRY_TTL seconds (a
+moved or resized window is picked up) or when the settings change.
+Frames come with the absolute screen position of their top-left pixel,
+so match locations map back to coordinates that pyautogui can click,
+also on monitors left of or above the primary one (negative coordinates).
+
+Pixels are read by the backend chosen with CAPTURE_BACKEND (see
+capture_backends.py).
+"""
+
+import sys
+import threading
+import time
+
+from .config import Config
+from .capture_backends import create_backend, CaptureError
+
+try:
+    import pyautogui
+    PYAUTOGUI_AVAILABLE = True
+except Exception:
+    # Also raised without a display (e.g. replaying frames on a Linux server)
+    PYAUTOGUI_AVAILABLE = False
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+TARGET_KINDS = ('desktop', 'monitor', 'rect', 'window')
+
+# Seconds a resolved geometry is trusted before it is looked up again
+GEOMETRY_TTL = 1.0
+
+# Windows with this in their title are never captured (the bot's own window)
+OWN_WINDOW_TITLE = "Magic Garden Bot"
+
+
+# =============================================================================
+# SCREEN GEOMETRY
+# =============================================================================
+
+# Used when neither the backend nor the system reports a screen size
+DEFAULT_SCREEN_BBOX = (0, 0, 1920, 1080)
+
+
+def _primary_bbox():
+    """(left, top, right, bottom) of the primary monitor."""
+    if not PYAUTOGUI_AVAILABLE:
+        return DEFAULT_SCREEN_BBOX
+    width, height = pyautogui.size()
+    return (0, 0, width, height)
+
+
+def virtual_screen_bbox():
+    """
+    Bounding box of all monitors in screen coordinates.
+    
+    The origin is negative when a monitor is left of or above the primary
+    one. Without the Windows API only the primary monitor is known.
+    """
+    if sys.platform == 'win32':
+        try:
+            import ctypes
+            metrics = ctypes.windll.user32.GetSystemMetrics
+            left, top = metrics(76), metrics(77)       # SM_XVIRTUALSCREEN, SM_YVIRTUALSCREEN
+            width, height = metrics(78), metrics(79)   # SM_CXVIRTUALSCREEN, SM_CYVIRTUALSCREEN
+            if width and height:
+                return (left, top, left + width, top + height)
+        except Exception as e:
+            print(f"Could not read the virtual screen size: {e}")
+    return _primary_bbox()
+
+
+def list_monitors():
+    """
+    Bounding boxes of all monitors, primary first.
+    
+    Returns:
+        list: [(left, top, right, bottom)]
+    """
+    monitors = []
+    if sys.platform == 'win32':
+        try:
+            import ctypes
+            from ctypes import wintypes
+            
+            callback_type = ctypes.WINFUNCTYPE(
+                ctypes.c_int, wintypes.HMONITOR, wintypes.HDC,
+                ctypes.POINTER(wintypes.RECT), wintypes.LPARAM
+            )
+            
+            def _collect(hmonitor, hdc, rect, data):
+                r = rect.contents
+                monitors.append((r.left, r.top, r.right, r.bottom))
+                return 1
+            
+            ctypes.windll.user32.EnumDisplayMonitors(None, None, callback_type(_collect), 0)
+        except Exception as e:
+            print(f"Could not list monitors: {e}")
+            monitors = []
+    
+    if not monitors:
+        return [_primary_bbox()]
+    # The primary monitor is the one at the origin
+    monitors.sort(key=lambda box: (box[0], box[1]) != (0, 0))
+    return monitors
+
+
+def find_window(title):
+    """
+    Bounding box of the first visible window whose title contains title.
+    
+    Returns:
+        tuple or None: (left, top, right, bottom), or None if no window
+            matches or window lookup is not supported on this platform
+    """
+    get_windows = getattr(pyautogui, 'getWindowsWithTitle', None) if PYAUTOGUI_AVAILABLE else None
+    if get_windows is None or not title:
+        return None
+    try:
+        for window in get_windows(title):
+            if OWN_WINDOW_TITLE in window.title or getattr(window, 'isMinimized', False):
+                continue
+            if window.width > 0 and window.height > 0:
+                return (window.left, window.top, window.left + window.width, window.top + window.height)
+    except Exception as e:
+        print(f"Could not look up window '{title}': {e}")
+    return None
+
+
+# =============================================================================
+# CAPTURE TARGET
+# =============================================================================
+
+class CaptureTarget:
+    """The screen area that screenshots are taken from."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bbox = None
+        self._resolved_at = 0.0
+        self._fallback_warned = False
+        self.kind = 'desktop'
+        self.changes = 0   # Number of times the resolved geometry changed
+    
+    def invalidate(self):
+        """Resolve the geometry again on the next capture."""
+        with self._lock:
+            self._resolved_at = 0.0
+    
+    def _resolve(self):
+        """Look up the bbox for the configured target."""
+        kind = Config.CAPTURE_TARGET if Config.CAPTURE_TARGET in TARGET_KINDS else 'desktop'
+        bbox = None
+        
+        if kind == 'monitor':
+            monitors = get_backend().monitors() or list_monitors()
+            index = int(Config.CAPTURE_MONITOR) - 1
+            if 0 <= index < len(monitors):
+                bbox = monitors[index]
+        elif kind == 'rect':
+            rect = Config.CAPTURE_RECT
+            if rect and len(rect) == 4 and rect[2] > 0 and rect[3] > 0:
+                left, top, width, height = (int(v) for v in rect)
+                bbox = (left, top, left + width, top + height)
+        elif kind == 'window':
+            bbox = find_window(Config.CAPTURE_WINDOW_TITLE)
+        
+        if bbox is None:
+            if kind != 'desktop' and not self._fallback_warned:
+                print(f"Capture target '{kind}' not found - capturing the whole desktop")
+                self._fallback_warned = True
+            kind, bbox = 'desktop', get_backend().virtual_bbox() or virtual_screen_bbox()
+        else:
+            self._fallback_warned = False
+        return kind, bbox
+    
+    def bbox(self):
+        """
+        The cached (left, top, right, bottom) of the target in screen coordinates.
+        
+        Resolved again once GEOMETRY_TTL has passed or after invalidate().
+        """
+        with self._lock:
+            if self._bbox is not None and time.monotonic() - self._resolved_at < GEOMETRY_TTL:
+                return self._bbox
+            kind, bbox = self._resolve()
+            if bbox != self._bbox:
+                self.changes += 1
+            self.kind, self._bbox = kind, bbox
+            self._resolved_at = time.monotonic()
+            return bbox
+    
+    def center(self):
+        """Center of the target in screen coordinates."""
+        left, top, right, bottom = self.bbox()
+        return ((left + right) // 2, (top + bottom) // 2)
+    
+    def grab(self, bottom_half=False):
+        """
+        Capture the target.
+        
+        Args:
+            bottom_half: If True, only capture the bottom half of the target
+        
+        Returns:
+            tuple: (frame, (left, top)) - an RGB numpy array and the screen
+                position of its top-left pixel
+        """
+        left, top, right, bottom = self.bbox()
+        if bottom_half:
+            top += (bottom - top) // 2
+        return grab_region((left, top, right, bottom)), (left, top)
+
+
+# =============================================================================
+# BACKEND
+# =============================================================================
+
+_backend = {'instance': None}
+_backend_lock = threading.Lock()
+_grab_stats = {'count': 0, 'total_time': 0.0, 'pixels': 0}
+
+
+def get_backend():
+    """
+    Return the capture backend selected by CAPTURE_BACKEND.
+    
+    Falls back to PIL if the selected backend cannot be created (e.g.
+    mss is not installed or the replay path is missing).
+    """
+    with _backend_lock:
+        backend = _backend['instance']
+        if backend is None:
+            try:
+                backend = create_backend(Config.CAPTURE_BACKEND, Config.CAPTURE_REPLAY_PATH)
+            except CaptureError as e:
+                print(f"Capture backend '{Config.CAPTURE_BACKEND}' unavailable ({e}) - using PIL")
+                backend = create_backend('pil')
+            _backend['instance'] = backend
+        return backend
+
+
+def reset_backend():
+    """Close the backend; the next capture creates it again from the config."""
+    with _backend_lock:
+        backend, _backend['instance'] = _backend['instance'], None
+    if backend is not None:
+        backend.close()
+    target.invalidate()
+
+
+def grab_region(bbox):
+    """
+    Capture a (left, top, right, bottom) box given in screen coordinates.
+    
+    Returns:
+        numpy.ndarray: RGB image
+    """
+    start = time.perf_counter()
+    frame = get_backend().grab(bbox)
+    elapsed = time.perf_counter() - start
+    _grab_stats['count'] += 1
+    _grab_stats['total_time'] += elapsed
+    _grab_stats['pixels'] += frame.shape[0] * frame.shape[1]
+    return frame
+
+
+def summary():
+    """One-line summary of capture cost for the cycle log."""
+    count = _grab_stats['count']
+    if not count:
+        return f"{get_backend().name}, no captures yet"
+    return (f"{get_backend().name} {target.kind}, {count} captures, avg "
+            f"{_grab_stats['total_time'] / count * 1000:.1f} ms / "
+            f"{_grab_stats['pixels'] / count / 1e6:.1f} MP")
+
+
+def reset_stats():
+    """Clear the capture counters."""
+    _grab_stats.update(count=0, total_time=0.0, pixels=0)
+
+
+def _on_config_changed(changed):
+    """Config subscriber - resolve the target (and backend) again."""
+    if 'CAPTURE_BACKEND' in changed or 'CAPTURE_REPLAY_PATH' in changed:
+        reset_backend()
+    else:
+        target.invalidate()
+
+
+# Process-wide capture target
+target = CaptureTarget()
+
+Config.subscribe(_on_config_changed, keys=(
+    'CAPTURE_TARGET', 'CAPTURE_MONITOR', 'CAPTURE_RECT', 'CAPTURE_WINDOW_TITLE',
+    'CAPTURE_BACKEND', 'CAPTURE_REPLAY_PATH',
+))
@@ -0,0 +1,409 @@
+"""
+Screen capture backends for the Magic Garden Bot.
+
+All screenshots go through one backend interface (see capture.py), so
+the capture method can be swapped without touching detection code:
+- 'pil': PIL.ImageGrab (always available, the original path)
+- 'mss': the optional mss package, which copies only the requested
+  region (BitBlt on Windows, XShm on Linux) and is usually faster
+- 'replay': serves recorded .png/.npy frames from a file or folder, so
+  detection can be run and tested without the game or a display
+
+A micro-benchmark compares the available backends on this machine:
+
+    python -m src.core.capture_backends benchmark --frames 50
+    python -m src.core.capture_backends record recording/ --frames 20
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+
+import numpy as np
+
+try:
+    from PIL import ImageGrab
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+try:
+    import mss
+    MSS_AVAILABLE = True
+except ImportError:
+    MSS_AVAILABLE = False
+
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+BACKEND_NAMES = ('pil', 'mss', 'replay')
+
+# Frame file types the replay backend reads
+REPLAY_EXTENSIONS = ('.png', '.npy')
+
+# Frames captured per backend by the benchmark
+BENCHMARK_FRAMES = 30
+
+
+class CaptureError(Exception):
+    """Raised when a backend cannot be created or cannot capture."""
+
+
+# =============================================================================
+# BACKENDS
+# =============================================================================
+
+class CaptureBackend:
+    """
+    Interface of a capture backend.
+    
+    grab() returns an RGB uint8 array of shape (height, width, 3) for a
+    (left, top, right, bottom) box in screen coordinates. Backends that
+    know the screen layout also report it, otherwise capture.py asks the
+    operating system.
+    """
+    
+    name = 'base'
+    
+    def grab(self, bbox):
+        raise NotImplementedError
+    
+    def virtual_bbox(self):
+        """Bounding box of all monitors, or None if unknown."""
+        return None
+    
+    def monitors(self):
+        """Monitor bounding boxes (primary first), or None if unknown."""
+        return None
+    
+    def close(self):
+        """Release any resources."""
+
+
+class PILBackend(CaptureBackend):
+    """PIL.ImageGrab capture."""
+    
+    name = 'pil'
+    
+    def __init__(self):
+        if not PIL_AVAILABLE:
+            raise CaptureError("Pillow is not installed")
+    
+    def grab(self, bbox):
+        try:
+            # all_screens lets the bbox reach monitors other than the primary (Windows)
+            image = ImageGrab.grab(bbox=bbox, all_screens=True)
+        except Exception:
+            # Fallback if all_screens is not supported
+            image = ImageGrab.grab(bbox=bbox)
+        frame = np.asarray(image)
+        if frame.ndim == 3 and frame.shape[2] == 4:
+            frame = np.ascontiguousarray(frame[:, :, :3])
+        return frame
+
+
+class MSSBackend(CaptureBackend):
+    """mss capture; one mss instance per thread, as mss handles are not thread-safe."""
+    
+    name = 'mss'
+    
+    def __init__(self):
+        if not MSS_AVAILABLE:
+            raise CaptureError("mss is not installed (pip install mss)")
+        self._local = threading.local()
+        self._instances = []
+        self._lock = threading.Lock()
+    
+    def _sct(self):
+        sct = getattr(self._local, 'sct', None)
+        if sct is None:
+            sct = mss.mss()
+            self._local.sct = sct
+            with self._lock:
+                self._instances.append(sct)
+        return sct
+    
+    def grab(self, bbox):
+        left, top, right, bottom = bbox
+        shot = self._sct().grab({'left': left, 'top': top, 'width': right - left, 'height': bottom - top})
+        bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        if CV2_AVAILABLE:
+            return cv2.cvtColor(bgra, cv2.COLOR_BGRA2RGB)
+        return np.ascontiguousarray(bgra[:, :, 2::-1])
+    
+    def _boxes(self):
+        return [(m['left'], m['top'], m['left'] + m['width'], m['top'] + m['height'])
+                for m in self._sct().monitors]
+    
+    def virtual_bbox(self):
+        return self._boxes()[0]
+    
+    def monitors(self):
+        boxes = self._boxes()[1:]
+        boxes.sort(key=lambda box: (box[0], box[1]) != (0, 0))
+        return boxes
+    
+    def close(self):
+        with self._lock:
+            instances, self._instances = self._instances, []
+        for sct in instances:
+            try:
+                sct.close()
+            except Exception:
+                pass
+
+
+class ReplayBackend(CaptureBackend):
+    """
+    Serves recorded frames in a loop.
+    
+    A recording is a .png/.npy file or a folder of them (played in name
+    order). Each frame stands for the whole screen with its top-left
+    pixel at (0, 0); grab() crops the requested box from it.
+    """
+    
+    name = 'replay'
+    
+    def __init__(self, path, loop=True):
+        """
+        Args:
+            path: Frame file or folder of frame files
+            loop: If True, start over after the last frame; otherwise keep
+                serving the last frame
+        """
+        if not path:
+            raise CaptureError("No replay path set (CAPTURE_REPLAY_PATH)")
+        if os.path.isdir(path):
+            self.paths = sorted(
+                os.path.join(path, name) for name in os.listdir(path)
+                if name.lower().endswith(REPLAY_EXTENSIONS)
+            )
+        elif os.path.isfile(path):
+            self.paths = [path]
+        else:
+            raise CaptureError(f"Replay path not found: {path}")
+        if not self.paths:
+            raise CaptureError(f"No .png or .npy frames in {path}")
+        
+        self.loop = loop
+        self.position = 0
+        self._frames = {}
+        self._lock = threading.Lock()
+    
+    def _load(self, path):
+        """Load a frame file as an RGB uint8 array."""
+        if path.lower().endswith('.npy'):
+            frame = np.load(path)
+        elif CV2_AVAILABLE:
+            frame = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+            if frame is None:
+                raise CaptureError(f"Could not read {path}")
+            if frame.ndim == 3:
+                frame = cv2.cvtColor(frame, cv2.COLOR_BGRA2RGB if frame.shape[2] == 4 else cv2.COLOR_BGR2RGB)
+        else:
+            from PIL import Image
+            with Image.open(path) as image:
+                frame = np.asarray(image.convert('RGB'))
+        
+        if frame.ndim == 2:
+            frame = np.repeat(frame[:, :, None], 3, axis=2)
+        return np.ascontiguousarray(frame[:, :, :3], dtype=np.uint8)
+    
+    def _frame(self, index):
+        frame = self._frames.get(index)
+        if frame is None:
+            frame = self._frames[index] = self._load(self.paths[index])
+        return frame
+    
+    def next_frame(self):
+        """Return the next recorded frame and advance."""
+        with self._lock:
+            index = self.position
+            if self.position + 1 < len(self.paths):
+                self.position += 1
+            elif self.loop:
+                self.position = 0
+            return self._frame(index)
+    
+    def grab(self, bbox):
+        frame = self.next_frame()
+        height, width = frame.shape[:2]
+        left, top, right, bottom = bbox
+        left, top = max(0, left), max(0, top)
+        right, bottom = min(width, right), min(height, bottom)
+        return frame[top:bottom, left:right]
+    
+    def virtual_bbox(self):
+        height, width = self._frame(0).shape[:2]
+        return (0, 0, width, height)
+    
+    def monitors(self):
+        return [self.virtual_bbox()]
+
+
+def create_backend(name, replay_path=None):
+    """
+    Create a backend by name.
+    
+    Args:
+        name: 'pil', 'mss', 'replay' or 'auto' (mss if installed, else pil)
+        replay_path: Recording used by the replay backend
+    
+    Raises:
+        CaptureError: If the backend is unknown or not available
+    """
+    if name == 'auto':
+        name = 'mss' if MSS_AVAILABLE else 'pil'
+    if name == 'pil':
+        return PILBackend()
+    if name == 'mss':
+        return MSSBackend()
+    if name == 'replay':
+        return ReplayBackend(replay_path)
+    raise CaptureError(f"Unknown capture backend: {name}")
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+def benchmark_backend(backend, bbox, frames=BENCHMARK_FRAMES):
+    """
+    Time repeated captures of one box.
+    
+    The first capture is not timed (backend start-up).
+    
+    Returns:
+        dict: name, frames, median_ms, p95_ms, fps and megapixels
+    """
+    frame = backend.grab(bbox)
+    times = []
+    start = time.perf_counter()
+    for _ in range(frames):
+        t0 = time.perf_counter()
+        frame = backend.grab(bbox)
+        times.append((time.perf_counter() - t0) * 1000)
+    total = time.perf_counter() - start
+    
+    times.sort()
+    return {
+        'name': backend.name,
+        'frames': frames,
+        'median_ms': times[len(times) // 2],
+        'p95_ms': times[min(len(times) - 1, int(len(times) * 0.95))],
+        'fps': frames / total if total > 0 else 0.0,
+        'megapixels': frame.shape[0] * frame.shape[1] / 1e6,
+    }
+
+
+def benchmark_backends(bbox=None, frames=BENCHMARK_FRAMES, replay_path=None):
+    """
+    Benchmark every backend that can be created here.
+    
+    Args:
+        bbox: Box to capture (default: the whole screen as reported by
+            the first backend that knows it, else 1920x1080)
+        frames: Timed captures per backend
+        replay_path: Recording for the replay backend (skipped if None)
+    
+    Returns:
+        list: benchmark_backend() results, or {'name', 'error'} for
+            backends that could not run
+    """
+    results = []
+    for name in BACKEND_NAMES:
+        if name == 'replay' and not replay_path:
+            continue
+        backend = None
+        try:
+            backend = create_backend(name, replay_path)
+            box = bbox or backend.virtual_bbox() or (0, 0, 1920, 1080)
+            results.append(benchmark_backend(backend, box, frames))
+        except Exception as e:
+            results.append({'name': name, 'error': str(e)})
+        finally:
+            if backend is not None:
+                backend.close()
+    return results
+
+
+def record_frames(backend, bbox, folder, frames, interval=0.5):
+    """
+    Save captured frames as .npy files for the replay backend.
+    
+    Returns:
+        list: Paths written
+    """
+    os.makedirs(folder, exist_ok=True)
+    paths = []
+    for index in range(frames):
+        path = os.path.join(folder, f"frame_{index:04d}.npy")
+        np.save(path, backend.grab(bbox))
+        paths.append(path)
+        if index + 1 < frames:
+            time.sleep(interval)
+    return paths
+
+
+# =============================================================================
+# COMMAND LINE
+# =============================================================================
+
+def _parse_bbox(text):
+    left, top, width, height = (int(v) for v in text.split(','))
+    return (left, top, left + width, top + height)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark or record Magic Garden Bot screen capture.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    bench = commands.add_parser('benchmark', help="compare capture backends on this machine")
+    bench.add_argument('--frames', type=int, default=BENCHMARK_FRAMES)
+    bench.add_argument('--rect', type=_parse_bbox, help="left,top,width,height (default: whole screen)")
+    bench.add_argument('--replay', help="recording to include in the comparison")
+    
+    record = commands.add_parser('record', help="save frames for the replay backend")
+    record.add_argument('folder')
+    record.add_argument('--frames', type=int, default=10)
+    record.add_argument('--interval', type=float, default=0.5)
+    record.add_argument('--rect', type=_parse_bbox)
+    record.add_argument('--backend', default='auto')
+    
+    args = parser.parse_args(argv)
+    if args.command == 'benchmark':
+        for result in benchmark_backends(args.rect, args.frames, args.replay):
+            if 'error' in result:
+                print(f"{result['name']:>7}: unavailable ({result['error']})")
+            else:
+                print(f"{result['name']:>7}: median {result['median_ms']:.1f} ms, "
+                      f"p95 {result['p95_ms']:.1f} ms, {result['fps']:.1f} fps "
+                      f"({result['megapixels']:.1f} MP)")
+        return 0
+    
+    try:
+        backend = create_backend(args.backend)
+    except CaptureError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    try:
+        box = args.rect or backend.virtual_bbox() or (0, 0, 1920, 1080)
+        paths = record_frames(backend, box, args.folder, args.frames, args.interval)
+        print(f"Wrote {len(paths)} frames to {args.folder}")
+    finally:
+        backend.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+Session checkpoints for the Magic Garden Bot.
+
+The harvesting loop records its progress at every plot boundary so that a
+stop, pause or crash does not cost a whole extra pass over the grid:
+- Position (row/col) and index into the snake plan
+- Cycle number
+- Time left on the auto-buy timer
+
+Checkpoints are written synchronously and atomically at every plot: the
+payload is tiny, and a crash must never leave a checkpoint behind the
+character, or a resumed run would harvest the wrong plots.
+"""
+
+import atexit
+import json
+import os
+import time
+
+from .config import ConfigPersister
+
+# Where the checkpoint is stored
+CHECKPOINT_PATH = os.path.join(os.path.expanduser('~'), 'magic_garden_bot_checkpoint.json')
+
+# Bumped when the checkpoint layout changes; older files are ignored
+CHECKPOINT_VERSION = 1
+
+_persister = ConfigPersister(CHECKPOINT_PATH, label="checkpoint")
+
+
+def save_checkpoint(row, col, plan_index, cycle, rows, columns, autobuy_remaining=None):
+    """
+    Record the current grid progress (written before returning).
+    
+    Args:
+        row, col: Plot the character is standing on
+        plan_index: Index of that plot in the snake plan
+        cycle: Current cycle number
+        rows, columns: Grid size the plan was built for
+        autobuy_remaining: Seconds left on the auto-buy timer, if enabled
+    
+    Returns:
+        bool: False if the write failed
+    """
+    return _persister.write({
+        'version': CHECKPOINT_VERSION,
+        'timestamp': time.time(),
+        'row': row,
+        'col': col,
+        'plan_index': plan_index,
+        'cycle': cycle,
+        'rows': rows,
+        'columns': columns,
+        'autobuy_remaining': autobuy_remaining,
+    })
+
+
+def flush_checkpoint():
+    """Write any pending checkpoint to disk immediately."""
+    return _persister.flush()
+
+
+def load_checkpoint():
+    """
+    Load the saved checkpoint.
+    
+    Returns:
+        dict or None: The checkpoint, or None if missing or unreadable
+    """
+    _persister.flush()
+    try:
+        if not os.path.exists(CHECKPOINT_PATH):
+            return None
+        with open(CHECKPOINT_PATH, 'r') as f:
+            checkpoint = json.load(f)
+    except Exception as e:
+        print(f"Could not load checkpoint: {e}")
+        return None
+    
+    if checkpoint.get('version') != CHECKPOINT_VERSION:
+        return None
+    return checkpoint
+
+
+def clear_checkpoint():
+    """Discard pending writes and delete the saved checkpoint."""
+    _persister.discard()
+    try:
+        os.remove(CHECKPOINT_PATH)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"Could not delete checkpoint: {e}")
+
+
+# Nothing is normally pending, but never lose progress on exit
+atexit.register(flush_checkpoint)
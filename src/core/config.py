@@ -1,6 +1,16 @@
+import atexit
+import copy
 import json
 import os
 import sys
+import tempfile
+import threading
+
+# User-specific, persistent config location
+CONFIG_PATH = os.path.join(os.path.expanduser('~'), 'magic_garden_bot_config.json')
+
+# Saves requested within this window are coalesced into a single write
+SAVE_DEBOUNCE_SECONDS = 0.5
 
 
 def resource_path(relative_path):
@@ -20,6 +30,178 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 
+def atomic_write_json(path, data):
+    """
+    Write JSON to a file atomically.
+    
+    The data is written to a temp file in the same directory, flushed to
+    disk and then renamed over the target, so a crash mid-write never
+    leaves a truncated file behind.
+    """
+    directory = os.path.dirname(path) or '.'
+    fd, temp_path = tempfile.mkstemp(
+        prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory
+    )
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except Exception:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class ConfigPersister:
+    """
+    Debounced write-behind persistence.
+    
+    save requests only store the latest snapshot; a background timer
+    writes it once the debounce window has passed. flush() writes any
+    pending snapshot immediately (used on exit); write() skips the
+    debounce for data that must be on disk right away.
+    """
+    
+    def __init__(self, path, debounce=SAVE_DEBOUNCE_SECONDS, label="config"):
+        """
+        Args:
+            path: File the snapshots are written to
+            debounce: Seconds to coalesce scheduled snapshots
+            label: What is being saved, used in error messages
+        """
+        self.path = path
+        self.debounce = debounce
+        self.label = label
+        self.writes = 0
+        self._pending = None
+        self._timer = None
+        self._lock = threading.Lock()        # Guards _pending and _timer
+        self._write_lock = threading.Lock()  # Serialises file writes
+    
+    def schedule(self, snapshot):
+        """Queue a snapshot to be written after the debounce window."""
+        with self._lock:
+            self._pending = snapshot
+            if self._timer is None:
+                self._timer = threading.Timer(self.debounce, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+    
+    def flush(self):
+        """
+        Write the pending snapshot now, if any.
+        
+        Returns:
+            bool: False if the write failed
+        """
+        with self._write_lock:
+            with self._lock:
+                snapshot, self._pending = self._pending, None
+                timer, self._timer = self._timer, None
+            if timer is not None:
+                timer.cancel()
+            if snapshot is None:
+                return True
+            return self._write(snapshot)
+    
+    def write(self, snapshot):
+        """
+        Write a snapshot now, replacing any pending one.
+        
+        Returns:
+            bool: False if the write failed
+        """
+        with self._write_lock:
+            with self._lock:
+                self._pending = None
+                timer, self._timer = self._timer, None
+            if timer is not None:
+                timer.cancel()
+            return self._write(snapshot)
+    
+    def _write(self, snapshot):
+        """Atomically write a snapshot (caller holds _write_lock)."""
+        try:
+            atomic_write_json(self.path, snapshot)
+            self.writes += 1
+            return True
+        except Exception as e:
+            print(f"Could not save {self.label}: {e}")
+            return False
+    
+    def discard(self):
+        """Drop any pending snapshot without writing it."""
+        with self._write_lock:
+            with self._lock:
+                self._pending = None
+                timer, self._timer = self._timer, None
+            if timer is not None:
+                timer.cancel()
+
+
+_persister = ConfigPersister(CONFIG_PATH)
+
+
+# Value types of fields that can be changed at runtime via Config.update()
+FIELD_TYPES = {
+    'ROWS': int,
+    'COLUMNS': int,
+    'HARVEST_COUNT': int,
+    'MOVE_DELAY': float,
+    'HARVEST_DELAY': float,
+    'LOOP_COOLDOWN': float,
+    'SELL_RETURN_DELAY': float,
+    'TRIP_LATENESS_BUDGET': float,
+    'PROACTIVE_SELL_ENABLED': bool,
+    'SELL_FILL_THRESHOLD': float,
+    'MOTION_SETTLE_ENABLED': bool,
+    'LOCALIZATION_ENABLED': bool,
+    'OPENCV_THREADS': int,
+    'MATCH_PARALLELISM': int,
+    'CAPTURE_TARGET': str,
+    'CAPTURE_MONITOR': int,
+    'CAPTURE_WINDOW_TITLE': str,
+    'CAPTURE_BACKEND': str,
+    'VISION_WORKER_ENABLED': bool,
+    'VISION_WORKER_FPS': float,
+    'AUTOBUY_ENABLED': bool,
+    'HARVESTING_ENABLED': bool,
+    'AUTOBUY_INTERVAL': int,
+    'SEEDS_PER_TRIP': int,
+    'SHOP_SEARCH_ATTEMPTS': int,
+    'AUTO_UPDATE_CHECK': bool,
+}
+
+# Allowed (min, max) of numeric fields, checked by Config.validate().
+# The configuration panel takes its limits from here (see gui/constants.py).
+FIELD_RANGES = {
+    'ROWS': (1, 20),
+    'COLUMNS': (1, 20),
+    'HARVEST_COUNT': (1, 10),
+    'MOVE_DELAY': (0.05, 1.0),
+    'HARVEST_DELAY': (0.05, 1.0),
+    'LOOP_COOLDOWN': (0.0, 10.0),
+    'SELL_RETURN_DELAY': (0.0, 10.0),
+    'TRIP_LATENESS_BUDGET': (0.0, 600.0),
+    'SELL_FILL_THRESHOLD': (0.0, 1.0),
+    'OPENCV_THREADS': (0, 64),
+    'MATCH_PARALLELISM': (0, 64),
+    'CAPTURE_MONITOR': (1, 16),
+    'VISION_WORKER_FPS': (0.1, 60.0),
+    'AUTOBUY_INTERVAL': (10, 86400),
+    'SEEDS_PER_TRIP': (1, 999),
+    'SHOP_SEARCH_ATTEMPTS': (1, 100),
+}
+
+# Strings accepted for bool fields (config.json, GUI entries)
+_TRUE_STRINGS = ('true', '1', 'yes', 'on')
+_FALSE_STRINGS = ('false', '0', 'no', 'off', '')
+
+
 class Config:
     """
     Handles loading and saving of the bot's configuration.
@@ -31,8 +213,23 @@ class Config:
     INVENTORY_CONFIDENCE = 0.6  # Lower threshold for inventory detection to handle GPU color variations (AMD vs NVIDIA)
     MOVE_DELAY = 0.15
     HARVEST_DELAY = 0.1
-    LOOP_COOLDOWN = 2
+    LOOP_COOLDOWN = 2.0
     SELL_RETURN_DELAY = 1.0
+    TRIP_LATENESS_BUDGET = 30.0  # Seconds a due auto-buy may wait for a cheaper point in the grid
+    PROACTIVE_SELL_ENABLED = True  # Sell at a row end when the inventory is predicted to fill during the next row
+    SELL_FILL_THRESHOLD = 0.9  # Predicted fill ratio (0-1) at which a row-end sell is planned
+    MOTION_SETTLE_ENABLED = True  # Continue as soon as movement settles (MOVE_DELAY becomes the ceiling)
+    LOCALIZATION_ENABLED = True  # Check the position visually at row ends and correct drift
+    OPENCV_THREADS = 0  # Threads OpenCV may use per call (0 = chosen by the startup benchmark)
+    MATCH_PARALLELISM = 0  # Templates matched at the same time (0 = chosen by the startup benchmark)
+    CAPTURE_TARGET = 'desktop'  # Area screenshots are taken from: desktop, monitor, rect or window
+    CAPTURE_MONITOR = 1  # Monitor for the 'monitor' target (1 = primary)
+    CAPTURE_RECT = None  # [left, top, width, height] for the 'rect' target
+    CAPTURE_WINDOW_TITLE = 'Magic Garden'  # Window title (or part of it) for the 'window' target
+    CAPTURE_BACKEND = 'auto'  # Screen capture method: auto (mss if installed), pil, mss or replay
+    CAPTURE_REPLAY_PATH = None  # Recorded .png/.npy frame or folder served by the 'replay' backend
+    VISION_WORKER_ENABLED = False  # Capture and match in a separate process while the bot runs
+    VISION_WORKER_FPS = 10.0  # Frames per second the vision worker captures between requests
     # Use resource_path for PyInstaller compatibility
     # Note: .spec file bundles 'src/images' as 'images', so we check both paths
     IMAGE_FOLDER = resource_path("images") if hasattr(sys, '_MEIPASS') else "src/images/"
@@ -48,9 +245,159 @@ class Config:
     AUTO_UPDATE_CHECK = True  # Check for updates on startup
     UPDATE_SKIPPED_VERSION = None  # Version user chose to skip
     
+    # Change notification state
+    _subscribers = []   # [(callback, keys or None)]
+    _lock = threading.RLock()
+    
+    # =========================================================================
+    # VALIDATION AND CHANGE NOTIFICATION
+    # =========================================================================
+    
     @classmethod
-    def save(cls):
-        """Save config to a JSON file in the user's home directory."""
+    def get_range(cls, key, default=None):
+        """Return the allowed (min_val, max_val) for a key, or default."""
+        return FIELD_RANGES.get(key, default)
+    
+    @classmethod
+    def validate(cls, key, value):
+        """
+        Coerce a value to the field's type and check its FIELD_RANGES range.
+        
+        Args:
+            key: Config attribute name
+            value: New value (numbers may be given as strings)
+            
+        Returns:
+            The coerced value
+            
+        Raises:
+            ValueError: If the value has the wrong type or is out of range
+        """
+        field_type = FIELD_TYPES.get(key)
+        if field_type is bool:
+            value = cls._parse_bool(key, value)
+        elif field_type is int:
+            number = cls._parse_number(key, value)
+            if not number.is_integer():
+                raise ValueError(f"{key} must be a whole number.")
+            value = int(number)
+        elif field_type is float:
+            value = cls._parse_number(key, value)
+        elif field_type is str:
+            value = str(value)
+        
+        if key in FIELD_RANGES:
+            min_val, max_val = FIELD_RANGES[key]
+            if not (min_val <= value <= max_val):
+                raise ValueError(f"{key} must be between {min_val} and {max_val}.")
+        
+        return value
+    
+    @staticmethod
+    def _parse_number(key, value):
+        """Read a numeric field as a float; bools and None are rejected."""
+        if isinstance(value, (bool, type(None), list, dict)):
+            raise ValueError(f"{key} must be a number.")
+        return float(value)
+    
+    @staticmethod
+    def _parse_bool(key, value):
+        """Read a bool field; strings like 'False' or '0' are False."""
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, (int, float)) and value in (0, 1):
+            return bool(value)
+        if isinstance(value, str):
+            text = value.strip().lower()
+            if text in _TRUE_STRINGS:
+                return True
+            if text in _FALSE_STRINGS:
+                return False
+        raise ValueError(f"{key} must be true or false.")
+    
+    @classmethod
+    def update(cls, changes, save=True):
+        """
+        Validate and apply several values, then notify subscribers.
+        
+        Nothing is applied if any value is invalid.
+        
+        Args:
+            changes: Dictionary of {config_key: value}
+            save: If True, persist the config afterwards
+            
+        Returns:
+            dict: The values that actually changed
+            
+        Raises:
+            ValueError: If any value is invalid
+        """
+        validated = {key: cls.validate(key, value) for key, value in changes.items()}
+        
+        with cls._lock:
+            changed = {
+                key: value for key, value in validated.items()
+                if getattr(cls, key, None) != value
+            }
+            for key, value in changed.items():
+                setattr(cls, key, value)
+        
+        if save:
+            cls.save()
+        if changed:
+            cls._notify(changed)
+        return changed
+    
+    @classmethod
+    def set(cls, key, value, save=True):
+        """Validate and apply a single value (see update())."""
+        return cls.update({key: value}, save=save)
+    
+    @classmethod
+    def subscribe(cls, callback, keys=None):
+        """
+        Register a callback for config changes.
+        
+        The callback is called with a {key: new_value} dictionary from the
+        thread that made the change, so GUI callbacks must marshal to Tk.
+        
+        Args:
+            callback: Function called with the changed values
+            keys: Optional iterable of keys to listen to (default: all)
+        """
+        with cls._lock:
+            cls._subscribers.append((callback, frozenset(keys) if keys else None))
+        return callback
+    
+    @classmethod
+    def unsubscribe(cls, callback):
+        """Remove a previously registered callback."""
+        with cls._lock:
+            cls._subscribers = [s for s in cls._subscribers if s[0] is not callback]
+    
+    @classmethod
+    def _notify(cls, changed):
+        """Call subscribers interested in any of the changed keys."""
+        with cls._lock:
+            subscribers = list(cls._subscribers)
+        for callback, keys in subscribers:
+            relevant = changed if keys is None else {
+                k: v for k, v in changed.items() if k in keys
+            }
+            if not relevant:
+                continue
+            try:
+                callback(relevant)
+            except Exception as e:
+                print(f"Config subscriber error: {e}")
+    
+    # =========================================================================
+    # PERSISTENCE
+    # =========================================================================
+    
+    @classmethod
+    def _snapshot(cls):
+        """Return a copy of the persisted config values."""
         config_dict = {
             'ROWS': cls.ROWS,
             'COLUMNS': cls.COLUMNS,
@@ -59,6 +406,21 @@ class Config:
             'HARVEST_DELAY': cls.HARVEST_DELAY,
             'LOOP_COOLDOWN': cls.LOOP_COOLDOWN,
             'SELL_RETURN_DELAY': cls.SELL_RETURN_DELAY,
+            'TRIP_LATENESS_BUDGET': cls.TRIP_LATENESS_BUDGET,
+            'PROACTIVE_SELL_ENABLED': cls.PROACTIVE_SELL_ENABLED,
+            'SELL_FILL_THRESHOLD': cls.SELL_FILL_THRESHOLD,
+            'MOTION_SETTLE_ENABLED': cls.MOTION_SETTLE_ENABLED,
+            'LOCALIZATION_ENABLED': cls.LOCALIZATION_ENABLED,
+            'OPENCV_THREADS': cls.OPENCV_THREADS,
+            'MATCH_PARALLELISM': cls.MATCH_PARALLELISM,
+            'CAPTURE_TARGET': cls.CAPTURE_TARGET,
+            'CAPTURE_MONITOR': cls.CAPTURE_MONITOR,
+            'CAPTURE_RECT': cls.CAPTURE_RECT,
+            'CAPTURE_WINDOW_TITLE': cls.CAPTURE_WINDOW_TITLE,
+            'CAPTURE_BACKEND': cls.CAPTURE_BACKEND,
+            'CAPTURE_REPLAY_PATH': cls.CAPTURE_REPLAY_PATH,
+            'VISION_WORKER_ENABLED': cls.VISION_WORKER_ENABLED,
+            'VISION_WORKER_FPS': cls.VISION_WORKER_FPS,
             'AUTOBUY_ENABLED': cls.AUTOBUY_ENABLED,
             'SELECTED_SEED': cls.SELECTED_SEED,
             'SELECTED_SEEDS': cls.SELECTED_SEEDS,
@@ -69,25 +431,49 @@ class Config:
             'AUTO_UPDATE_CHECK': cls.AUTO_UPDATE_CHECK,
             'UPDATE_SKIPPED_VERSION': cls.UPDATE_SKIPPED_VERSION,
         }
-        try:
-            # Save config in a user-specific, persistent location
-            config_path = os.path.join(os.path.expanduser('~'), 'magic_garden_bot_config.json')
-            with open(config_path, 'w') as f:
-                json.dump(config_dict, f, indent=4)
-        except Exception as e:
-            print(f"Could not save config: {e}")
+        # Deep copy so later in-place edits (e.g. SELECTED_SEEDS) don't leak in
+        return copy.deepcopy(config_dict)
+    
+    @classmethod
+    def save(cls):
+        """
+        Save config to a JSON file in the user's home directory.
+        
+        The write happens on a background thread after a short debounce
+        window, so rapid changes are coalesced into one atomic write.
+        """
+        _persister.schedule(cls._snapshot())
+    
+    @classmethod
+    def flush(cls):
+        """Write any pending config changes to disk immediately."""
+        return _persister.flush()
     
     @classmethod
     def load(cls):
-        """Load config from a JSON file in the user's home directory."""
+        """
+        Load config from a JSON file in the user's home directory.
+        
+        Typed fields go through validate(); a value that is invalid (e.g. a
+        hand-edited or outdated file) is reported and the default is kept.
+        """
         try:
-            config_path = os.path.join(os.path.expanduser('~'), 'magic_garden_bot_config.json')
-            if os.path.exists(config_path):
-                with open(config_path, 'r') as f:
+            if os.path.exists(CONFIG_PATH):
+                with open(CONFIG_PATH, 'r') as f:
                     config_dict = json.load(f)
                     for key, value in config_dict.items():
                         if key == 'IMAGE_FOLDER':
                             continue
+                        if key in FIELD_TYPES:
+                            try:
+                                value = cls.validate(key, value)
+                            except ValueError as e:
+                                print(f"Ignoring config value {key}={value!r}: {e}")
+                                continue
                         setattr(cls, key, value)
         except Exception as e:
             print(f"Could not load config: {e}")
+
+
+# Make sure pending changes reach the disk on interpreter exit
+atexit.register(Config.flush)
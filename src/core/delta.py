@@ -0,0 +1,360 @@
+"""
+Magic Garden Bot - Binary Delta Patches.
+
+Most releases only change a few Python modules, yet the PyInstaller exe
+is shipped whole. A delta patch describes the new exe in terms of the old
+one, so an update only downloads what changed:
+- COPY ops reuse a byte range of the old exe
+- INSERT ops carry new bytes
+- The op stream is LZMA compressed; a JSON header records the size and
+  SHA-256 of both the old and the new exe, so a patch is only applied to
+  the exe it was made for and the result is verified before use
+
+Patches are created by the release workflow:
+
+    python -m src.core.delta create old.exe new.exe MagicGardenBot-3.1.3-to-3.2.0.patch
+
+Matching uses an rsync-style rolling checksum over fixed-size blocks of
+the old file, so moved data is found at any offset.
+"""
+
+import os
+import sys
+import json
+import lzma
+import struct
+import hashlib
+import argparse
+from itertools import accumulate
+from typing import Optional, Dict, Any
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+MAGIC = b'MGBDELTA\x01'
+
+# Block size used to find matches (bytes)
+BLOCK_SIZE = 1024
+
+# Chunk size for comparing, hashing and copying (bytes)
+IO_CHUNK = 1024 * 1024
+
+# Unmatched bytes are buffered up to this size before an INSERT op is written
+MAX_INSERT = 1024 * 1024
+
+OP_COPY = b'C'
+OP_INSERT = b'I'
+
+_COPY = struct.Struct('<QQ')   # offset, length
+_LENGTH = struct.Struct('<Q')  # insert length
+_HEADER_LENGTH = struct.Struct('<I')
+
+
+class DeltaError(Exception):
+    """Raised when a patch is invalid or does not fit the file."""
+
+
+def sha256_file(path: str) -> str:
+    """Return the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(IO_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def patch_asset_name(from_version: str, to_version: str) -> str:
+    """Release asset name of the patch between two versions ('v' prefixes are dropped)."""
+    return f"MagicGardenBot-{from_version.lstrip('v')}-to-{to_version.lstrip('v')}.patch"
+
+
+# =============================================================================
+# CREATE
+# =============================================================================
+
+def _weak_checksum(block) -> int:
+    """rsync weak checksum of a block: (sum, sum of prefix sums), 16 bits each."""
+    a = sum(block) & 0xffff
+    b = sum(accumulate(block)) & 0xffff
+    return a | (b << 16)
+
+
+class _OpWriter:
+    """Coalesces ops and writes them to a compressed stream."""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.copy = None        # Pending [offset, length]
+        self.insert = bytearray()
+        self.copied = 0
+        self.inserted = 0
+    
+    def add_copy(self, offset, length):
+        self._flush_insert()
+        if self.copy and self.copy[0] + self.copy[1] == offset:
+            self.copy[1] += length
+        else:
+            self._flush_copy()
+            self.copy = [offset, length]
+        self.copied += length
+    
+    def add_insert(self, data):
+        self._flush_copy()
+        self.insert += data
+        self.inserted += len(data)
+        if len(self.insert) >= MAX_INSERT:
+            self._flush_insert()
+    
+    def close(self):
+        self._flush_copy()
+        self._flush_insert()
+    
+    def _flush_copy(self):
+        if self.copy:
+            self.stream.write(OP_COPY + _COPY.pack(*self.copy))
+            self.copy = None
+    
+    def _flush_insert(self):
+        if self.insert:
+            self.stream.write(OP_INSERT + _LENGTH.pack(len(self.insert)) + bytes(self.insert))
+            self.insert = bytearray()
+
+
+def create_delta(old_path: str, new_path: str, patch_path: str,
+                 block_size: int = BLOCK_SIZE) -> Dict[str, Any]:
+    """
+    Create a patch that turns old_path into new_path.
+    
+    Args:
+        old_path: Previous release exe
+        new_path: New release exe
+        patch_path: Output patch file
+        block_size: Match block size in bytes
+    
+    Returns:
+        dict: The patch header plus 'copied', 'inserted' and 'patch_size'
+    """
+    with open(old_path, 'rb') as f:
+        old = f.read()
+    with open(new_path, 'rb') as f:
+        new = f.read()
+    old_view, new_view = memoryview(old), memoryview(new)
+    
+    # Index every aligned block of the old file by its weak checksum
+    index = {}
+    for offset in range(0, len(old) - block_size + 1, block_size):
+        index.setdefault(_weak_checksum(old_view[offset:offset + block_size]), []).append(offset)
+    
+    header = {
+        'old_size': len(old),
+        'old_sha256': hashlib.sha256(old).hexdigest(),
+        'new_size': len(new),
+        'new_sha256': hashlib.sha256(new).hexdigest(),
+        'block_size': block_size,
+    }
+    header_bytes = json.dumps(header).encode('utf-8')
+    
+    with open(patch_path, 'wb') as out:
+        out.write(MAGIC + _HEADER_LENGTH.pack(len(header_bytes)) + header_bytes)
+        with lzma.open(out, 'wb', preset=9) as stream:
+            ops = _OpWriter(stream)
+            _diff(old_view, new_view, index, block_size, ops)
+            ops.close()
+    
+    header.update(copied=ops.copied, inserted=ops.inserted, patch_size=os.path.getsize(patch_path))
+    return header
+
+
+def _diff(old, new, index, block_size, ops):
+    """Scan the new file with a rolling checksum and emit COPY/INSERT ops."""
+    size = len(new)
+    position = 0
+    pending = position   # Start of unmatched bytes not yet emitted
+    a = b = None         # Rolling checksum of new[position:position + block_size]
+    
+    while position + block_size <= size:
+        if a is None:
+            block = new[position:position + block_size]
+            a = sum(block) & 0xffff
+            b = sum(accumulate(block)) & 0xffff
+        
+        match = None
+        for offset in index.get(a | (b << 16), ()):
+            if old[offset:offset + block_size] == new[position:position + block_size]:
+                match = offset
+                break
+        
+        if match is None:
+            # Roll the checksum one byte forward
+            if position + block_size < size:
+                out_byte, in_byte = new[position], new[position + block_size]
+                a = (a - out_byte + in_byte) & 0xffff
+                b = (b - block_size * out_byte + a) & 0xffff
+            position += 1
+            continue
+        
+        # Extend the match forward, halving the step at the first difference
+        length = block_size
+        step = IO_CHUNK
+        while step > 0:
+            step = min(step, size - position - length, len(old) - match - length)
+            if step <= 0:
+                break
+            if old[match + length:match + length + step] == new[position + length:position + length + step]:
+                length += step
+            else:
+                step //= 2
+        
+        if pending < position:
+            ops.add_insert(new[pending:position])
+        ops.add_copy(match, length)
+        position += length
+        pending = position
+        a = None
+    
+    if pending < size:
+        ops.add_insert(new[pending:size])
+
+
+# =============================================================================
+# APPLY
+# =============================================================================
+
+def read_header(patch_path: str) -> Dict[str, Any]:
+    """Read and return the JSON header of a patch."""
+    with open(patch_path, 'rb') as f:
+        return _read_header(f)
+
+
+def _read_header(f) -> Dict[str, Any]:
+    if f.read(len(MAGIC)) != MAGIC:
+        raise DeltaError("Not a Magic Garden Bot patch")
+    (length,) = _HEADER_LENGTH.unpack(f.read(_HEADER_LENGTH.size))
+    try:
+        return json.loads(f.read(length).decode('utf-8'))
+    except ValueError as e:
+        raise DeltaError(f"Corrupt patch header: {e}")
+
+
+def _read_exact(stream, count):
+    data = stream.read(count)
+    if len(data) != count:
+        raise DeltaError("Patch is truncated")
+    return data
+
+
+def apply_delta(old_path: str, patch_path: str, out_path: str,
+                expected_sha256: Optional[str] = None) -> str:
+    """
+    Rebuild the new file from the old one and a patch.
+    
+    Both the old file and the result are verified against the hashes in
+    the patch header (and the result against expected_sha256, if given).
+    The output is removed if anything does not match.
+    
+    Args:
+        old_path: The exe the patch was made from
+        patch_path: Patch file
+        out_path: Where to write the new exe
+        expected_sha256: Published digest of the new exe, if known
+    
+    Returns:
+        out_path
+    
+    Raises:
+        DeltaError: If the patch does not apply or verification fails
+    """
+    with open(patch_path, 'rb') as patch:
+        header = _read_header(patch)
+        
+        if os.path.getsize(old_path) != header['old_size'] or sha256_file(old_path) != header['old_sha256']:
+            raise DeltaError("The patch was made for a different version of the exe")
+        if expected_sha256 and expected_sha256.lower() != header['new_sha256']:
+            raise DeltaError("The patch does not produce the published release")
+        
+        digest = hashlib.sha256()
+        written = 0
+        try:
+            with open(old_path, 'rb') as old, \
+                    open(out_path, 'wb', buffering=IO_CHUNK) as out, \
+                    lzma.open(patch, 'rb') as stream:
+                while True:
+                    op = stream.read(1)
+                    if not op:
+                        break
+                    if op == OP_COPY:
+                        offset, length = _COPY.unpack(_read_exact(stream, _COPY.size))
+                        if offset + length > header['old_size']:
+                            raise DeltaError("Patch copies beyond the end of the exe")
+                        old.seek(offset)
+                        while length:
+                            data = old.read(min(IO_CHUNK, length))
+                            out.write(data)
+                            digest.update(data)
+                            written += len(data)
+                            length -= len(data)
+                    elif op == OP_INSERT:
+                        (length,) = _LENGTH.unpack(_read_exact(stream, _LENGTH.size))
+                        data = _read_exact(stream, length)
+                        out.write(data)
+                        digest.update(data)
+                        written += len(data)
+                    else:
+                        raise DeltaError(f"Unknown patch op {op!r}")
+            
+            if written != header['new_size'] or digest.hexdigest() != header['new_sha256']:
+                raise DeltaError("Patched exe failed verification")
+        except (DeltaError, lzma.LZMAError, struct.error, OSError) as e:
+            try:
+                os.remove(out_path)
+            except OSError:
+                pass
+            if isinstance(e, DeltaError):
+                raise
+            raise DeltaError(f"Could not apply patch: {e}")
+    
+    return out_path
+
+
+# =============================================================================
+# COMMAND LINE
+# =============================================================================
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Create or apply Magic Garden Bot delta patches.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    create = commands.add_parser('create', help="create a patch from OLD to NEW")
+    create.add_argument('old')
+    create.add_argument('new')
+    create.add_argument('patch')
+    create.add_argument('--block-size', type=int, default=BLOCK_SIZE)
+    
+    apply = commands.add_parser('apply', help="rebuild NEW from OLD and a patch")
+    apply.add_argument('old')
+    apply.add_argument('patch')
+    apply.add_argument('out')
+    
+    info = commands.add_parser('info', help="show a patch header")
+    info.add_argument('patch')
+    
+    args = parser.parse_args(argv)
+    try:
+        if args.command == 'create':
+            result = create_delta(args.old, args.new, args.patch, block_size=args.block_size)
+            print(f"Patch {result['patch_size'] / (1024 * 1024):.2f} MB "
+                  f"({result['copied']} bytes copied, {result['inserted']} bytes inserted)")
+        elif args.command == 'apply':
+            apply_delta(args.old, args.patch, args.out)
+            print(f"Wrote {args.out}")
+        else:
+            print(json.dumps(read_header(args.patch), indent=4))
+    except (DeltaError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,465 @@
+"""
+Magic Garden Bot - Resumable Downloader.
+
+Downloads large files (the update exe) robustly:
+- The file is split into segments that are fetched concurrently with
+  HTTP Range requests, each written through a large buffered writer
+- Progress is kept in a '.part' file plus a small JSON sidecar, so a
+  download interrupted by a network drop (or an app restart) continues
+  where it stopped instead of starting over
+- A SHA-256 digest is computed while downloading over the contiguous
+  prefix that has reached the disk, and checked before the file is used
+- Servers without Range support fall back to a single stream
+
+Only the URL is needed, so the downloader works the same against GitHub
+and a local http.server stand-in.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+import importlib.util
+from typing import Optional, Callable, Dict, Any, List
+
+from .config import atomic_write_json
+
+# requests is imported where it is used (see updater.py)
+REQUESTS_AVAILABLE = importlib.util.find_spec("requests") is not None
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+# Number of segments fetched in parallel
+SEGMENT_COUNT = 4
+
+# Files smaller than this per segment use fewer segments
+MIN_SEGMENT_SIZE = 2 * 1024 * 1024
+
+# Size of the chunks read from the network
+CHUNK_SIZE = 256 * 1024
+
+# Buffer size of the file writers
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Bytes written per segment before they are flushed and counted as resumable
+COMMIT_BYTES = 4 * 1024 * 1024
+
+# Seconds between progress callbacks and between sidecar writes
+PROGRESS_INTERVAL = 0.1
+STATE_SAVE_INTERVAL = 1.0
+
+# Retries per segment after a network error, with exponential backoff
+MAX_RETRIES = 5
+RETRY_BACKOFF = 1.0
+
+# (connect, read) timeouts in seconds
+REQUEST_TIMEOUT = (10, 60)
+
+# Bumped when the sidecar format changes
+STATE_VERSION = 1
+
+
+# =============================================================================
+# ERRORS AND DIGESTS
+# =============================================================================
+
+class DownloadError(Exception):
+    """Raised when a download cannot be completed."""
+
+
+class DownloadCancelled(DownloadError):
+    """Raised when the download was cancelled; the partial file is kept."""
+
+
+def parse_sha256(text: Optional[str]) -> Optional[str]:
+    """
+    Extract a SHA-256 hex digest.
+    
+    Accepts GitHub's asset digest format ('sha256:<hex>') and sha256sum
+    output ('<hex>  file.exe').
+    
+    Returns:
+        The lowercase hex digest, or None if the text holds none
+    """
+    if not text or not text.strip():
+        return None
+    token = text.strip().split()[0].lower()
+    if token.startswith('sha256:'):
+        token = token[len('sha256:'):]
+    if len(token) == 64 and all(c in '0123456789abcdef' for c in token):
+        return token
+    return None
+
+
+# =============================================================================
+# DOWNLOADER
+# =============================================================================
+
+class ResumableDownloader:
+    """Segmented, resumable HTTP download with SHA-256 verification."""
+    
+    def __init__(
+        self,
+        url: str,
+        dest_path: str,
+        sha256: Optional[str] = None,
+        segments: int = SEGMENT_COUNT,
+        session=None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ):
+        """
+        Args:
+            url: File URL (redirects are followed)
+            dest_path: Final path of the file
+            sha256: Expected hex digest, or None to skip verification
+            segments: Maximum number of parallel segments
+            session: Optional requests.Session (or compatible) to use
+            progress_callback: Called with (downloaded_bytes, total_bytes),
+                at most every PROGRESS_INTERVAL seconds
+            cancel_event: Optional event that cancels the download when set
+        """
+        self.url = url
+        self.dest_path = dest_path
+        self.part_path = dest_path + '.part'
+        self.state_path = dest_path + '.part.json'
+        self.expected_sha256 = parse_sha256(sha256) if sha256 else None
+        self.max_segments = max(1, segments)
+        self.session = session
+        self.progress_callback = progress_callback
+        self.cancel_event = cancel_event or threading.Event()
+        
+        self.size = None
+        self.etag = None
+        self.sha256 = None          # Digest of the downloaded file
+        self.resumed_bytes = 0      # Bytes reused from an earlier attempt
+        
+        self._segments = []         # [{'start', 'end', 'done', 'received'}]
+        self._lock = threading.Lock()
+        self._abort = threading.Event()
+        self._errors = []
+        self._last_progress = 0.0
+        self._last_state_save = 0.0
+    
+    def run(self) -> str:
+        """
+        Download the file.
+        
+        Returns:
+            dest_path once the file is complete and verified
+        
+        Raises:
+            DownloadCancelled: If cancel_event was set (progress is kept)
+            DownloadError: If the download or the verification failed
+        """
+        if self.session is not None:
+            http = self.session
+        else:
+            import requests
+            http = requests
+        
+        self.size, self.etag, ranged = self._probe(http)
+        if ranged and self.size:
+            self._prepare_segments()
+            self._download_segments(http)
+        else:
+            self._download_single(http)
+        
+        self._verify()
+        os.replace(self.part_path, self.dest_path)
+        self._remove(self.state_path)
+        return self.dest_path
+    
+    # =========================================================================
+    # SETUP
+    # =========================================================================
+    
+    def _probe(self, http):
+        """
+        Ask for the first byte to learn the size and whether ranges work.
+        
+        Returns:
+            tuple: (size or None, etag or None, True if ranges are supported)
+        """
+        response = http.get(
+            self.url, headers={'Range': 'bytes=0-0'}, stream=True, timeout=REQUEST_TIMEOUT
+        )
+        try:
+            response.raise_for_status()
+            etag = response.headers.get('ETag')
+            if response.status_code == 206:
+                total = response.headers.get('Content-Range', '').rpartition('/')[2]
+                if total.isdigit():
+                    return int(total), etag, True
+            length = response.headers.get('Content-Length', '')
+            return (int(length) if length.isdigit() else None), etag, False
+        finally:
+            response.close()
+    
+    def _prepare_segments(self):
+        """Reuse the segments of a matching earlier attempt or start fresh."""
+        saved = self._load_state()
+        if (saved and saved.get('version') == STATE_VERSION
+                and saved.get('url') == self.url
+                and saved.get('size') == self.size
+                and saved.get('etag') == self.etag
+                and os.path.exists(self.part_path)
+                and os.path.getsize(self.part_path) == self.size):
+            self._segments = [
+                {'start': start, 'end': end, 'done': done, 'received': done}
+                for start, end, done in saved['segments']
+            ]
+            self.resumed_bytes = sum(s['done'] for s in self._segments)
+            return
+        
+        count = max(1, min(self.max_segments, self.size // MIN_SEGMENT_SIZE))
+        step = -(-self.size // count)  # Ceiling division
+        self._segments = [
+            {'start': start, 'end': min(start + step, self.size) - 1, 'done': 0, 'received': 0}
+            for start in range(0, self.size, step)
+        ]
+        
+        # Preallocate so every segment can seek to its own offset
+        with open(self.part_path, 'wb') as f:
+            f.truncate(self.size)
+        self._save_state()
+    
+    # =========================================================================
+    # SEGMENTED DOWNLOAD
+    # =========================================================================
+    
+    def _download_segments(self, http):
+        """Fetch the unfinished segments in parallel and hash as data lands."""
+        workers = [
+            threading.Thread(target=self._segment_worker, args=(http, segment), daemon=True)
+            for segment in self._segments
+            if segment['done'] < self._length(segment)
+        ]
+        for worker in workers:
+            worker.start()
+        
+        hasher = hashlib.sha256()
+        hashed = 0
+        with open(self.part_path, 'rb') as reader:
+            while any(worker.is_alive() for worker in workers):
+                if self.cancel_event.wait(PROGRESS_INTERVAL):
+                    self._abort.set()
+                hashed = self._hash_prefix(reader, hasher, hashed)
+                self._report_progress()
+                if time.monotonic() - self._last_state_save >= STATE_SAVE_INTERVAL:
+                    self._save_state()
+            
+            self._save_state()
+            if self.cancel_event.is_set():
+                raise DownloadCancelled("Download cancelled")
+            if self._errors:
+                raise self._errors[0]
+            
+            hashed = self._hash_prefix(reader, hasher, hashed)
+        
+        self.sha256 = hasher.hexdigest()
+        self._report_progress(force=True)
+    
+    def _segment_worker(self, http, segment):
+        """Download one segment, retrying network errors with backoff."""
+        attempt = 0
+        while True:
+            try:
+                self._fetch_segment(http, segment)
+                return
+            except DownloadError as e:
+                self._fail(e)
+                return
+            except Exception as e:
+                attempt += 1
+                if attempt > MAX_RETRIES:
+                    self._fail(DownloadError(f"Segment at byte {segment['start']} failed: {e}"))
+                    return
+                if self._abort.wait(RETRY_BACKOFF * 2 ** (attempt - 1)):
+                    return
+    
+    def _fetch_segment(self, http, segment):
+        """Stream the rest of one segment into the part file."""
+        with self._lock:
+            position = segment['start'] + segment['done']
+            segment['received'] = segment['done']
+        end = segment['end']
+        
+        headers = {'Range': f"bytes={position}-{end}"}
+        if self.etag:
+            # The server sends the whole file instead if it has changed
+            headers['If-Range'] = self.etag
+        
+        response = http.get(self.url, headers=headers, stream=True, timeout=REQUEST_TIMEOUT)
+        try:
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise DownloadError("The file changed on the server, restart the download")
+            
+            with open(self.part_path, 'r+b', buffering=WRITE_BUFFER_SIZE) as f:
+                f.seek(position)
+                unflushed = 0
+                try:
+                    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                        if self._abort.is_set():
+                            return
+                        if not chunk:
+                            continue
+                        chunk = chunk[:end + 1 - position]
+                        f.write(chunk)
+                        position += len(chunk)
+                        unflushed += len(chunk)
+                        with self._lock:
+                            segment['received'] = position - segment['start']
+                        if unflushed >= COMMIT_BYTES:
+                            self._commit(f, segment, position)
+                            unflushed = 0
+                        if position > end:
+                            break
+                finally:
+                    # Also when the stream fails: everything written so far
+                    # is kept, so the retry (or the next run) continues here
+                    self._commit(f, segment, position)
+        finally:
+            response.close()
+        
+        if position <= end:
+            raise ConnectionError(f"Connection closed at byte {position} of {end + 1}")
+    
+    def _commit(self, f, segment, position):
+        """Flush a segment's writer and mark its bytes as resumable."""
+        f.flush()
+        with self._lock:
+            segment['done'] = position - segment['start']
+    
+    def _fail(self, error):
+        """Record a fatal segment error and stop the other segments."""
+        with self._lock:
+            self._errors.append(error)
+        self._abort.set()
+    
+    def _hash_prefix(self, reader, hasher, hashed):
+        """
+        Feed newly committed bytes of the contiguous prefix to the hasher.
+        
+        Returns:
+            int: Number of bytes hashed so far
+        """
+        with self._lock:
+            prefix_end = 0
+            for segment in self._segments:
+                prefix_end = segment['start'] + segment['done']
+                if segment['done'] < self._length(segment):
+                    break
+        
+        if prefix_end > hashed:
+            reader.seek(hashed)
+            while hashed < prefix_end:
+                data = reader.read(min(CHUNK_SIZE, prefix_end - hashed))
+                if not data:
+                    break
+                hasher.update(data)
+                hashed += len(data)
+        return hashed
+    
+    @staticmethod
+    def _length(segment):
+        return segment['end'] - segment['start'] + 1
+    
+    # =========================================================================
+    # SINGLE STREAM FALLBACK
+    # =========================================================================
+    
+    def _download_single(self, http):
+        """Download without ranges; a dropped connection starts over."""
+        self._remove(self.state_path)
+        response = http.get(self.url, stream=True, timeout=REQUEST_TIMEOUT)
+        try:
+            response.raise_for_status()
+            length = response.headers.get('Content-Length', '')
+            self.size = int(length) if length.isdigit() else self.size
+            segment = {'start': 0, 'end': (self.size or 0) - 1, 'done': 0, 'received': 0}
+            self._segments = [segment]
+            
+            hasher = hashlib.sha256()
+            with open(self.part_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    if self.cancel_event.is_set():
+                        raise DownloadCancelled("Download cancelled")
+                    if not chunk:
+                        continue
+                    f.write(chunk)
+                    hasher.update(chunk)
+                    segment['received'] += len(chunk)
+                    self._report_progress()
+        finally:
+            response.close()
+        
+        if self.size is not None and segment['received'] != self.size:
+            raise DownloadError(f"Download incomplete ({segment['received']} of {self.size} bytes)")
+        self.size = segment['received']
+        self.sha256 = hasher.hexdigest()
+        self._report_progress(force=True)
+    
+    # =========================================================================
+    # VERIFICATION, PROGRESS AND STATE
+    # =========================================================================
+    
+    def _verify(self):
+        """Compare the digest with the expected one; discard the file on mismatch."""
+        if self.expected_sha256 is None or self.sha256 == self.expected_sha256:
+            return
+        self._remove(self.part_path)
+        self._remove(self.state_path)
+        raise DownloadError(
+            f"SHA-256 mismatch (expected {self.expected_sha256[:12]}..., got {self.sha256[:12]}...)"
+        )
+    
+    def _report_progress(self, force=False):
+        """Call the progress callback, throttled to PROGRESS_INTERVAL."""
+        if not self.progress_callback:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_progress < PROGRESS_INTERVAL:
+            return
+        self._last_progress = now
+        with self._lock:
+            downloaded = sum(s['received'] for s in self._segments)
+        try:
+            self.progress_callback(downloaded, self.size or 0)
+        except Exception as e:
+            print(f"Progress callback error: {e}")
+    
+    def _load_state(self) -> Optional[Dict[str, Any]]:
+        """Read the sidecar of an earlier attempt, if any."""
+        try:
+            with open(self.state_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _save_state(self):
+        """Write the committed segment progress to the sidecar."""
+        with self._lock:
+            segments: List[list] = [[s['start'], s['end'], s['done']] for s in self._segments]
+        try:
+            atomic_write_json(self.state_path, {
+                'version': STATE_VERSION,
+                'url': self.url,
+                'size': self.size,
+                'etag': self.etag,
+                'segments': segments,
+            })
+        except Exception as e:
+            print(f"Could not save download progress: {e}")
+        self._last_state_save = time.monotonic()
+    
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -10,16 +10,161 @@ This module provides high-level game automation functions including:
 
 import time
 import os
+import threading
 
 from pynput.keyboard import Key
 from . import input_handler
-import cv2
 import pyautogui
-import numpy as np
 
 from . import state
 from . import automation
+from . import checkpoint
+from . import vision
+from . import capture
+from .cancellation import Cancelled
+from .scheduler import TaskScheduler
 from .config import Config
+from .localization import localizer
+from .sell_policy import sell_policy
+
+
+# =============================================================================
+# LIVE CONFIG
+# =============================================================================
+
+# Local copies of the values read in the hot loops. Config changes are only
+# picked up at plot boundaries (see _apply_config_changes) so a running
+# plot always finishes with consistent timings.
+_live = {
+    'MOVE_DELAY': Config.MOVE_DELAY,
+    'HARVEST_DELAY': Config.HARVEST_DELAY,
+    'HARVEST_COUNT': Config.HARVEST_COUNT,
+    'MOTION_SETTLE_ENABLED': Config.MOTION_SETTLE_ENABLED,
+    'LOCALIZATION_ENABLED': Config.LOCALIZATION_ENABLED,
+}
+_config_dirty = threading.Event()
+
+
+def _on_config_changed(changed):
+    """Config subscriber - flag cached values as stale (any thread)."""
+    _config_dirty.set()
+
+
+Config.subscribe(_on_config_changed, keys=_live.keys())
+
+
+def _apply_config_changes(logger=None, force=False):
+    """
+    Refresh the cached config values if they changed.
+    
+    Args:
+        logger: Optional logging function to report applied changes
+        force: Refresh even if no change notification was received
+        
+    Returns:
+        bool: True if any cached value changed
+    """
+    if not force and not _config_dirty.is_set():
+        return False
+    _config_dirty.clear()
+    
+    applied = []
+    for key in _live:
+        value = getattr(Config, key)
+        if _live[key] != value:
+            _live[key] = value
+            applied.append(f"{key}={value}")
+    
+    if applied and logger and not force:
+        logger(f"⚙️ Applied new settings: {', '.join(applied)}", "info")
+    return bool(applied)
+
+
+# =============================================================================
+# PAUSE AND CHECKPOINTS
+# =============================================================================
+
+def _wait(seconds):
+    """Sleep that is cut short by STOP and held by PAUSE (raises Cancelled)."""
+    state.cancel_token.wait(seconds)
+
+
+def _hold_wait(seconds):
+    """Sleep while keys are held down: cut short by STOP, never held by PAUSE."""
+    state.cancel_token.wait(seconds, honour_pause=False)
+
+
+def _autobuy_remaining():
+    """Seconds left on the auto-buy timer, or None if it is not active."""
+    if not Config.AUTOBUY_ENABLED or 'last_buy_time' not in state.stats:
+        return None
+    return max(0, Config.AUTOBUY_INTERVAL - (time.time() - state.stats['last_buy_time']))
+
+
+def _save_progress(plan_index, grid):
+    """
+    Checkpoint the current position as a step of the snake plan.
+    
+    Args:
+        plan_index: Index of the current plot in the plan
+        grid: (rows, columns) the plan was built for
+    """
+    checkpoint.save_checkpoint(
+        row=state.current_position['row'],
+        col=state.current_position['col'],
+        plan_index=plan_index,
+        cycle=state.stats['cycles'],
+        rows=grid[0],
+        columns=grid[1],
+        autobuy_remaining=_autobuy_remaining(),
+    )
+
+
+def resume_from_checkpoint(logger=print):
+    """
+    Restore progress saved by an interrupted session.
+    
+    The character is expected to still stand on the checkpointed plot;
+    where cell fingerprints are known, the position is checked visually
+    and corrected first. Restores the tracked position, cycle counter and
+    auto-buy timer.
+    
+    Returns:
+        int: Plan index to start the first cycle at (0 = from the start)
+    """
+    saved = checkpoint.load_checkpoint()
+    if not saved:
+        return 0
+    
+    if saved['rows'] != Config.ROWS or saved['columns'] != Config.COLUMNS:
+        logger("⚠️ Saved progress is for a different grid size - starting over", "warning")
+        checkpoint.clear_checkpoint()
+        return 0
+    
+    state.current_position['row'] = saved['row']
+    state.current_position['col'] = saved['col']
+    state.stats['cycles'] = max(0, saved['cycle'] - 1)
+    if saved.get('autobuy_remaining') is not None and Config.AUTOBUY_ENABLED:
+        state.stats['last_buy_time'] = time.time() - (Config.AUTOBUY_INTERVAL - saved['autobuy_remaining'])
+    
+    plan_length = Config.ROWS * Config.COLUMNS
+    if saved['plan_index'] >= plan_length:
+        # Interrupted on the way back to (0, 0) - finish that and start fresh
+        logger(f"↩️ Resuming: returning to start after cycle #{saved['cycle']}", "info")
+        state.stats['cycles'] = saved['cycle']
+        return_to_start(logger)
+        checkpoint.clear_checkpoint()
+        return 0
+    
+    logger(
+        f"↩️ Resuming cycle #{saved['cycle']} at plot ({saved['row']}, {saved['col']}) "
+        f"- {plan_length - saved['plan_index']} plot(s) left",
+        "info"
+    )
+    # Check the saved plot against the screen before trusting it
+    verify_position(logger)
+    state.notify_stats_changed()
+    return saved['plan_index']
 
 
 # =============================================================================
@@ -36,28 +181,39 @@ def _press_shift_key(key_char, pre_delay=0.2, post_delay=0.5):
         post_delay: Delay after releasing all keys
     """
     input_handler.key_down('shift')
-    time.sleep(pre_delay)
-    input_handler.key_down(key_char)
-    time.sleep(pre_delay)
-    input_handler.key_up(key_char)
-    input_handler.key_up('shift')
-    time.sleep(post_delay)
+    try:
+        _hold_wait(pre_delay)
+        input_handler.key_down(key_char)
+        try:
+            _hold_wait(pre_delay)
+        finally:
+            input_handler.key_up(key_char)
+    finally:
+        # Never leave keys held down, even when stopped mid-combination
+        input_handler.key_up('shift')
+    _wait(post_delay)
 
 
 def _take_thresholded_screenshot():
     """
     Take a screenshot and apply binary threshold for template matching.
     
+    The gray and thresholded images are views into reused buffers, so they
+    are only valid until the next screenshot is taken on this thread.
+    
     Returns:
-        tuple: (screenshot_np, screenshot_gray, screenshot_thresh)
+        tuple: (screenshot_np, screenshot_gray, screenshot_thresh, origin)
+            origin is the screen position (x, y) of the top-left pixel of
+            the capture target
     """
-    screenshot = np.array(pyautogui.screenshot())
-    screenshot_gray = cv2.cvtColor(screenshot, cv2.COLOR_RGB2GRAY)
-    _, screenshot_thresh = cv2.threshold(screenshot_gray, 200, 255, cv2.THRESH_BINARY)
-    return screenshot, screenshot_gray, screenshot_thresh
+    screenshot, origin = capture.target.grab()
+    vision.buffers.count_detection(screenshot)
+    screenshot_gray = vision.to_gray(screenshot)
+    screenshot_thresh = vision.to_binary(screenshot_gray)
+    return screenshot, screenshot_gray, screenshot_thresh, origin
 
 
-def _match_and_find(screenshot_thresh, template_thresh, threshold=0.8):
+def _match_and_find(screenshot_thresh, template_thresh, threshold=0.8, origin=(0, 0)):
     """
     Perform template matching and return location if above threshold.
     
@@ -65,74 +221,130 @@ def _match_and_find(screenshot_thresh, template_thresh, threshold=0.8):
         screenshot_thresh: Thresholded screenshot
         template_thresh: Thresholded template
         threshold: Confidence threshold
+        origin: Screen position of the screenshot's top-left pixel
         
     Returns:
-        tuple or None: (max_loc, max_val, match_found)
+        tuple or None: (max_loc, max_val, match_found), max_loc in screen
+            coordinates
     """
-    result = cv2.matchTemplate(screenshot_thresh, template_thresh, cv2.TM_CCOEFF_NORMED)
-    _, max_val, _, max_loc = cv2.minMaxLoc(result)
-    return max_loc, max_val, max_val >= threshold
+    max_loc, max_val = vision.match(screenshot_thresh, template_thresh)
+    return (max_loc[0] + origin[0], max_loc[1] + origin[1]), max_val, max_val >= threshold
 
 
 # =============================================================================
 # CROP MANAGEMENT
 # =============================================================================
 
-def sell_crops(logger=print):
-    """Handle selling crops when inventory is full."""
+# Where the character is during a sell trip. A trip is split into
+# scheduler tasks (sell -> journal -> return) so other trips can join it.
+_trip = {
+    'away': False,             # Teleported away from the garden
+    'journal_pending': False,  # Journal prompt may be showing after a sale
+    'saved_position': None,    # Grid position to restore on return
+    'at_shop': False,          # Teleported to the shop and not back yet
+    'sold': False,             # The trip sold crops (for the return message)
+}
+
+
+def _sell_all(logger=print, planned=False):
+    """
+    Open the sell menu and sell everything (first leg of a sell trip).
+    
+    Args:
+        logger: Logging function
+        planned: True if the sell policy chose this point ahead of time,
+            False if the inventory full popup triggered it
+    """
     state.stats['total_sells'] += 1
     state.stats['last_sell_time'] = time.time()
+    state.record_plot_metric(state.current_position['row'], state.current_position['col'], 'sells', 1)
+    state.notify_stats_changed()
     
-    logger(f"📦 Inventory full at ({state.current_position['row']}, {state.current_position['col']}) - Selling...", "warning")
+    position = f"({state.current_position['row']}, {state.current_position['col']})"
+    if planned:
+        state.stats['planned_sells'] += 1
+        logger(f"🧺 Inventory about {sell_policy.fill_ratio():.0%} full at {position} - Selling at row end...", "info")
+    else:
+        logger(f"📦 Inventory full at {position} - Selling...", "warning")
+    sell_policy.record_sell(planned)
     
     # Save position before leaving to sell
-    saved_position = state.current_position.copy()
+    _trip['saved_position'] = state.current_position.copy()
+    _trip['away'] = True
+    _trip['sold'] = True
     
     automation.press_hotkey(Key.shift, '3')  # Open sell menu
-    time.sleep(0.3)
+    _wait(0.3)
     automation.press_key(Key.space)          # Press "Sell All"
-    time.sleep(0.5)
- 
+    _wait(0.5)
+    _trip['journal_pending'] = True
+
+
+def _handle_journal_prompt(logger=print):
+    """Log new items if the journal prompt appeared after selling, then resell."""
+    _trip['journal_pending'] = False
+    
     go_to_journal_img = os.path.join(Config.IMAGE_FOLDER, "go_to_journal.png")
     journal_btn_loc = automation.locate_image(go_to_journal_img, confidence=Config.CONFIDENCE)
+    if not journal_btn_loc:
+        return
     
-    if journal_btn_loc:
-        logger("📘 Journal interruption detected! Handling...", "info")
-        automation.click_region(journal_btn_loc)
-        time.sleep(1.0)  # Wait for journal to open
-        
-        log_items_img = os.path.join(Config.IMAGE_FOLDER, "log_new_items_in_journal.png")
-        if automation.locate_image(log_items_img, confidence=Config.CONFIDENCE):
-            logger("📝 Logging new items...", "info")
-            automation.press_key(Key.space)
-        
-        time.sleep(5.0)
-        automation.press_key(Key.esc)
-        time.sleep(0.5)
-        
-        logger("🔄 Reselling...", "info")
-        
-        # Use hotkey instead of clicking image
-        automation.press_hotkey(Key.shift, '3')
-        time.sleep(0.3)
-
+    logger("📘 Journal interruption detected! Handling...", "info")
+    automation.click_region(journal_btn_loc)
+    _wait(1.0)  # Wait for journal to open
+    
+    log_items_img = os.path.join(Config.IMAGE_FOLDER, "log_new_items_in_journal.png")
+    if automation.locate_image(log_items_img, confidence=Config.CONFIDENCE):
+        logger("📝 Logging new items...", "info")
         automation.press_key(Key.space)
-        time.sleep(0.5)
-
-    automation.press_hotkey(Key.shift, '2')
-    time.sleep(Config.SELL_RETURN_DELAY)
     
-    # Restore position
-    state.current_position.update(saved_position)
+    _wait(5.0)
+    automation.press_key(Key.esc)
+    _wait(0.5)
     
-    logger("✓ Crops sold! Resuming harvest...", "success")
+    logger("🔄 Reselling...", "info")
+    
+    # Use hotkey instead of clicking image
+    automation.press_hotkey(Key.shift, '3')
+    _wait(0.3)
+    
+    automation.press_key(Key.space)
+    _wait(0.5)
+
+
+def _return_to_garden(logger=print):
+    """Teleport back to the garden and restore the grid position."""
+    automation.press_hotkey(Key.shift, '2')
+    _wait(Config.SELL_RETURN_DELAY)
+    sold = _trip['sold']
+    _restore_trip_position()
+    if sold:
+        logger("✓ Crops sold! Resuming harvest...", "success")
+    else:
+        logger("✓ Back in the garden.", "info")
+
+
+def _restore_trip_position():
+    """Restore the position saved when a trip left the garden."""
+    if _trip['saved_position'] is not None:
+        state.current_position.update(_trip['saved_position'])
+    _trip['away'] = False
+    _trip['sold'] = False
+    _trip['saved_position'] = None
+
+
+def sell_crops(logger=print):
+    """Handle selling crops when inventory is full (a complete sell trip)."""
+    _sell_all(logger)
+    _handle_journal_prompt(logger)
+    _return_to_garden(logger)
 
 
 # =============================================================================
 # MOVEMENT
 # =============================================================================
 
-def move(direction, steps=1, logger=print):
+def move(direction, steps=1, logger=print, safe_points=True):
     """
     Move in a given direction for a number of steps.
     
@@ -140,6 +352,8 @@ def move(direction, steps=1, logger=print):
         direction: 'w', 'a', 's', or 'd'
         steps: Number of steps to move
         logger: Logging function
+        safe_points: If False, scheduled tasks (sell, auto-buy) do not run
+            between steps (used by calibration)
     """
     # Direction to position delta mapping
     DIRECTION_DELTA = {
@@ -153,6 +367,10 @@ def move(direction, steps=1, logger=print):
         if not state.bot_running:
             return
         
+        # Watch the view settle instead of always waiting the full delay
+        settle = _live['MOTION_SETTLE_ENABLED'] and automation.CV2_AVAILABLE
+        reference = automation.capture_player_roi() if settle else None
+        
         automation.press_key(direction)
         state.stats['total_moves'] += 1
         
@@ -161,42 +379,121 @@ def move(direction, steps=1, logger=print):
             axis, delta = DIRECTION_DELTA[direction]
             state.current_position[axis] += delta
         
-        time.sleep(Config.MOVE_DELAY)
+        if settle:
+            automation.wait_for_motion_settle(reference, timeout=_live['MOVE_DELAY'])
+        else:
+            _wait(_live['MOVE_DELAY'])
         
-        if automation.check_inventory_full():
-            sell_crops(logger)
+        if safe_points:
+            _safe_point(logger)
 
 
 def harvest(logger=print):
     """Harvest the current plot."""
-    for _ in range(Config.HARVEST_COUNT):
+    row, col = state.current_position['row'], state.current_position['col']
+    plot_start = time.time()
+    presses = 0
+    
+    for _ in range(_live['HARVEST_COUNT']):
         if not state.bot_running:
             return
         
-        if automation.check_inventory_full():
-            sell_crops(logger)
+        if 'sell' in _safe_point(logger):
+            # The press before the sale was wasted on a full inventory
             automation.press_key(Key.space)
+            presses += 1
 
         automation.press_key(Key.space)
-        time.sleep(Config.HARVEST_DELAY)
+        presses += 1
+        _wait(_live['HARVEST_DELAY'])
     
+    state.record_plot_metric(row, col, 'time', time.time() - plot_start)
+    state.record_plot_metric(row, col, 'presses', presses)
     state.stats['total_harvests'] += 1
+    sell_policy.record_harvest()
+    state.notify_stats_changed()
+
+
+def _walk_to(row, col, logger=print):
+    """Move from the tracked position to the given cell (rows first)."""
+    d_row = row - state.current_position['row']
+    d_col = col - state.current_position['col']
+    if d_row:
+        move('s' if d_row > 0 else 'w', abs(d_row), logger=logger)
+    if d_col:
+        move('d' if d_col > 0 else 'a', abs(d_col), logger=logger)
 
 
-def return_to_start(logger=print):
+def return_to_start(logger=print, safe_points=True):
     """Return to the starting position (0, 0)."""
     # Move up to the first row
     if state.current_position['row'] > 0:
-        move('w', state.current_position['row'], logger=logger)
+        move('w', state.current_position['row'], logger=logger, safe_points=safe_points)
     
     # Move left to the first column
     if state.current_position['col'] > 0:
-        move('a', state.current_position['col'], logger=logger)
+        move('a', state.current_position['col'], logger=logger, safe_points=safe_points)
     
     state.current_position['row'] = 0
     state.current_position['col'] = 0
 
 
+# =============================================================================
+# POSITION LOCALIZATION
+# =============================================================================
+
+def _on_grid_size_changed(changed):
+    """Config subscriber - cell fingerprints no longer match a resized grid."""
+    localizer.reset()
+
+
+Config.subscribe(_on_grid_size_changed, keys=('ROWS', 'COLUMNS'))
+
+
+def _localization_active():
+    """Return True if visual localization should run."""
+    return _live['LOCALIZATION_ENABLED'] and localizer.available
+
+
+def _learn_position():
+    """Fingerprint the current cell if it has not been seen yet."""
+    row, col = state.current_position['row'], state.current_position['col']
+    if _localization_active() and not localizer.knows(row, col):
+        localizer.learn(row, col)
+
+
+def verify_position(logger=print):
+    """
+    Compare dead reckoning with the visual estimate and fix any drift.
+    
+    If the screen clearly matches a different cell, the tracked position
+    is set to that cell and the character walks back to where the plan
+    expects it to be.
+    
+    Returns:
+        bool: True if a correction was made
+    """
+    if not _localization_active():
+        return False
+    
+    expected = (state.current_position['row'], state.current_position['col'])
+    actual, best_score, expected_score = localizer.locate(expected)
+    if actual == expected:
+        return False
+    
+    logger(
+        f"🧭 Drift detected: at {actual} instead of {expected} "
+        f"(match {best_score:.2f} vs {expected_score:.2f}) - correcting...",
+        "warning"
+    )
+    localizer.corrections += 1
+    state.stats['position_corrections'] += 1
+    state.current_position['row'], state.current_position['col'] = actual
+    _walk_to(*expected, logger=logger)
+    state.notify_stats_changed()
+    return True
+
+
 # =============================================================================
 # AUTOBUY HELPERS
 # =============================================================================
@@ -216,27 +513,26 @@ def _load_autobuy_templates(seeds_to_buy, logger):
     for seed_name in seeds_to_buy:
         item_image = f"text_{seed_name.lower().replace(' ', '_')}.png"
         item_template_path = os.path.join(Config.IMAGE_FOLDER, item_image)
-        template = cv2.imread(item_template_path, cv2.IMREAD_GRAYSCALE)
+        template = automation.get_template(item_template_path)
         if template is not None:
-            _, template_thresh = cv2.threshold(template, 200, 255, cv2.THRESH_BINARY)
-            seed_templates[seed_name] = (template, template_thresh)
+            seed_templates[seed_name] = (template.image, template.binary)
         else:
             logger(f"⚠️ Could not load template for {seed_name}", "warning")
     
     # Load buy button template
     buy_button_path = os.path.join(Config.IMAGE_FOLDER, "buy_button_green.png")
-    buy_button_template = cv2.imread(buy_button_path, cv2.IMREAD_GRAYSCALE)
-    if buy_button_template is None:
+    buy_button = automation.get_template(buy_button_path)
+    if buy_button is None:
         logger("❌ Could not load buy button template", "error")
         return None, None, None
-    _, buy_thresh = cv2.threshold(buy_button_template, 200, 255, cv2.THRESH_BINARY)
+    buy_button_template, buy_thresh = buy_button.image, buy_button.binary
     
     # Load shop header template
     header_path = os.path.join(Config.IMAGE_FOLDER, "seed_shop_header.png")
-    header_template = cv2.imread(header_path, cv2.IMREAD_GRAYSCALE)
-    header_thresh = None
-    if header_template is not None:
-        _, header_thresh = cv2.threshold(header_template, 200, 255, cv2.THRESH_BINARY)
+    header = automation.get_template(header_path)
+    header_template = header_thresh = None
+    if header is not None:
+        header_template, header_thresh = header.image, header.binary
     
     return seed_templates, (buy_button_template, buy_thresh), (header_template, header_thresh)
 
@@ -249,26 +545,28 @@ def _open_shop(logger):
         bool: True if shop opened successfully
     """
     logger("🏪 Teleporting to shop...", "info")
+    _trip['at_shop'] = True
     _press_shift_key('1')
     
     logger("🚪 Opening shop...", "info")
     input_handler.key_down('space')
-    time.sleep(0.2)
-    input_handler.key_up('space')
-    time.sleep(0.5)
+    try:
+        _hold_wait(0.2)
+    finally:
+        input_handler.key_up('space')
+    _wait(0.5)
     
     # Verify shop is open
-    _, screenshot_gray, _ = _take_thresholded_screenshot()
+    _, screenshot_gray, _, _ = _take_thresholded_screenshot()
     
     template_path = os.path.join(Config.IMAGE_FOLDER, "seed_shop_header.png")
-    template = cv2.imread(template_path, cv2.IMREAD_GRAYSCALE)
+    template = automation.get_template(template_path)
     
     if template is None:
         logger("❌ Could not load shop header template", "error")
         return False
     
-    result = cv2.matchTemplate(screenshot_gray, template, cv2.TM_CCOEFF_NORMED)
-    _, max_val, _, _ = cv2.minMaxLoc(result)
+    _, max_val = vision.match(screenshot_gray, template.image)
     
     if max_val < 0.8:
         logger(f"❌ Shop not detected (confidence: {max_val:.2f})", "error")
@@ -282,12 +580,13 @@ def _close_shop_and_return(logger):
     """Close shop and return to garden."""
     logger("🚪 Closing shop...", "info")
     input_handler.press('esc')
-    time.sleep(0.5)
+    _wait(0.5)
     input_handler.press('esc')
-    time.sleep(0.5)
+    _wait(0.5)
     
     logger("🌱 Returning to garden...", "info")
     _press_shift_key('2')
+    _trip['at_shop'] = False
 
 
 def _buy_seed(seed_name, center_x, center_y, buy_button_data, seeds_per_trip, logger):
@@ -308,12 +607,12 @@ def _buy_seed(seed_name, center_x, center_y, buy_button_data, seeds_per_trip, lo
     
     logger(f"🖱️ Clicking on {seed_name}...", "info")
     pyautogui.click(center_x, center_y)
-    time.sleep(1.0)  # Wait for dropdown
+    _wait(1.0)  # Wait for dropdown
     
     # Take new screenshot to find buy button
-    _, _, screenshot_thresh = _take_thresholded_screenshot()
+    _, _, screenshot_thresh, origin = _take_thresholded_screenshot()
     
-    max_loc, max_val, found = _match_and_find(screenshot_thresh, buy_thresh)
+    max_loc, max_val, found = _match_and_find(screenshot_thresh, buy_thresh, origin=origin)
     
     if found:
         btn_height, btn_width = buy_button_template.shape
@@ -323,7 +622,7 @@ def _buy_seed(seed_name, center_x, center_y, buy_button_data, seeds_per_trip, lo
         logger(f"💰 Purchasing {seeds_per_trip}x {seed_name}...", "info")
         for _ in range(seeds_per_trip):
             pyautogui.click(btn_center_x, btn_center_y)
-            time.sleep(0.3)
+            _wait(0.3)
         
         logger(f"✓ Purchased {seeds_per_trip}x {seed_name}!", "success")
         return True
@@ -390,22 +689,20 @@ def run_autobuy_routine(logger=print):
                 break
             
             # Take screenshot
-            _, _, screenshot_thresh = _take_thresholded_screenshot()
+            _, _, screenshot_thresh, origin = _take_thresholded_screenshot()
             
-            # Check for each remaining seed
+            # Check for each remaining seed (matched in parallel, see vision.match_many)
+            remaining_seeds = [name for name in remaining_seeds if name in seed_templates]
+            matches = vision.match_many(
+                screenshot_thresh, [seed_templates[name][1] for name in remaining_seeds]
+            )
             seeds_found_this_view = []
-            for seed_name in remaining_seeds[:]:
-                if seed_name not in seed_templates:
-                    remaining_seeds.remove(seed_name)
-                    continue
-                
-                template, template_thresh = seed_templates[seed_name]
-                max_loc, max_val, found = _match_and_find(screenshot_thresh, template_thresh)
-                
-                if found:
+            for seed_name, (max_loc, max_val) in zip(remaining_seeds, matches):
+                template = seed_templates[seed_name][0]
+                if max_val >= 0.8:
                     template_height, template_width = template.shape
-                    center_x = max_loc[0] + template_width // 2
-                    center_y = max_loc[1] + template_height // 2
+                    center_x = origin[0] + max_loc[0] + template_width // 2
+                    center_y = origin[1] + max_loc[1] + template_height // 2
                     seeds_found_this_view.append((seed_name, center_x, center_y, max_val))
             
             # Buy seeds found (sorted by Y position)
@@ -422,14 +719,18 @@ def run_autobuy_routine(logger=print):
                     seeds_bought += seeds_per_trip
                 
                 remaining_seeds.remove(seed_name)
-                time.sleep(0.3)
+                _wait(0.3)
             
             if not remaining_seeds:
                 break
             
             # Scroll down
             if scroll_idx < max_scrolls - 1:
-                _scroll_shop(screenshot_thresh, header_template, header_thresh, scroll_idx, max_scrolls, logger)
+                if seeds_found_this_view:
+                    # _buy_seed took screenshots since, which reused the
+                    # buffers behind screenshot_thresh - look again
+                    _, _, screenshot_thresh, origin = _take_thresholded_screenshot()
+                _scroll_shop(screenshot_thresh, origin, header_template, header_thresh, scroll_idx, max_scrolls, logger)
         
         # Report any seeds not found
         if remaining_seeds:
@@ -440,17 +741,21 @@ def run_autobuy_routine(logger=print):
         logger(f"✓ Auto-buy completed! Bought {seeds_bought} from {len(seeds_to_buy)} seed type(s).", "success")
         return seeds_bought > 0
         
+    except Cancelled:
+        logger("⏹️ Autobuy stopped by user", "warning")
+        input_handler.press('escape')
+        raise
     except Exception as e:
         logger(f"❌ Auto-buy error: {e}", "error")
         return False
 
 
-def _scroll_shop(screenshot_thresh, header_template, header_thresh, scroll_idx, max_scrolls, logger):
+def _scroll_shop(screenshot_thresh, origin, header_template, header_thresh, scroll_idx, max_scrolls, logger):
     """Scroll shop to find more seeds."""
     if header_thresh is None:
         return
     
-    max_loc, max_val, found = _match_and_find(screenshot_thresh, header_thresh, threshold=0.7)
+    max_loc, max_val, found = _match_and_find(screenshot_thresh, header_thresh, threshold=0.7, origin=origin)
     
     if found:
         header_h, header_w = header_template.shape
@@ -458,56 +763,160 @@ def _scroll_shop(screenshot_thresh, header_template, header_thresh, scroll_idx,
         scroll_y = max_loc[1] + header_h // 2 + 200
         
         pyautogui.moveTo(header_center_x, scroll_y)
-        time.sleep(0.3)
+        _wait(0.3)
         pyautogui.scroll(-600)
-        time.sleep(1.0)
+        _wait(1.0)
         logger(f"📜 Scrolling... ({scroll_idx + 1}/{max_scrolls})", "info")
     else:
         # Try to recover shop view
         logger("⚠️ Shop header lost, attempting recovery...", "warning")
         input_handler.press('escape')
-        time.sleep(0.3)
+        _wait(0.3)
         _press_shift_key('1')
         input_handler.press('space')
-        time.sleep(1.0)
+        _wait(1.0)
 
 
 # =============================================================================
-# AUTOBUY TIMER HELPER
+# SCHEDULER
 # =============================================================================
 
-def _check_autobuy_timer(logger):
+def _autobuy_due():
+    """Deadline of the next auto-buy, or None while auto-buy is off."""
+    if not Config.AUTOBUY_ENABLED or 'last_buy_time' not in state.stats:
+        return None
+    return state.stats['last_buy_time'] + Config.AUTOBUY_INTERVAL
+
+
+def _run_scheduled_autobuy(logger=print):
+    """Auto-buy task - visit the shop and restart the interval."""
+    if _trip['away']:
+        state.stats['merged_trips'] += 1
+        logger("🔗 Combining auto-buy with this sell trip", "info")
+    else:
+        logger(f"⏰ Auto-buy timer reached ({Config.AUTOBUY_INTERVAL}s)", "warning")
+    _trip['at_shop'] = False
+    if run_autobuy_routine(logger):
+        logger(f"✓ Auto-buy complete. Next one in {Config.AUTOBUY_INTERVAL}s.", "success")
+    else:
+        logger(f"⚠️ Auto-buy failed, will retry in {Config.AUTOBUY_INTERVAL}s", "warning")
+    state.stats['last_buy_time'] = time.time()
+    
+    if _trip['at_shop']:
+        # The routine gave up at the shop without teleporting back - keep the
+        # trip open so the 'return' task brings the character home
+        _trip['at_shop'] = False
+        if not _trip['away']:
+            _trip['saved_position'] = state.current_position.copy()
+            _trip['away'] = True
+    else:
+        # A completed shop leg ends with a teleport back to the garden
+        _restore_trip_position()
+
+
+def _inventory_full():
+    """Sell condition - only checked while in the garden."""
+    return not _trip['away'] and automation.check_inventory_full()
+
+
+# Plots within this many steps of (0, 0) count as cheap trip points
+TRIP_NEAR_START_DISTANCE = 1
+
+# Where the harvest route currently is, used to place trips
+_route = {
+    'at_boundary': True,  # Between plots (False at mid-plot safe points)
+    'cheap': True,        # Upcoming plot is a row end or near the start
+    'row_end': False,     # Upcoming plot is the last one of its row
+}
+
+
+def reset_trip_state():
     """
-    Check if autobuy timer has triggered and run autobuy if needed.
+    Forget any trip and route state left by an earlier run.
     
-    Returns:
-        bool: True if autobuy was triggered
+    A run stopped mid-trip (e.g. during the journal wait) leaves the
+    character's trip open; a new run must not teleport back or restore
+    that stale position on its own.
     """
-    if not Config.AUTOBUY_ENABLED or 'last_buy_time' not in state.stats:
+    _trip.update(away=False, journal_pending=False, saved_position=None, at_shop=False, sold=False)
+    _route.update(at_boundary=True, cheap=True, row_end=False)
+
+
+def _is_cheap_point(row, col, next_move):
+    """Row ends and plots near the start tile are the cheapest places to leave from."""
+    return next_move in ('s', None) or row + col <= TRIP_NEAR_START_DISTANCE
+
+
+def _planned_sell_due():
+    """Sell condition - sell at a row end before the inventory is predicted to fill."""
+    if not Config.PROACTIVE_SELL_ENABLED or _trip['away']:
         return False
+    if not (_route['at_boundary'] and _route['row_end']):
+        return False
+    # The next row end is one row of plots away
+    return sell_policy.should_sell(Config.COLUMNS, Config.SELL_FILL_THRESHOLD)
+
+
+def _autobuy_early():
+    """An auto-buy due within the lateness budget may join a sell trip early."""
+    return Config.TRIP_LATENESS_BUDGET if _trip['away'] else 0
+
+
+def _autobuy_placement(lateness):
+    """
+    Decide whether a due (or nearly due) auto-buy should run now.
     
-    time_remaining = Config.AUTOBUY_INTERVAL - (time.time() - state.stats['last_buy_time'])
-    state.stats['next_buy_time'] = max(0, time_remaining)
-    
-    if time_remaining <= 0:
-        logger(f"⏰ Auto-buy timer reached - pausing harvest...", "warning")
-        if run_autobuy_routine(logger):
-            state.stats['last_buy_time'] = time.time()
-            state.stats['next_buy_time'] = Config.AUTOBUY_INTERVAL
-            logger("✓ Auto-buy complete. Resuming harvest...", "success")
-        else:
-            logger(f"⚠️ Auto-buy failed, will retry in {Config.AUTOBUY_INTERVAL}s", "warning")
-            state.stats['last_buy_time'] = time.time()
+    - During a sell trip: yes, the shop visit is merged into the trip
+    - Mid-plot: no, wait for the plot boundary
+    - At a plot boundary: only at a cheap point, unless the lateness
+      budget is used up
+    """
+    if _trip['away']:
         return True
+    if not _route['at_boundary']:
+        return False
+    return _route['cheap'] or lateness >= Config.TRIP_LATENESS_BUDGET
+
+
+# Shared by all loops. Priorities: lower runs first at a safe point.
+# A due auto-buy ranks before the return leg so one trip can sell, go on to
+# the shop (shift+1) and only then come back (shift+2).
+scheduler = TaskScheduler(state.cancel_token)
+scheduler.add_condition('journal', 0, lambda: _trip['journal_pending'], _handle_journal_prompt)
+scheduler.add_condition('planned_sell', 1, _planned_sell_due,
+                        lambda logger: _sell_all(logger, planned=True))
+scheduler.add_condition('sell', 1, _inventory_full, _sell_all)
+scheduler.add_timed('autobuy', 2, _autobuy_due, _run_scheduled_autobuy,
+                    early=_autobuy_early, placement=_autobuy_placement)
+scheduler.add_condition('return', 3, lambda: _trip['away'], _return_to_garden)
+
+# Shop Mode only buys: no inventory checks or sells, and 'return' only
+# brings the character back from a shop visit that gave up at the shop
+SHOP_MODE_TASKS = ('autobuy', 'return')
+
+
+def _safe_point(logger=print):
+    """
+    Run ready tasks in the middle of a plot.
+    
+    Selling runs here; auto-buy only runs if it can join a sell trip,
+    otherwise it waits for a plot boundary (see _autobuy_placement).
     
-    return False
+    Returns:
+        list: Names of the tasks that ran
+    """
+    _route['at_boundary'] = False
+    try:
+        return scheduler.run_ready(logger)
+    finally:
+        _route['at_boundary'] = True
 
 
 # =============================================================================
 # MAIN AUTOMATION LOOPS
 # =============================================================================
 
-def harvest_loop(logger=print):
+def harvest_loop(logger=print, start_index=0):
     """
     Main automation loop that handles harvesting and/or auto-buy based on configuration.
     
@@ -515,6 +924,10 @@ def harvest_loop(logger=print):
     1. Harvesting + Auto-Buy
     2. Harvesting only
     3. Auto-Buy only
+    
+    Args:
+        logger: Logging function
+        start_index: Snake plan step to start at (used to resume a checkpoint)
     """
     # Validate configuration
     if not Config.HARVESTING_ENABLED and not Config.AUTOBUY_ENABLED:
@@ -523,6 +936,9 @@ def harvest_loop(logger=print):
         state.bot_running = False
         return
     
+    # Pick up the latest timings for this cycle
+    _apply_config_changes(force=True)
+    
     # Initialize auto-buy timer
     if Config.AUTOBUY_ENABLED and 'last_buy_time' not in state.stats:
         state.stats['last_buy_time'] = time.time()
@@ -536,89 +952,165 @@ def harvest_loop(logger=print):
     logger(f"🤖 Bot running in mode: {' + '.join(modes)}", "info")
     
     if Config.HARVESTING_ENABLED:
-        _run_harvesting_mode(logger)
+        _run_harvesting_mode(logger, start_index)
     else:
         _run_autobuy_only_mode(logger)
 
 
-def _run_harvesting_mode(logger):
-    """Execute harvesting mode with optional auto-buy."""
-    state.current_position['row'] = 0
-    state.current_position['col'] = 0
+def _build_snake_plan(rows, cols):
+    """
+    Build the harvesting route over the grid.
     
-    # Update autobuy timer display
-    if Config.AUTOBUY_ENABLED and 'last_buy_time' in state.stats:
-        state.stats['next_buy_time'] = max(0, Config.AUTOBUY_INTERVAL - (time.time() - state.stats['last_buy_time']))
+    Even rows are walked left to right, odd rows right to left.
     
-    # Harvest in snake pattern
-    for row in range(Config.ROWS):
-        if not state.bot_running:
-            return
+    Returns:
+        list: [(row, col, next_move)] where next_move is the direction to
+            the following plot, or None for the last plot
+    """
+    cells = []
+    for row in range(rows):
+        columns = range(cols) if row % 2 == 0 else range(cols - 1, -1, -1)
+        cells.extend((row, col) for col in columns)
+    
+    plan = []
+    for i, (row, col) in enumerate(cells):
+        next_move = None
+        if i + 1 < len(cells):
+            next_row, next_col = cells[i + 1]
+            if next_row > row:
+                next_move = 's'
+            else:
+                next_move = 'd' if next_col > col else 'a'
+        plan.append((row, col, next_move))
+    return plan
+
+
+def _run_harvesting_mode(logger, start_index=0):
+    """
+    Execute harvesting mode with optional auto-buy.
+    
+    Harvesting is the scheduler's main task, stepped one plot at a time;
+    auto-buy and selling run at the safe points between steps. Timing
+    changes apply from the next plot; grid size changes apply from the
+    next cycle. Progress is checkpointed at every plot.
+    
+    Args:
+        logger: Logging function
+        start_index: Plan step to start at; the character must already
+            stand on that plot
+    """
+    grid = (Config.ROWS, Config.COLUMNS)
+    plan = _build_snake_plan(*grid)
+    if start_index == 0:
+        state.current_position['row'] = 0
+        state.current_position['col'] = 0
+    
+    progress = {'index': start_index}
+    
+    def update_route():
+        """Mark whether the plot the character now stands on is a cheap trip point."""
+        index = progress['index']
+        _route['cheap'] = index >= len(plan) or _is_cheap_point(*plan[index])
+        _route['row_end'] = index < len(plan) and plan[index][2] in ('s', None)
+    
+    def harvest_step():
+        """Harvest the next plot of the plan and move on."""
+        index = progress['index']
+        if index >= len(plan) or not state.bot_running:
+            return False
         
+        row, col, next_move = plan[index]
         state.current_position['row'] = row
+        state.current_position['col'] = col
+        _apply_config_changes(logger)
         
-        if row % 2 == 0:
-            # Move right on even rows
-            for col in range(Config.COLUMNS):
-                if not state.bot_running:
-                    return
-                state.current_position['col'] = col
-                _check_autobuy_timer(logger)
-                harvest(logger)
-                if col < Config.COLUMNS - 1:
-                    move('d', logger=logger)
-        else:
-            # Move left on odd rows
-            for col in range(Config.COLUMNS - 1, -1, -1):
-                if not state.bot_running:
-                    return
-                state.current_position['col'] = col
-                _check_autobuy_timer(logger)
-                harvest(logger)
-                if col > 0:
-                    move('a', logger=logger)
+        # Row ends are where drift is checked
+        if next_move in ('s', None):
+            verify_position(logger)
+        _learn_position()
         
-        # Move down to next row
-        if row < Config.ROWS - 1:
-            move('s', logger=logger)
+        if progress.get('saved') != index:
+            _save_progress(index, grid)
+        harvest(logger)
+        if next_move:
+            move(next_move, logger=logger)
+            # Record the new plot as soon as the character stands on it
+            _save_progress(index + 1, grid)
+            progress['saved'] = index + 1
+        progress['index'] = index + 1
+        update_route()
+        return True
+    
+    # Harvest in snake pattern
+    update_route()
+    try:
+        scheduler.run(logger, step=harvest_step)
+    except Cancelled:
+        _save_stopped_progress(plan, grid)
+        raise
+    finally:
+        # Outside the grid every point is a good point for a trip
+        _route['cheap'] = True
+        _route['row_end'] = False
+    
+    if not state.bot_running:
+        _save_stopped_progress(plan, grid)
+        return
     
     # Return to start
-    if state.bot_running:
-        logger("✓ Grid finished. Returning to start...", "info")
+    logger("✓ Grid finished. Returning to start...", "info")
+    try:
         return_to_start(logger)
+    except Cancelled:
+        _save_progress(len(plan), grid)
+        checkpoint.flush_checkpoint()
+        raise
+    if state.bot_running:
+        checkpoint.clear_checkpoint()
+    else:
+        _save_progress(len(plan), grid)
+        checkpoint.flush_checkpoint()
+
+
+def _save_stopped_progress(plan, grid):
+    """Checkpoint the plot the character stopped on and write it now."""
+    position = (state.current_position['row'], state.current_position['col'])
+    for index, (row, col, _) in enumerate(plan):
+        if (row, col) == position:
+            _save_progress(index, grid)
+            break
+    checkpoint.flush_checkpoint()
 
 
 def _run_autobuy_only_mode(logger):
     """Execute auto-buy only mode (no harvesting)."""
-    logger("🛒 Auto-buy only mode - waiting for next purchase cycle...", "info")
+    remaining = max(0, int(_autobuy_due() - time.time()))
+    logger(f"🛒 Auto-buy only mode - next purchase in {remaining}s...", "info")
     
-    while state.bot_running:
-        current_time = time.time()
-        time_remaining = Config.AUTOBUY_INTERVAL - (current_time - state.stats['last_buy_time'])
-        
-        state.stats['next_buy_time'] = max(0, time_remaining)
-        
-        if time_remaining <= 0:
-            logger(f"⏰ Auto-buy timer reached ({Config.AUTOBUY_INTERVAL}s)", "warning")
-            if run_autobuy_routine(logger):
-                state.stats['last_buy_time'] = current_time
-                state.stats['next_buy_time'] = Config.AUTOBUY_INTERVAL
-                logger("✓ Auto-buy complete. Waiting for next cycle...", "success")
-            else:
-                logger(f"⚠️ Auto-buy failed, will retry in {Config.AUTOBUY_INTERVAL}s", "warning")
-                state.stats['last_buy_time'] = current_time
-        else:
-            if time_remaining > 10:
-                logger(f"⏳ Next auto-buy in {int(time_remaining)}s...", "info")
-            time.sleep(1)
+    # Sleeps until each auto-buy deadline; returns only when stopped
+    scheduler.run(logger, only=SHOP_MODE_TASKS)
+
+
+def wait_for_next_cycle(seconds, logger=print):
+    """
+    Cooldown between harvest cycles.
+    
+    Scheduled tasks (e.g. an auto-buy that falls due) still run during
+    the cooldown.
+    
+    Args:
+        seconds: Cooldown length
+        logger: Logging function
+    """
+    scheduler.run(logger, until=time.time() + seconds)
 
 
 def run_shop_only_loop(logger=print):
     """
     Dedicated shop-only automation loop.
     
-    Loops indefinitely while state.bot_running is True.
-    Checks the auto-buy interval timer and triggers purchases.
+    Runs until the bot is stopped. The scheduler sleeps until each
+    auto-buy deadline instead of polling.
     Does NOT move the character - just idles and shops.
     """
     logger("🛒 Starting dedicated Shop Mode...", "info")
@@ -627,23 +1119,7 @@ def run_shop_only_loop(logger=print):
     if 'last_buy_time' not in state.stats:
         state.stats['last_buy_time'] = time.time() - (Config.AUTOBUY_INTERVAL - 5)
     
-    while state.bot_running:
-        current_time = time.time()
-        elapsed = current_time - state.stats.get('last_buy_time', current_time)
-        time_remaining = Config.AUTOBUY_INTERVAL - elapsed
-        
-        state.stats['next_buy_time'] = max(0, time_remaining)
-        
-        if time_remaining <= 0:
-            logger(f"⏰ Auto-buy timer reached ({Config.AUTOBUY_INTERVAL}s)", "warning")
-            if run_autobuy_routine(logger):
-                state.stats['last_buy_time'] = time.time()
-                state.stats['next_buy_time'] = Config.AUTOBUY_INTERVAL
-                logger("✓ Auto-buy complete. Waiting for next cycle...", "success")
-            else:
-                logger(f"⚠️ Auto-buy failed, will retry in {Config.AUTOBUY_INTERVAL}s", "warning")
-                state.stats['last_buy_time'] = time.time()
-        else:
-            time.sleep(1)
-    
-    logger("🛒 Shop Mode stopped.", "info")
+    try:
+        scheduler.run(logger, only=SHOP_MODE_TASKS)
+    finally:
+        logger("🛒 Shop Mode stopped.", "info")
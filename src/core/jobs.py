@@ -0,0 +1,348 @@
+"""
+Shared background job executor for the Magic Garden Bot.
+
+Background work (update checks and downloads, the module warm-up, the
+bot loop itself) runs as jobs instead of ad hoc threads:
+- Short jobs share one bounded pool of daemon threads, so exiting never
+  waits for an update check or a benchmark to finish
+- Long-lived jobs (the bot run, the vision worker listener) get a
+  dedicated daemon thread and never hold a pool slot
+- submit() returns a Job wrapping a future, with a cancel event and
+  timing (time queued, time running)
+- Completion callbacks are delivered on the Tk thread through one
+  coalesced channel: any number of posts between two Tk idle points
+  cost a single root.after() call
+- summary() shows what background work has cost so far
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+from functools import partial
+from concurrent.futures import Future
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+# Maximum number of jobs running at the same time
+MAX_WORKERS = 4
+
+
+# =============================================================================
+# THREADS
+# =============================================================================
+
+def _run_future(future, fn):
+    """Run fn() for a future unless it was cancelled before starting."""
+    if not future.set_running_or_notify_cancel():
+        return
+    try:
+        result = fn()
+    except BaseException as e:
+        future.set_exception(e)
+    else:
+        future.set_result(result)
+
+
+class _DaemonPool:
+    """
+    Bounded pool of daemon worker threads.
+    
+    Like ThreadPoolExecutor, but the workers are daemon threads that are
+    not joined at interpreter exit.
+    """
+    
+    def __init__(self, max_workers, name_prefix):
+        self.max_workers = max_workers
+        self.name_prefix = name_prefix
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._threads = []
+        self._idle = 0
+        self._shutdown = False
+    
+    def submit(self, fn):
+        """Queue fn() and return its Future."""
+        future = Future()
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot submit jobs after shutdown")
+            self._queue.put((future, fn))
+            if self._idle == 0 and len(self._threads) < self.max_workers:
+                thread = threading.Thread(
+                    target=self._work, daemon=True,
+                    name=f"{self.name_prefix}_{len(self._threads)}"
+                )
+                self._threads.append(thread)
+                thread.start()
+        return future
+    
+    def _work(self):
+        while True:
+            with self._lock:
+                self._idle += 1
+            item = self._queue.get()
+            with self._lock:
+                self._idle -= 1
+            if item is None:
+                return
+            _run_future(*item)
+    
+    def shutdown(self):
+        """Cancel queued work and let the workers exit (without waiting)."""
+        with self._lock:
+            self._shutdown = True
+            workers = len(self._threads)
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                item[0].cancel()
+        for _ in range(workers):
+            self._queue.put(None)
+
+
+# =============================================================================
+# JOBS
+# =============================================================================
+
+class Job:
+    """A submitted unit of background work."""
+    
+    def __init__(self, name, cancel_event=None, on_cancel=None):
+        """
+        Args:
+            name: Job name used in stats and logs
+            cancel_event: Optional event to set on cancel (created if None)
+            on_cancel: Optional function called on cancel, e.g. to stop a
+                loop that uses its own cancellation token
+        """
+        self.name = name
+        self.cancel_event = cancel_event or threading.Event()
+        self.on_cancel = on_cancel
+        self.future = None
+        self.submitted_at = time.perf_counter()
+        self.started_at = None
+        self.finished_at = None
+    
+    def cancel(self):
+        """Ask the job to stop; a job that has not started yet never runs."""
+        self.cancel_event.set()
+        if self.future is not None:
+            self.future.cancel()
+        if self.on_cancel is not None:
+            try:
+                self.on_cancel()
+            except Exception as e:
+                print(f"Job cancel error ({self.name}): {e}")
+    
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+    
+    def done(self):
+        """True once the job finished, failed or was cancelled before starting."""
+        return self.future is not None and self.future.done()
+    
+    def run_time(self):
+        """Seconds spent running so far (or in total once finished)."""
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+
+class JobExecutor:
+    """Bounded thread pool with job stats and a coalesced Tk channel."""
+    
+    def __init__(self, max_workers=MAX_WORKERS):
+        self._pool = _DaemonPool(max_workers, "job")
+        self._closed = False
+        self._lock = threading.Lock()
+        self._active = []
+        self.stats = {}  # {name: {'runs', 'errors', 'cancelled', 'total_time', 'max_time', 'max_wait'}}
+        
+        # Tk channel
+        self._root = None
+        self._tk_queue = deque()
+        self._tk_pending = False
+        self.tk_posts = 0
+        self.tk_dispatches = 0
+    
+    # =========================================================================
+    # SUBMITTING
+    # =========================================================================
+    
+    def submit(self, name, fn, *args, on_done=None, cancel_event=None, on_cancel=None,
+               dedicated=False, **kwargs):
+        """
+        Run fn(*args, **kwargs) on the pool.
+        
+        Args:
+            name: Job name used in stats
+            fn: Function to run
+            on_done: Optional callback(result, error) run on the Tk thread
+                (directly on the worker if no Tk root is attached)
+            cancel_event: Optional event shared with fn, set by Job.cancel()
+            on_cancel: Optional function called by Job.cancel()
+            dedicated: If True, run on a thread of its own instead of the
+                pool (for jobs that last as long as a bot run)
+        
+        Returns:
+            Job: The submitted job
+        """
+        job = Job(name, cancel_event=cancel_event, on_cancel=on_cancel)
+        with self._lock:
+            self._active.append(job)
+        run = partial(self._run, job, fn, args, kwargs, on_done)
+        if dedicated:
+            job.future = Future()
+            threading.Thread(
+                target=_run_future, args=(job.future, run), daemon=True, name=f"job-{name}"
+            ).start()
+        else:
+            job.future = self._pool.submit(run)
+        # Also covers jobs cancelled before they started
+        job.future.add_done_callback(lambda _: self._discard(job))
+        return job
+    
+    def _discard(self, job):
+        with self._lock:
+            if job in self._active:
+                self._active.remove(job)
+    
+    def _run(self, job, fn, args, kwargs, on_done):
+        """Pool entry point - time the job and deliver its result."""
+        job.started_at = time.perf_counter()
+        result, error = None, None
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            # BaseException so a Cancelled run still gets recorded
+            error = e
+        finally:
+            job.finished_at = time.perf_counter()
+            self._record(job, error)
+        
+        if on_done is not None:
+            self.call_in_tk(on_done, result, error)
+        if error is not None:
+            raise error  # Kept on the future
+        return result
+    
+    def _record(self, job, error):
+        """Update the per-name stats of a finished job."""
+        with self._lock:
+            entry = self.stats.setdefault(job.name, {
+                'runs': 0, 'errors': 0, 'cancelled': 0,
+                'total_time': 0.0, 'max_time': 0.0, 'max_wait': 0.0,
+            })
+            run_time = job.run_time()
+            entry['runs'] += 1
+            entry['total_time'] += run_time
+            entry['max_time'] = max(entry['max_time'], run_time)
+            entry['max_wait'] = max(entry['max_wait'], job.started_at - job.submitted_at)
+            if job.cancelled:
+                entry['cancelled'] += 1
+            elif error is not None:
+                entry['errors'] += 1
+    
+    def active_jobs(self):
+        """Jobs submitted but not finished yet."""
+        with self._lock:
+            return list(self._active)
+    
+    def cancel_all(self):
+        """Cancel every job that has not finished."""
+        for job in self.active_jobs():
+            job.cancel()
+    
+    def shutdown(self):
+        """
+        Cancel all jobs and stop accepting new ones (called on exit).
+        
+        Tk callbacks posted after this are dropped, since the window they
+        belong to is gone.
+        """
+        self._closed = True
+        self._root = None
+        self.cancel_all()
+        self._pool.shutdown()
+    
+    # =========================================================================
+    # TK CHANNEL
+    # =========================================================================
+    
+    def attach_tk(self, root):
+        """Deliver callbacks on this Tk root's thread from now on."""
+        self._root = root
+    
+    def call_in_tk(self, callback, *args):
+        """
+        Run callback(*args) on the Tk thread (any thread may call this).
+        
+        Calls are queued; only the first post after a drain schedules a
+        root.after(), so bursts cost one Tk dispatch. Without a Tk root the
+        callback runs directly; after shutdown() it is dropped.
+        """
+        if self._closed:
+            return
+        root = self._root
+        if root is None:
+            callback(*args)
+            return
+        
+        with self._lock:
+            self._tk_queue.append((callback, args))
+            self.tk_posts += 1
+            if self._tk_pending:
+                return
+            self._tk_pending = True
+        
+        try:
+            root.after(0, self._drain_tk)
+        except Exception:
+            # Window already destroyed - drop the queued callbacks
+            with self._lock:
+                self._tk_queue.clear()
+                self._tk_pending = False
+    
+    def _drain_tk(self):
+        """Run every queued callback (Tk thread)."""
+        with self._lock:
+            pending = list(self._tk_queue)
+            self._tk_queue.clear()
+            self._tk_pending = False
+            self.tk_dispatches += 1
+        
+        for callback, args in pending:
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"Tk callback error: {e}")
+    
+    # =========================================================================
+    # REPORTING
+    # =========================================================================
+    
+    def summary(self):
+        """One-line summary of job runs and time, plus Tk channel coalescing."""
+        with self._lock:
+            parts = []
+            for name, entry in self.stats.items():
+                text = f"{name} {entry['runs']}x {entry['total_time']:.1f}s"
+                if entry['errors']:
+                    text += f" ({entry['errors']} failed)"
+                if entry['cancelled']:
+                    text += f" ({entry['cancelled']} cancelled)"
+                parts.append(text)
+            parts.append(f"Tk {self.tk_posts} posts in {self.tk_dispatches} dispatches")
+        return ", ".join(parts)
+
+
+# Process-wide executor for all background work
+executor = JobExecutor()
@@ -0,0 +1,149 @@
+"""
+Visual position localization for the Magic Garden Bot.
+
+state.current_position is dead reckoning: a dropped keypress silently
+shifts every following plot. This module estimates the character's grid
+cell from the screen so drift can be corrected in place:
+- During a trusted pass (the first cycle after starting on tile 0,0) a
+  small fingerprint of the view around the player is stored per cell
+- Later, the current view is matched against all fingerprints with
+  normalized cross-correlation
+- Confirmed matches refresh the fingerprint so slow changes (crops
+  growing, lighting) are followed
+"""
+
+import numpy as np
+
+from . import automation
+
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+
+# =============================================================================
+# MATCHING PARAMETERS
+# =============================================================================
+
+# Fingerprint size in pixels (width, height)
+FINGERPRINT_SIZE = (48, 48)
+
+# Minimum correlation for a cell to be considered a match
+MIN_MATCH_SCORE = 0.6
+
+# How much better than the expected cell another cell must score
+# before dead reckoning is overruled
+CORRECTION_MARGIN = 0.1
+
+# Weight of a new view when refreshing a confirmed fingerprint
+REFRESH_WEIGHT = 0.3
+
+
+# =============================================================================
+# LOCALIZER
+# =============================================================================
+
+class GridLocalizer:
+    """Learns per-cell view fingerprints and locates the player by matching them."""
+    
+    def __init__(self):
+        self.fingerprints = {}  # {(row, col): normalized float32 array}
+        self.checks = 0
+        self.corrections = 0
+    
+    @property
+    def available(self):
+        """True if OpenCV is available for fingerprinting."""
+        return CV2_AVAILABLE
+    
+    def reset(self):
+        """Forget all learned fingerprints (e.g. after a grid change or reset)."""
+        self.fingerprints.clear()
+    
+    def knows(self, row, col):
+        """Return True if a fingerprint exists for the cell."""
+        return (row, col) in self.fingerprints
+    
+    def capture(self):
+        """
+        Capture a fingerprint of the current view.
+        
+        The player ROI is shrunk and converted to gradient magnitude, which
+        keys on tile edges and fences rather than absolute brightness, then
+        normalized to zero mean and unit length.
+        
+        Returns:
+            numpy.ndarray: 2D float32 fingerprint
+        """
+        frame = automation.capture_player_roi()
+        small = cv2.resize(frame, FINGERPRINT_SIZE, interpolation=cv2.INTER_AREA)
+        small = small.astype(np.float32)
+        gx = cv2.Sobel(small, cv2.CV_32F, 1, 0, ksize=3)
+        gy = cv2.Sobel(small, cv2.CV_32F, 0, 1, ksize=3)
+        fingerprint = cv2.magnitude(gx, gy)
+        fingerprint -= fingerprint.mean()
+        norm = float(np.linalg.norm(fingerprint))
+        if norm > 0:
+            fingerprint /= norm
+        return fingerprint
+    
+    def learn(self, row, col, fingerprint=None):
+        """
+        Store (or refresh) the fingerprint of a cell.
+        
+        Args:
+            row, col: Cell the player is known to be on
+            fingerprint: Optional pre-captured fingerprint
+        """
+        if fingerprint is None:
+            fingerprint = self.capture()
+        
+        known = self.fingerprints.get((row, col))
+        if known is not None:
+            fingerprint = (1 - REFRESH_WEIGHT) * known + REFRESH_WEIGHT * fingerprint
+            fingerprint -= fingerprint.mean()
+            norm = float(np.linalg.norm(fingerprint))
+            if norm > 0:
+                fingerprint /= norm
+        self.fingerprints[(row, col)] = fingerprint
+    
+    def locate(self, expected):
+        """
+        Estimate the player's cell.
+        
+        Args:
+            expected: (row, col) from dead reckoning
+        
+        Returns:
+            tuple: ((row, col) estimate, best score, expected cell score).
+                The estimate is the expected cell unless another cell matches
+                clearly better.
+        """
+        self.checks += 1
+        fingerprint = self.capture()
+        
+        scores = {
+            cell: float(np.dot(fingerprint.ravel(), known.ravel()))
+            for cell, known in self.fingerprints.items()
+        }
+        if not scores:
+            return expected, 0.0, 0.0
+        
+        best_cell = max(scores, key=scores.get)
+        best_score = scores[best_cell]
+        expected_score = scores.get(expected, -1.0)
+        
+        if (best_cell != expected and best_score >= MIN_MATCH_SCORE
+                and best_score - expected_score >= CORRECTION_MARGIN):
+            return best_cell, best_score, expected_score
+        
+        # Dead reckoning confirmed (or no better candidate) - follow slow changes
+        if expected_score >= MIN_MATCH_SCORE:
+            self.learn(*expected, fingerprint=fingerprint)
+        return expected, best_score, expected_score
+
+
+# Process-wide localizer shared by the game loops
+localizer = GridLocalizer()
@@ -0,0 +1,182 @@
+"""
+Progress reporting for background jobs.
+
+Workers may report progress far more often than a GUI can draw it (a
+download reports every chunk). Instead of posting a Tk callback per
+report, the worker only stores the latest value and the Tk thread polls
+it at a fixed frame rate:
+- ProgressTracker.update() is cheap and thread-safe; reports in between
+  two polls are coalesced into one
+- Rate and ETA are computed over a sliding time window
+- poll_progress() redraws only when the fraction moved by a minimum step
+  (or the rate/ETA text is due for a refresh), and always on completion
+"""
+
+import threading
+import time
+from collections import deque
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+# Time span the rate is averaged over (seconds)
+RATE_WINDOW = 5.0
+
+# Minimum spacing between rate samples (seconds)
+SAMPLE_INTERVAL = 0.1
+
+# Tk poll interval (milliseconds) - 10 frames per second
+POLL_INTERVAL_MS = 100
+
+# Minimum change of the fraction that triggers a redraw
+MIN_FRACTION_STEP = 0.005
+
+# Redraw at least this often while running so rate and ETA stay fresh (seconds)
+REFRESH_INTERVAL = 1.0
+
+
+# =============================================================================
+# TRACKER
+# =============================================================================
+
+class ProgressTracker:
+    """Latest-value progress state shared between a worker and the Tk thread."""
+    
+    def __init__(self, total=0):
+        """
+        Args:
+            total: Expected total units (0 if unknown)
+        """
+        self._lock = threading.Lock()
+        self._done = 0
+        self._total = total
+        self._samples = deque()  # [(monotonic time, done)]
+        self._finished = False
+        self._error = None
+        self.version = 0         # Incremented on every change
+        self.updates = 0         # Reports received, for comparing with redraws
+    
+    def update(self, done, total=None):
+        """
+        Report progress (any thread).
+        
+        Args:
+            done: Units completed so far
+            total: Optional new total
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._done = done
+            if total is not None:
+                self._total = total
+            if not self._samples or now - self._samples[-1][0] >= SAMPLE_INTERVAL:
+                self._samples.append((now, done))
+                while len(self._samples) > 2 and now - self._samples[0][0] > RATE_WINDOW:
+                    self._samples.popleft()
+            self.updates += 1
+            self.version += 1
+    
+    def finish(self, error=None):
+        """Mark the job as finished, optionally with an error message."""
+        with self._lock:
+            self._finished = True
+            self._error = error
+            self.version += 1
+    
+    def snapshot(self):
+        """
+        Return the current state.
+        
+        Returns:
+            dict: done, total, fraction (or None if the total is unknown),
+                rate (units per second), eta (seconds or None), finished,
+                error and version
+        """
+        with self._lock:
+            done, total = self._done, self._total
+            samples = list(self._samples)
+            finished, error, version = self._finished, self._error, self.version
+        
+        rate = 0.0
+        if len(samples) >= 2:
+            (t0, d0), (t1, d1) = samples[0], samples[-1]
+            if t1 > t0:
+                rate = max(0.0, (d1 - d0) / (t1 - t0))
+        
+        fraction = min(1.0, done / total) if total else None
+        eta = None
+        if total and rate > 0 and not finished:
+            eta = max(0.0, (total - done) / rate)
+        
+        return {
+            'done': done,
+            'total': total,
+            'fraction': fraction,
+            'rate': rate,
+            'eta': eta,
+            'finished': finished,
+            'error': error,
+            'version': version,
+        }
+
+
+# =============================================================================
+# TK POLLING
+# =============================================================================
+
+def poll_progress(widget, tracker, callback, interval_ms=POLL_INTERVAL_MS):
+    """
+    Poll a tracker from the Tk thread and redraw when worthwhile.
+    
+    The callback runs on the Tk thread with a snapshot (see
+    ProgressTracker.snapshot) when the fraction moved by MIN_FRACTION_STEP,
+    REFRESH_INTERVAL passed, or the job finished. Polling stops after the
+    final snapshot or when the widget is destroyed.
+    
+    Args:
+        widget: Any Tk widget, used for after()
+        tracker: ProgressTracker to poll
+        callback: Function(snapshot) that redraws the progress
+        interval_ms: Poll interval in milliseconds
+    """
+    last = {'version': -1, 'fraction': None, 'time': 0.0}
+    
+    def _poll():
+        snapshot = tracker.snapshot()
+        now = time.monotonic()
+        
+        if snapshot['version'] != last['version']:
+            moved = (
+                last['fraction'] is None or snapshot['fraction'] is None
+                or abs(snapshot['fraction'] - last['fraction']) >= MIN_FRACTION_STEP
+            )
+            if moved or snapshot['finished'] or now - last['time'] >= REFRESH_INTERVAL:
+                last.update(version=snapshot['version'], fraction=snapshot['fraction'], time=now)
+                try:
+                    callback(snapshot)
+                except Exception as e:
+                    print(f"Progress callback error: {e}")
+                    return
+        
+        if snapshot['finished']:
+            return
+        try:
+            widget.after(interval_ms, _poll)
+        except Exception:
+            pass  # Widget destroyed
+    
+    _poll()
+
+
+def format_eta(seconds):
+    """Format an ETA like '1:05' or '1:02:03'; '--:--' if unknown."""
+    if seconds is None:
+        return "--:--"
+    seconds = int(seconds + 0.5)
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes}:{secs:02d}"
@@ -0,0 +1,221 @@
+"""
+Priority task scheduler for the Magic Garden Bot.
+
+Harvesting, selling and auto-buy used to run in separate loops that each
+polled their own timers. This module runs them all from one place:
+- Timed tasks run once their deadline has passed (e.g. auto-buy), and
+  can be placed: deferred to a cheaper point within a lateness budget, or
+  run a little early to share a trip with another task
+- Condition tasks run when their predicate is true (e.g. inventory full)
+- An optional main task (harvesting) is stepped one unit at a time
+- Tasks only run at safe points: between main task steps, or where the
+  main task explicitly calls run_ready()
+- With no main task, the scheduler sleeps exactly until the next
+  deadline instead of polling
+"""
+
+import time
+
+
+# =============================================================================
+# TASKS
+# =============================================================================
+
+class Task:
+    """A schedulable unit of work."""
+    
+    def __init__(self, name, priority, action, due=None, condition=None,
+                 early=None, placement=None):
+        """
+        Args:
+            name: Task name used in logs and stats
+            priority: Lower runs first when several tasks are ready
+            action: Function(logger) doing the work
+            due: For timed tasks, function returning the time.time()
+                deadline, or None while the task is disabled
+            condition: For condition tasks, function returning True when
+                the task should run
+            early: For timed tasks, optional function returning how many
+                seconds before the deadline the task may already run
+            placement: For timed tasks, optional function(lateness) returning
+                True if now is an acceptable point to run; lateness is
+                negative while running early
+        """
+        self.name = name
+        self.priority = priority
+        self.action = action
+        self.due = due
+        self.condition = condition
+        self.early = early
+        self.placement = placement
+    
+    @property
+    def kind(self):
+        return 'timed' if self.due is not None else 'condition'
+    
+    def deadline(self):
+        """Deadline of a timed task, or None."""
+        return self.due() if self.due is not None else None
+    
+    def is_ready(self, now):
+        """Return True if the task should run now."""
+        if self.due is not None:
+            deadline = self.due()
+            if deadline is None:
+                return False
+            lateness = now - deadline
+            if lateness < -(self.early() if self.early else 0):
+                return False
+            return self.placement is None or self.placement(lateness)
+        return bool(self.condition())
+
+
+# =============================================================================
+# SCHEDULER
+# =============================================================================
+
+class TaskScheduler:
+    """Runs timed and condition tasks around an optional main task."""
+    
+    def __init__(self, token):
+        """
+        Args:
+            token: CancellationToken used for all idle waits
+        """
+        self.token = token
+        self.tasks = []
+        self.stats = {}
+        self.idle_time = 0.0
+    
+    def add_timed(self, name, priority, due, action, early=None, placement=None):
+        """Register a task that runs when due() has passed (see Task)."""
+        self._add(Task(name, priority, action, due=due, early=early, placement=placement))
+    
+    def add_condition(self, name, priority, condition, action):
+        """Register a task that runs when condition() is true."""
+        self._add(Task(name, priority, action, condition=condition))
+    
+    def _add(self, task):
+        self.tasks.append(task)
+        self.tasks.sort(key=lambda t: t.priority)
+    
+    # =========================================================================
+    # SAFE POINTS
+    # =========================================================================
+    
+    def run_ready(self, logger=print, kinds=('timed', 'condition'), only=None):
+        """
+        Run every ready task, highest priority first.
+        
+        After each task the remaining tasks are checked again, since one
+        task can make another ready (e.g. a sell triggers the journal
+        check). Each task runs at most once per call.
+        
+        Args:
+            logger: Logging function passed to the task actions
+            kinds: Task kinds to consider ('timed', 'condition')
+            only: Optional task names; other tasks are never checked
+        
+        Returns:
+            list: Names of the tasks that ran
+        """
+        ran = []
+        while True:
+            now = time.time()
+            task = next((
+                t for t in self._tasks(only)
+                if t.kind in kinds and t.name not in ran and t.is_ready(now)
+            ), None)
+            if task is None:
+                return ran
+            self._run_task(task, logger, now)
+            ran.append(task.name)
+    
+    def _run_task(self, task, logger, now):
+        """Run one task and record its timing."""
+        deadline = task.deadline()
+        start = time.perf_counter()
+        try:
+            task.action(logger)
+        finally:
+            entry = self.stats.setdefault(
+                task.name, {'runs': 0, 'total_time': 0.0, 'max_lateness': 0.0}
+            )
+            entry['runs'] += 1
+            entry['total_time'] += time.perf_counter() - start
+            if deadline is not None:
+                entry['max_lateness'] = max(entry['max_lateness'], now - deadline)
+    
+    def _tasks(self, only=None):
+        """Registered tasks, limited to the given names if any."""
+        if only is None:
+            return self.tasks
+        return [t for t in self.tasks if t.name in only]
+    
+    def next_deadline(self, only=None):
+        """Earliest deadline among the enabled timed tasks, or None."""
+        deadlines = [d for d in (t.deadline() for t in self._tasks(only)) if d is not None]
+        return min(deadlines, default=None)
+    
+    # =========================================================================
+    # MAIN LOOP
+    # =========================================================================
+    
+    def run(self, logger=print, step=None, until=None, only=None):
+        """
+        Run the scheduler until the main task finishes or a deadline passes.
+        
+        Args:
+            logger: Logging function
+            step: Optional main task, a function doing one unit of work and
+                returning False when there is nothing left to do
+            until: Optional time.time() at which to return
+            only: Optional task names to run; other tasks are ignored
+                (e.g. Shop Mode never sells)
+        
+        Raises:
+            Cancelled: When the run is stopped
+        """
+        while True:
+            self.token.wait_while_paused()
+            self.run_ready(logger, only=only)
+            
+            if until is not None and time.time() >= until:
+                return
+            
+            if step is not None:
+                if not step():
+                    return
+                continue
+            
+            # Nothing to do until the next deadline
+            deadline = self.next_deadline(only)
+            if until is not None:
+                deadline = until if deadline is None else min(deadline, until)
+            idle_start = time.perf_counter()
+            if deadline is None:
+                # No timed work left - just wait for STOP
+                self.token.wait(3600)
+            else:
+                self.token.wait_until(deadline)
+            self.idle_time += time.perf_counter() - idle_start
+    
+    # =========================================================================
+    # REPORTING
+    # =========================================================================
+    
+    def reset_stats(self):
+        """Clear the per-task statistics."""
+        self.stats.clear()
+        self.idle_time = 0.0
+    
+    def summary(self):
+        """One-line summary of task runs, run time, lateness and idle time."""
+        parts = []
+        for name, entry in self.stats.items():
+            text = f"{name} {entry['runs']}x {entry['total_time']:.1f}s"
+            if entry['max_lateness'] > 0:
+                text += f" (late {entry['max_lateness']:.1f}s)"
+            parts.append(text)
+        parts.append(f"idle {self.idle_time:.1f}s")
+        return ", ".join(parts)
@@ -0,0 +1,119 @@
+"""
+Proactive sell policy for the Magic Garden Bot.
+
+Selling used to happen only when the "inventory full" popup appeared,
+after harvest presses had already been wasted and usually in the middle
+of a row. This module predicts when the inventory will fill up instead:
+- Capacity is learned as the number of plots harvested between two sells
+  that were triggered by the popup (a running average)
+- At planned points (row ends) the fill ratio expected at the next
+  planned point is predicted; if it crosses SELL_FILL_THRESHOLD the bot
+  sells now
+- The popup check stays in place as a safety net, and every popup sell
+  also corrects the capacity estimate
+"""
+
+
+# =============================================================================
+# LEARNING PARAMETERS
+# =============================================================================
+
+# Weight of a new capacity sample in the running average
+CAPACITY_WEIGHT = 0.5
+
+# Growth of the capacity estimate after each planned sell, so an estimate
+# that is too low slowly probes upwards until the popup corrects it
+PROBE_GROWTH = 0.02
+
+# Samples smaller than this are ignored (e.g. a sell right after resuming)
+MIN_CAPACITY_SAMPLE = 2
+
+
+# =============================================================================
+# POLICY
+# =============================================================================
+
+class SellPolicy:
+    """Counts harvests between sells and decides when to sell ahead of time."""
+    
+    def __init__(self):
+        self.capacity = None       # Estimated plots per full inventory
+        self.harvests = 0          # Plots harvested since the last sell
+        self.counting = False      # True once the inventory is known to be empty
+        self.planned_sells = 0
+        self.reactive_sells = 0
+    
+    def reset(self):
+        """Forget the learned capacity (e.g. after a stats reset)."""
+        self.__init__()
+    
+    def start_run(self):
+        """
+        Start a new run.
+        
+        The inventory contents are unknown until the first sell, so no
+        capacity sample is taken before then. The estimate is kept.
+        """
+        self.harvests = 0
+        self.counting = False
+    
+    def record_harvest(self):
+        """Count one harvested plot."""
+        self.harvests += 1
+    
+    def record_sell(self, planned):
+        """
+        Record a sell and learn from it.
+        
+        Args:
+            planned: True for a proactive sell, False if the inventory full
+                popup triggered it
+        """
+        if planned:
+            self.planned_sells += 1
+            if self.capacity is not None:
+                self.capacity *= 1 + PROBE_GROWTH
+        else:
+            self.reactive_sells += 1
+            if self.counting and self.harvests >= MIN_CAPACITY_SAMPLE:
+                if self.capacity is None:
+                    self.capacity = float(self.harvests)
+                else:
+                    self.capacity += CAPACITY_WEIGHT * (self.harvests - self.capacity)
+        
+        self.harvests = 0
+        self.counting = True
+    
+    def fill_ratio(self):
+        """Estimated inventory fill (0..1+), or None while capacity is unknown."""
+        if self.capacity is None or not self.counting:
+            return None
+        return self.harvests / self.capacity
+    
+    def should_sell(self, plots_until_next_point, threshold):
+        """
+        Decide whether to sell at the current planned point.
+        
+        Args:
+            plots_until_next_point: Plots that will be harvested before the
+                next planned point
+            threshold: Fill ratio (0..1) that should not be crossed before
+                the next planned point
+        
+        Returns:
+            bool: True if the inventory is predicted to fill up before then
+        """
+        if self.capacity is None or not self.counting or self.harvests == 0:
+            return False
+        predicted = (self.harvests + plots_until_next_point) / self.capacity
+        return predicted >= threshold
+    
+    def summary(self):
+        """One-line summary for the cycle log."""
+        capacity = f"{self.capacity:.0f} plots" if self.capacity is not None else "learning"
+        return (f"capacity {capacity}, {self.planned_sells} planned / "
+                f"{self.reactive_sells} popup sell(s)")
+
+
+# Process-wide policy shared by the game loops
+sell_policy = SellPolicy()
@@ -0,0 +1,216 @@
+"""
+Startup profiling for the Magic Garden Bot.
+
+This module records how long startup takes so that time-to-first-paint
+can be tracked between releases:
+- Per-phase init times (config load, window creation, GUI build, ...)
+- Per-module import times (optional, via an __import__ hook)
+- Time-to-first-paint against a target
+- A JSON report written to the user's home directory
+"""
+
+import builtins
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# Time-to-first-paint budget in milliseconds
+FIRST_PAINT_TARGET_MS = 1500
+
+# Where the startup report is written
+REPORT_PATH = os.path.join(os.path.expanduser('~'), 'magic_garden_bot_startup.json')
+
+# Number of slowest imports kept in the report
+REPORT_TOP_IMPORTS = 25
+
+
+def import_timing_requested():
+    """Return True if per-module import timing was requested by flag or env."""
+    return ("--profile-startup" in sys.argv or
+            os.environ.get("MAGIC_GARDEN_PROFILE_STARTUP", "") not in ("", "0"))
+
+
+class StartupProfiler:
+    """Collects startup phase, import and milestone timings."""
+
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.phases = []    # [{'name', 'start_ms', 'ms'}]
+        self.imports = {}   # {module: {'total_ms', 'self_ms', 'thread'}}
+        self.marks = {}     # {name: ms since t0}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._original_import = None
+
+    def elapsed_ms(self):
+        """Milliseconds since the profiler was created."""
+        return (time.perf_counter() - self.t0) * 1000
+
+    # =========================================================================
+    # PHASES AND MARKS
+    # =========================================================================
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time a block of startup work.
+
+        Yields a record dict whose 'ms' entry is filled in when the block exits.
+        """
+        record = {'name': name, 'start_ms': self.elapsed_ms(), 'ms': None}
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['ms'] = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self.phases.append(record)
+
+    def mark(self, name):
+        """Record a milestone (e.g. 'first_paint') relative to startup."""
+        elapsed = self.elapsed_ms()
+        with self._lock:
+            self.marks.setdefault(name, elapsed)
+        return self.marks[name]
+
+    def watch_first_paint(self, root, callback=None):
+        """
+        Record the 'first_paint' mark once the root window is mapped and idle.
+
+        Args:
+            root: Tk root window
+            callback: Optional function called with the first paint time in ms
+        """
+        def _on_idle():
+            ms = self.mark("first_paint")
+            if callback:
+                callback(ms)
+
+        def _on_map(event=None):
+            if event is not None and event.widget is not root:
+                return
+            root.unbind("<Map>", bind_id)
+            root.after_idle(_on_idle)
+
+        bind_id = root.bind("<Map>", _on_map, add="+")
+
+    # =========================================================================
+    # IMPORT TIMING
+    # =========================================================================
+
+    def enable_import_timing(self):
+        """Install an __import__ hook that times first-time module imports."""
+        if self._original_import is not None:
+            return
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def disable_import_timing(self):
+        """Remove the __import__ hook."""
+        if self._original_import is None:
+            return
+        builtins.__import__ = self._original_import
+        self._original_import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        """__import__ replacement recording inclusive and self time per module."""
+        original = self._original_import
+        if original is None:
+            return builtins.__import__(name, globals, locals, fromlist, level)
+
+        modules_before = len(sys.modules)
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+
+        stack.append(0.0)  # accumulated child time
+        start = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            total = (time.perf_counter() - start) * 1000
+            child_total = stack.pop()
+            if stack:
+                stack[-1] += total
+
+            # Only first-time imports (new entries in sys.modules) are recorded
+            if len(sys.modules) > modules_before:
+                module = self._resolve_name(name, globals, level)
+                with self._lock:
+                    entry = self.imports.setdefault(
+                        module, {'total_ms': 0.0, 'self_ms': 0.0,
+                                 'thread': threading.current_thread().name}
+                    )
+                    entry['total_ms'] += total
+                    entry['self_ms'] += max(0.0, total - child_total)
+
+    @staticmethod
+    def _resolve_name(name, globals, level):
+        """Resolve a relative import name for reporting."""
+        if level == 0 or not globals:
+            return name
+        package = globals.get('__package__') or globals.get('__name__', '')
+        parts = package.rsplit('.', level - 1)
+        base = parts[0] if parts else package
+        return f"{base}.{name}" if name else base
+
+    # =========================================================================
+    # REPORTING
+    # =========================================================================
+
+    def build_report(self):
+        """Build a dictionary report of all recorded timings."""
+        with self._lock:
+            phases = [dict(p) for p in self.phases]
+            marks = dict(self.marks)
+            imports = sorted(
+                ({'module': m, **v} for m, v in self.imports.items()),
+                key=lambda entry: entry['self_ms'],
+                reverse=True
+            )
+
+        first_paint = marks.get("first_paint")
+        return {
+            'timestamp': time.time(),
+            'frozen': bool(getattr(sys, 'frozen', False)),
+            'first_paint_ms': first_paint,
+            'first_paint_target_ms': FIRST_PAINT_TARGET_MS,
+            'first_paint_ok': first_paint is not None and first_paint <= FIRST_PAINT_TARGET_MS,
+            'marks': marks,
+            'phases': phases,
+            'import_timing_enabled': self._original_import is not None or bool(imports),
+            'slowest_imports': imports[:REPORT_TOP_IMPORTS],
+        }
+
+    def summary(self):
+        """One-line human readable summary of the phases and first paint."""
+        with self._lock:
+            phases = ", ".join(f"{p['name']} {p['ms']:.0f}ms" for p in self.phases)
+            first_paint = self.marks.get("first_paint")
+        if first_paint is None:
+            return phases
+        status = "✓" if first_paint <= FIRST_PAINT_TARGET_MS else "✗"
+        return (f"first paint {first_paint:.0f}ms {status} "
+                f"(target {FIRST_PAINT_TARGET_MS}ms) - {phases}")
+
+    def write_report(self, path=REPORT_PATH):
+        """
+        Write the JSON startup report.
+
+        Returns:
+            str or None: Path written, or None on failure
+        """
+        try:
+            with open(path, 'w') as f:
+                json.dump(self.build_report(), f, indent=4)
+            return path
+        except Exception as e:
+            print(f"Could not write startup report: {e}")
+            return None
+
+
+# Process-wide profiler, created as early as possible (imported first by main.py)
+profiler = StartupProfiler()
@@ -1,5 +1,9 @@
 # Centralized bot state management
 
+import threading
+
+from .cancellation import CancellationToken
+
 # Statistics tracking dictionary
 stats = {
     'total_harvests': 0,
@@ -10,12 +14,78 @@ stats = {
     'errors': 0,
     'inventory_checks': 0,
     'cycles': 0,
+    'position_corrections': 0,
+    'merged_trips': 0,
+    'planned_sells': 0,
+    'stop_latency_ms': None,
     'cycle_times': []
 }
 
 # Real-time position tracking
 current_position = {'row': 0, 'col': 0}
 
+# Per-plot metrics for the mini map heatmap: {(row, col): {metric: value}}
+# Written by the bot thread and read by the GUI - use snapshot_plot_metrics()
+plot_metrics = {}
+plot_metrics_version = 0
+_plot_metrics_lock = threading.Lock()
+
 # Bot operational flags
 bot_running = False
 bot_paused = False
+
+# Interrupts waits in the bot thread on stop/pause (see cancellation.py)
+cancel_token = CancellationToken()
+
+# Callbacks notified when stats change (may be called from the bot thread)
+_stats_listeners = []
+
+
+def add_stats_listener(callback):
+    """Register a callback to be notified when stats change."""
+    if callback not in _stats_listeners:
+        _stats_listeners.append(callback)
+
+
+def remove_stats_listener(callback):
+    """Unregister a previously added stats listener."""
+    if callback in _stats_listeners:
+        _stats_listeners.remove(callback)
+
+
+def notify_stats_changed():
+    """Notify all listeners that stats or run state changed."""
+    for callback in list(_stats_listeners):
+        try:
+            callback()
+        except Exception as e:
+            print(f"Stats listener error: {e}")
+
+
+def record_plot_metric(row, col, metric, amount):
+    """Add an amount to a per-plot metric (e.g. 'time', 'presses', 'sells')."""
+    global plot_metrics_version
+    with _plot_metrics_lock:
+        metrics = plot_metrics.setdefault((row, col), {})
+        metrics[metric] = metrics.get(metric, 0) + amount
+        plot_metrics_version += 1
+
+
+def reset_plot_metrics():
+    """Clear all per-plot metrics."""
+    global plot_metrics_version
+    with _plot_metrics_lock:
+        plot_metrics.clear()
+        plot_metrics_version += 1
+
+
+def snapshot_plot_metrics():
+    """
+    Copy the per-plot metrics for another thread to read.
+    
+    Returns:
+        tuple: ({(row, col): {metric: value}}, version)
+    """
+    with _plot_metrics_lock:
+        copy = {key: dict(metrics) for key, metrics in plot_metrics.items()}
+        return copy, plot_metrics_version
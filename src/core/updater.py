@@ -6,16 +6,22 @@ Handles checking for updates from GitHub Releases and downloading new versions.
 
 import os
 import sys
+import json
+import time
 import subprocess
 import tempfile
 import threading
+import importlib.util
 from typing import Optional, Callable, Dict, Any
 
-try:
-    import requests
-    REQUESTS_AVAILABLE = True
-except ImportError:
-    REQUESTS_AVAILABLE = False
+from .config import atomic_write_json
+from .downloader import ResumableDownloader, DownloadCancelled, parse_sha256
+from .delta import apply_delta, patch_asset_name
+from .jobs import executor, Job
+
+# requests is imported inside the functions that use it so that importing
+# this module (e.g. for CURRENT_VERSION) does not slow down startup
+REQUESTS_AVAILABLE = importlib.util.find_spec("requests") is not None
 
 # =============================================================================
 # CONSTANTS
@@ -26,6 +32,16 @@ GITHUB_REPO = "CyberSphinxxx/Magic-Garden-Automation-Bot"
 GITHUB_API_URL = f"https://api.github.com/repos/{GITHUB_REPO}/releases/latest"
 GITHUB_RELEASES_URL = f"https://github.com/{GITHUB_REPO}/releases/latest"
 
+# Last release response, cached with its ETag/Last-Modified for conditional requests
+UPDATE_CACHE_PATH = os.path.join(os.path.expanduser('~'), 'magic_garden_bot_update_cache.json')
+
+# Startup checks within this time of the last check use the cache only (seconds)
+UPDATE_CHECK_TTL = 6 * 60 * 60
+
+# Backoff after failed checks without rate-limit headers (seconds)
+CHECK_BACKOFF_BASE = 60
+CHECK_BACKOFF_MAX = 6 * 60 * 60
+
 # =============================================================================
 # VERSION UTILITIES
 # =============================================================================
@@ -67,17 +83,126 @@ def compare_versions(current: str, latest: str) -> int:
 # UPDATE CHECK
 # =============================================================================
 
-def check_for_updates() -> Dict[str, Any]:
+def _load_cache(cache_path: str) -> Dict[str, Any]:
+    """Read the update check cache, or return an empty one."""
+    try:
+        with open(cache_path, 'r') as f:
+            cache = json.load(f)
+        if isinstance(cache, dict):
+            return cache
+    except (OSError, ValueError):
+        pass
+    return {}
+
+
+def _save_cache(cache_path: str, cache: Dict[str, Any]):
+    """Write the update check cache (failures are only logged)."""
+    try:
+        atomic_write_json(cache_path, cache)
+    except Exception as e:
+        print(f"Could not save update cache: {e}")
+
+
+def _compact_release(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only the release fields the updater uses (the API response is large)."""
+    return {
+        'tag_name': data.get('tag_name', ''),
+        'body': data.get('body', ''),
+        'html_url': data.get('html_url', GITHUB_RELEASES_URL),
+        'assets': [
+            {
+                'name': asset.get('name', ''),
+                'browser_download_url': asset.get('browser_download_url'),
+                'digest': asset.get('digest'),
+            }
+            for asset in data.get('assets', [])
+        ],
+    }
+
+
+def _apply_release(result: Dict[str, Any], data: Dict[str, Any]):
+    """Fill an update check result from (compacted) release data."""
+    latest_version = data.get('tag_name', '')
+    result['latest_version'] = latest_version
+    result['release_notes'] = data.get('body', '')
+    result['release_url'] = data.get('html_url', GITHUB_RELEASES_URL)
+    
+    # Find the .exe asset, its checksum and a patch from this version
+    patch_name = patch_asset_name(CURRENT_VERSION, latest_version)
+    assets = data.get('assets', [])
+    for asset in assets:
+        name = asset.get('name', '')
+        if name.endswith('.exe') and not result['download_url']:
+            result['download_url'] = asset.get('browser_download_url')
+            result['sha256'] = parse_sha256(asset.get('digest'))
+        elif name.endswith('.exe.sha256'):
+            result['sha256_url'] = asset.get('browser_download_url')
+        elif name == patch_name:
+            result['patch_url'] = asset.get('browser_download_url')
+            result['patch_sha256'] = parse_sha256(asset.get('digest'))
+    
+    # Check if update is available
+    if compare_versions(CURRENT_VERSION, latest_version) > 0:
+        result['available'] = True
+
+
+def _backoff_until(response, failures: int, now: float) -> float:
+    """
+    Work out when the API may be asked again after a failed request.
+    
+    Retry-After and an exhausted X-RateLimit-Remaining/X-RateLimit-Reset
+    pair are honoured; other failures back off exponentially.
+    
+    Args:
+        response: The failed response, or None for network errors
+        failures: Number of consecutive failures including this one
+        now: Current time.time()
+    """
+    if response is not None:
+        headers = response.headers
+        retry_after = headers.get('Retry-After', '')
+        if retry_after.isdigit():
+            return now + int(retry_after)
+        reset = headers.get('X-RateLimit-Reset', '')
+        if headers.get('X-RateLimit-Remaining') == '0' and reset.isdigit():
+            return max(now, float(reset))
+    return now + min(CHECK_BACKOFF_MAX, CHECK_BACKOFF_BASE * 2 ** (failures - 1))
+
+
+def check_for_updates(
+    force: bool = False,
+    api_url: str = GITHUB_API_URL,
+    cache_path: str = UPDATE_CACHE_PATH
+) -> Dict[str, Any]:
     """
     Check GitHub Releases API for the latest version.
     
+    The last release response is cached on disk with its ETag and
+    Last-Modified headers:
+    - Within UPDATE_CHECK_TTL of the last check the cache is used without
+      any network call (unless force is set)
+    - Otherwise the cache is revalidated with a conditional request; a 304
+      reuses the cached release
+    - After rate limiting or errors, requests are skipped until the
+      backoff time has passed and the cached release (if any) is used
+    
+    Args:
+        force: Revalidate even if the cache is still fresh (manual checks)
+        api_url: Releases API endpoint (a local mock server in tests)
+        cache_path: Cache file location
+    
     Returns a dictionary with:
         - 'available': bool - True if update available
         - 'current_version': str - Current app version
         - 'latest_version': str - Latest release version (or None)
         - 'download_url': str - URL to download the exe (or None)
+        - 'sha256': str - Digest GitHub publishes for the exe (or None)
+        - 'sha256_url': str - URL of a published .sha256 file (or None)
+        - 'patch_url': str - URL of a delta patch from this version (or None)
+        - 'patch_sha256': str - Digest GitHub publishes for the patch (or None)
         - 'release_notes': str - Release body/notes (or None)
         - 'release_url': str - URL to the release page
+        - 'cached': bool - True if the result came from the cache
         - 'error': str - Error message if check failed (or None)
     """
     result = {
@@ -85,40 +210,77 @@ def check_for_updates() -> Dict[str, Any]:
         'current_version': CURRENT_VERSION,
         'latest_version': None,
         'download_url': None,
+        'sha256': None,
+        'sha256_url': None,
+        'patch_url': None,
+        'patch_sha256': None,
         'release_notes': None,
         'release_url': GITHUB_RELEASES_URL,
+        'cached': False,
         'error': None
     }
     
+    now = time.time()
+    cache = _load_cache(cache_path)
+    if cache.get('url') != api_url:
+        cache = {'url': api_url}
+    cached_release = cache.get('release')
+    
+    def use_cache():
+        _apply_release(result, cached_release)
+        result['cached'] = True
+        return result
+    
+    # Fresh enough - no network call at all
+    if cached_release and not force and now - cache.get('checked_at', 0) < UPDATE_CHECK_TTL:
+        return use_cache()
+    
+    # Still backing off after rate limiting or errors
+    backoff_until = cache.get('backoff_until', 0)
+    if now < backoff_until:
+        if cached_release:
+            return use_cache()
+        retry_at = time.strftime('%H:%M', time.localtime(backoff_until))
+        result['error'] = f"API rate limit exceeded - try again after {retry_at}"
+        return result
+    
     if not REQUESTS_AVAILABLE:
         result['error'] = "requests library not available"
         return result
     
+    import requests
+    
+    headers = {'Accept': 'application/vnd.github.v3+json'}
+    if cached_release:
+        if cache.get('etag'):
+            headers['If-None-Match'] = cache['etag']
+        if cache.get('last_modified'):
+            headers['If-Modified-Since'] = cache['last_modified']
+    
+    response = None
     try:
-        response = requests.get(
-            GITHUB_API_URL,
-            timeout=10,
-            headers={'Accept': 'application/vnd.github.v3+json'}
-        )
-        response.raise_for_status()
-        
-        data = response.json()
+        response = requests.get(api_url, timeout=10, headers=headers)
         
-        latest_version = data.get('tag_name', '')
-        result['latest_version'] = latest_version
-        result['release_notes'] = data.get('body', '')
-        result['release_url'] = data.get('html_url', GITHUB_RELEASES_URL)
+        if response.status_code == 304 and cached_release:
+            # Unchanged - conditional requests do not count against the limit
+            cache.update(checked_at=now, failures=0, backoff_until=0)
+            _save_cache(cache_path, cache)
+            return use_cache()
         
-        # Find the .exe asset
-        assets = data.get('assets', [])
-        for asset in assets:
-            if asset.get('name', '').endswith('.exe'):
-                result['download_url'] = asset.get('browser_download_url')
-                break
+        response.raise_for_status()
         
-        # Check if update is available
-        if compare_versions(CURRENT_VERSION, latest_version) > 0:
-            result['available'] = True
+        release = _compact_release(response.json())
+        cache.update(
+            release=release,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified'),
+            checked_at=now,
+            failures=0,
+            backoff_until=0,
+        )
+        _save_cache(cache_path, cache)
+        _apply_release(result, release)
+        return result
         
     except requests.exceptions.Timeout:
         result['error'] = "Connection timed out"
@@ -127,81 +289,191 @@ def check_for_updates() -> Dict[str, Any]:
     except requests.exceptions.HTTPError as e:
         if e.response.status_code == 404:
             result['error'] = "No releases found"
-        elif e.response.status_code == 403:
+        elif e.response.status_code in (403, 429):
             result['error'] = "API rate limit exceeded"
         else:
             result['error'] = f"HTTP error: {e.response.status_code}"
     except Exception as e:
         result['error'] = f"Check failed: {str(e)}"
     
+    # Failed - back off before asking again
+    failures = cache.get('failures', 0) + 1
+    cache.update(failures=failures, backoff_until=_backoff_until(response, failures, now))
+    _save_cache(cache_path, cache)
+    if result['error'] == "API rate limit exceeded":
+        retry_at = time.strftime('%H:%M', time.localtime(cache['backoff_until']))
+        result['error'] += f" - try again after {retry_at}"
+    
+    # A stale release is better than none for a silent startup check
+    if cached_release and not force:
+        result['error'] = None
+        return use_cache()
     return result
 
 
-def check_for_updates_async(callback: Callable[[Dict[str, Any]], None]) -> threading.Thread:
+def check_for_updates_async(
+    callback: Callable[[Dict[str, Any]], None],
+    force: bool = False
+) -> Job:
     """
-    Check for updates in a background thread.
-    Calls the callback with the result when done.
+    Check for updates as a background job.
+    Calls the callback with the result when done (on the Tk thread once
+    the GUI has attached to the job executor).
     
     Args:
         callback: Function to call with the update check result
+        force: Revalidate even if the cached result is still fresh
         
     Returns:
-        The started thread (for optional joining)
+        The submitted job
     """
-    def _check():
-        result = check_for_updates()
+    def _done(result, error):
+        if error is not None:
+            result = {'available': False, 'current_version': CURRENT_VERSION,
+                      'error': f"Check failed: {error}"}
         callback(result)
     
-    thread = threading.Thread(target=_check, daemon=True)
-    thread.start()
-    return thread
+    return executor.submit("update check", check_for_updates, force=force, on_done=_done)
 
 
 # =============================================================================
 # DOWNLOAD UPDATE
 # =============================================================================
 
+def fetch_published_sha256(url: str) -> Optional[str]:
+    """
+    Download a published .sha256 file and return the digest in it.
+    
+    Returns:
+        The hex digest, or None if it could not be fetched
+    """
+    if not REQUESTS_AVAILABLE:
+        return None
+    
+    import requests
+    
+    try:
+        response = requests.get(url, timeout=10)
+        response.raise_for_status()
+        return parse_sha256(response.text)
+    except Exception as e:
+        print(f"Could not fetch checksum: {e}")
+        return None
+
+
+def _download_delta(
+    patch_url: str,
+    target_path: str,
+    sha256: Optional[str],
+    patch_sha256: Optional[str],
+    progress_callback: Optional[Callable[[int, int], None]],
+    cancel_event: Optional[threading.Event]
+) -> Optional[str]:
+    """
+    Download a delta patch and rebuild the new exe from the running one.
+    
+    apply_delta() checks the running exe and the rebuilt one against the
+    hashes in the patch (and the rebuilt one against sha256, if known).
+    
+    Returns:
+        Path to the rebuilt exe, or None if the full download is needed
+    """
+    patch_path = os.path.join(tempfile.gettempdir(), 'MagicGardenBot_update.patch')
+    downloader = ResumableDownloader(
+        patch_url, patch_path,
+        sha256=patch_sha256,
+        progress_callback=progress_callback,
+        cancel_event=cancel_event
+    )
+    
+    try:
+        downloader.run()
+    except DownloadCancelled:
+        return None
+    except Exception as e:
+        print(f"Patch download failed: {e}")
+        return None
+    
+    try:
+        apply_delta(get_current_exe_path(), patch_path, target_path, expected_sha256=sha256)
+        print(f"Delta update applied ({downloader.size / (1024 * 1024):.1f} MB downloaded)")
+        return target_path
+    except Exception as e:
+        print(f"Delta update failed: {e}")
+        return None
+    finally:
+        try:
+            os.remove(patch_path)
+        except OSError:
+            pass
+
+
 def download_update(
     url: str,
-    progress_callback: Optional[Callable[[int, int], None]] = None
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    sha256: Optional[str] = None,
+    sha256_url: Optional[str] = None,
+    cancel_event: Optional[threading.Event] = None,
+    patch_url: Optional[str] = None,
+    patch_sha256: Optional[str] = None
 ) -> Optional[str]:
     """
     Download the update file to a temporary location.
     
+    If the release has a delta patch from this version, only the patch is
+    downloaded and the new exe is rebuilt locally; if that fails the full
+    exe is downloaded. Downloads are segmented and resumable (see
+    downloader.py): a failed or cancelled download continues from the
+    partial file next time.
+    
     Args:
         url: Download URL for the new exe
         progress_callback: Optional callback(downloaded_bytes, total_bytes)
+        sha256: Expected SHA-256 of the exe, if known
+        sha256_url: URL of a published .sha256 file, used if sha256 is None
+        cancel_event: Optional event that cancels the download when set
+        patch_url: Optional URL of a delta patch from CURRENT_VERSION
+        patch_sha256: Expected SHA-256 of the patch, if known
         
     Returns:
-        Path to the downloaded file, or None on failure
+        Path to the downloaded (and verified) file, or None on failure
     """
     if not REQUESTS_AVAILABLE:
         return None
     
+    if not sha256 and sha256_url:
+        sha256 = fetch_published_sha256(sha256_url)
+    if not sha256:
+        print("No published checksum - the download will not be verified")
+    
+    temp_path = os.path.join(tempfile.gettempdir(), 'MagicGardenBot_update.exe')
+    
+    # Patches only apply to the released exe, not to a development checkout
+    if patch_url and getattr(sys, 'frozen', False):
+        path = _download_delta(
+            patch_url, temp_path, sha256, patch_sha256, progress_callback, cancel_event
+        )
+        if path:
+            return path
+        if cancel_event and cancel_event.is_set():
+            return None
+        print("Falling back to the full download")
+    
+    downloader = ResumableDownloader(
+        url, temp_path,
+        sha256=sha256,
+        progress_callback=progress_callback,
+        cancel_event=cancel_event
+    )
+    
     try:
-        response = requests.get(url, stream=True, timeout=60)
-        response.raise_for_status()
-        
-        # Get total file size
-        total_size = int(response.headers.get('content-length', 0))
-        
-        # Create temp file with .exe extension
-        temp_dir = tempfile.gettempdir()
-        temp_path = os.path.join(temp_dir, 'MagicGardenBot_update.exe')
-        
-        downloaded = 0
-        chunk_size = 8192
-        
-        with open(temp_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=chunk_size):
-                if chunk:
-                    f.write(chunk)
-                    downloaded += len(chunk)
-                    if progress_callback:
-                        progress_callback(downloaded, total_size)
-        
-        return temp_path
-        
+        path = downloader.run()
+        if downloader.resumed_bytes:
+            print(f"Resumed download ({downloader.resumed_bytes / (1024 * 1024):.1f} MB reused)")
+        return path
+    except DownloadCancelled:
+        print("Download cancelled - it will resume next time")
+        return None
     except Exception as e:
         print(f"Download failed: {e}")
         return None
@@ -210,27 +482,33 @@ def download_update(
 def download_update_async(
     url: str,
     progress_callback: Optional[Callable[[int, int], None]] = None,
-    completion_callback: Optional[Callable[[Optional[str]], None]] = None
-) -> threading.Thread:
+    completion_callback: Optional[Callable[[Optional[str]], None]] = None,
+    **options
+) -> Job:
     """
-    Download update in a background thread.
+    Download update as a background job.
     
     Args:
         url: Download URL
         progress_callback: Called with (downloaded, total) during download
-        completion_callback: Called with the file path (or None) when done
-        
+        completion_callback: Called with the file path (or None) when done,
+            on the Tk thread once the GUI has attached to the job executor
+        **options: sha256, sha256_url, cancel_event, patch_url and
+            patch_sha256 (see download_update)
+    
     Returns:
-        The started thread
+        The submitted job (Job.cancel() stops the download)
     """
-    def _download():
-        result = download_update(url, progress_callback)
+    def _done(result, error):
         if completion_callback:
-            completion_callback(result)
+            completion_callback(result if error is None else None)
     
-    thread = threading.Thread(target=_download, daemon=True)
-    thread.start()
-    return thread
+    # The job's cancel event is the one the downloader watches
+    cancel_event = options.setdefault('cancel_event', threading.Event())
+    return executor.submit(
+        "update download", lambda: download_update(url, progress_callback, **options),
+        on_done=_done, cancel_event=cancel_event
+    )
 
 
 # =============================================================================
@@ -0,0 +1,542 @@
+"""
+Template registry, warm-up and OpenCV thread tuning for the Magic Garden Bot.
+
+The first matchTemplate/cvtColor calls of a session are much slower than
+later ones (lazy library initialisation, first allocations), and OpenCV
+picks its own thread count, which competes with the Tk and input threads.
+This module takes that cost off the first cycle:
+- Templates are loaded once into a registry (image plus binary version)
+  instead of being read from disk on every check
+- warm_up() runs every registered template once against a dummy frame in
+  a background job after the GUI appears
+- cv2.setNumThreads and the number of templates matched in parallel come
+  from OPENCV_THREADS / MATCH_PARALLELISM, or (0 = auto) from a small
+  benchmark run during the warm-up
+- The gray, binary and match result images are written into reused
+  per-thread buffers (OpenCV dst/result parameters) instead of being
+  allocated for every check; allocations per detection are counted
+- The thread benchmark is skipped once a bot run has started, since
+  cv2.setNumThreads would change the thread count under live checks
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .config import Config
+
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+# Gray level used to binarise screenshots and templates
+BINARY_THRESHOLD = 200
+
+# Dummy frame size used when the screen size is unknown (width, height)
+DEFAULT_FRAME_SIZE = (1920, 1080)
+
+# Cores left free for the Tk and input threads when choosing thread counts
+RESERVED_CORES = 1
+
+# Templates and rounds used per benchmark candidate (fastest round counts)
+BENCHMARK_TEMPLATES = 4
+BENCHMARK_ROUNDS = 2
+
+
+# =============================================================================
+# TEMPLATE REGISTRY
+# =============================================================================
+
+class Template:
+    """A loaded template image."""
+    
+    __slots__ = ('name', 'path', 'image', 'binary')
+    
+    def __init__(self, path, image, binary):
+        self.name = os.path.splitext(os.path.basename(path))[0]
+        self.path = path
+        self.image = image    # Grayscale or BGR image as loaded
+        self.binary = binary  # Thresholded image (grayscale templates only)
+    
+    @property
+    def shape(self):
+        """(height, width) of the template."""
+        return self.image.shape[:2]
+
+
+class TemplateRegistry:
+    """Loads each template once and keeps it for the session."""
+    
+    def __init__(self):
+        self._entries = {}  # {(path, grayscale): Template or None}
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.hits = 0
+    
+    def get(self, path, grayscale=True):
+        """
+        Return the cached template, loading it on first use.
+        
+        Args:
+            path: Path to the template image
+            grayscale: If True, load as grayscale
+        
+        Returns:
+            Template or None: None if OpenCV is missing or the file could
+                not be read (failures are cached too)
+        """
+        if not CV2_AVAILABLE:
+            return None
+        
+        key = (os.path.normpath(os.path.abspath(path)), grayscale)
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                return self._entries[key]
+        
+        mode = cv2.IMREAD_GRAYSCALE if grayscale else cv2.IMREAD_COLOR
+        image = cv2.imread(key[0], mode)
+        entry = None
+        if image is not None:
+            binary = None
+            if grayscale:
+                _, binary = cv2.threshold(image, BINARY_THRESHOLD, 255, cv2.THRESH_BINARY)
+            entry = Template(key[0], image, binary)
+        
+        with self._lock:
+            self._entries[key] = entry
+            self.loads += 1
+        return entry
+    
+    def register_folder(self, folder):
+        """
+        Load every .png in a folder as a grayscale template.
+        
+        Returns:
+            int: Number of templates loaded
+        """
+        try:
+            names = sorted(name for name in os.listdir(folder) if name.lower().endswith('.png'))
+        except OSError as e:
+            print(f"Could not list templates in {folder}: {e}")
+            return 0
+        return sum(1 for name in names if self.get(os.path.join(folder, name)) is not None)
+    
+    def templates(self):
+        """All successfully loaded grayscale templates."""
+        with self._lock:
+            return [entry for (_, grayscale), entry in self._entries.items()
+                    if grayscale and entry is not None]
+    
+    def clear(self):
+        """Forget all loaded templates (e.g. after the image folder changed)."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Process-wide template registry
+templates = TemplateRegistry()
+
+
+# =============================================================================
+# BUFFERS
+# =============================================================================
+
+class BufferPool:
+    """
+    Reusable per-thread scratch buffers for the detection pipeline.
+    
+    Each named buffer is backed by a flat array that only grows, so the
+    gray, binary and result images of any resolution are views into
+    memory allocated once per thread (the largest size seen so far). The
+    views are overwritten by the next detection on the same thread.
+    """
+    
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.reset_stats()
+    
+    def get(self, name, shape, dtype=np.uint8):
+        """
+        Return a C-contiguous array of the given shape backed by a reused buffer.
+        
+        Args:
+            name: Buffer name (one backing array per name, dtype and thread)
+            shape: Shape of the returned view
+            dtype: NumPy dtype
+        """
+        backing = self._local.__dict__.setdefault('backing', {})
+        dtype = np.dtype(dtype)
+        size = int(np.prod(shape))
+        buffer = backing.get((name, dtype))
+        if buffer is None or buffer.size < size:
+            buffer = np.empty(size, dtype=dtype)
+            backing[(name, dtype)] = buffer
+            self._count_allocation(buffer.nbytes)
+        return buffer[:size].reshape(shape)
+    
+    def check(self, returned, buffer):
+        """Count an allocation if OpenCV did not write into the given buffer."""
+        if returned is not buffer and not np.shares_memory(returned, buffer):
+            self._count_allocation(returned.nbytes)
+        return returned
+    
+    def _count_allocation(self, nbytes):
+        with self._lock:
+            self.allocations += 1
+            self.allocated_bytes += nbytes
+    
+    def count_detection(self, frame=None):
+        """
+        Count one detection (a screenshot and its matches).
+        
+        Args:
+            frame: The captured frame, whose size is reported separately
+                because it is allocated by the capture itself
+        """
+        with self._lock:
+            self.detections += 1
+            if frame is not None:
+                self.capture_bytes += frame.nbytes
+    
+    def reset_stats(self):
+        """Clear the counters (buffers are kept)."""
+        with self._lock:
+            self.allocations = 0
+            self.allocated_bytes = 0
+            self.detections = 0
+            self.capture_bytes = 0
+    
+    def stats(self):
+        """
+        Allocation counters.
+        
+        Returns:
+            dict: detections, allocations, allocated_bytes, and per detection
+                allocations, bytes and capture bytes
+        """
+        with self._lock:
+            detections = max(1, self.detections)
+            return {
+                'detections': self.detections,
+                'allocations': self.allocations,
+                'allocated_bytes': self.allocated_bytes,
+                'allocations_per_detection': self.allocations / detections,
+                'bytes_per_detection': self.allocated_bytes / detections,
+                'capture_bytes_per_detection': self.capture_bytes / detections,
+            }
+    
+    def summary(self):
+        """One-line summary for the cycle log."""
+        stats = self.stats()
+        return (f"{stats['allocations_per_detection']:.2f} buffer allocs / "
+                f"{stats['bytes_per_detection'] / 1024:.0f} KB per detection, "
+                f"capture {stats['capture_bytes_per_detection'] / (1024 * 1024):.1f} MB "
+                f"({stats['detections']} detections)")
+
+
+# Process-wide buffer pool (buffers themselves are per thread)
+buffers = BufferPool()
+
+
+def to_gray(frame_rgb):
+    """Convert an RGB frame to grayscale into the thread's 'gray' buffer."""
+    dst = buffers.get('gray', frame_rgb.shape[:2])
+    return buffers.check(cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2GRAY, dst=dst), dst)
+
+
+def to_binary(gray):
+    """Threshold a grayscale image into the thread's 'binary' buffer."""
+    dst = buffers.get('binary', gray.shape)
+    _, binary = cv2.threshold(gray, BINARY_THRESHOLD, 255, cv2.THRESH_BINARY, dst=dst)
+    return buffers.check(binary, dst)
+
+
+def to_bgr(frame_rgb):
+    """Convert an RGB frame to BGR into the thread's 'bgr' buffer."""
+    dst = buffers.get('bgr', frame_rgb.shape)
+    return buffers.check(cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2BGR, dst=dst), dst)
+
+
+# =============================================================================
+# MATCHING
+# =============================================================================
+
+# Active thread settings and the last benchmark result
+_settings = {'threads': None, 'parallelism': 1, 'source': 'default'}
+_benchmark = None
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _match_one(image, template):
+    """Return (max_loc, max_val) of one template in a preprocessed image."""
+    height, width = image.shape[:2]
+    t_height, t_width = template.shape[:2]
+    dst = buffers.get('result', (height - t_height + 1, width - t_width + 1), np.float32)
+    result = buffers.check(cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED, result=dst), dst)
+    _, max_val, _, max_loc = cv2.minMaxLoc(result)
+    return max_loc, max_val
+
+
+def match(image, template):
+    """
+    Match one template against a preprocessed image (result buffer reused).
+    
+    Returns:
+        tuple: (max_loc, max_val)
+    """
+    return _match_one(image, template)
+
+
+def _get_pool(workers):
+    """Return the matching pool, recreated when the parallelism changed."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="match")
+            _pool_workers = workers
+        return _pool
+
+
+def match_many(image, template_images, parallelism=None):
+    """
+    Match several templates against one preprocessed image.
+    
+    OpenCV releases the GIL while matching, so with parallelism > 1 the
+    templates are matched on a small dedicated pool. It is separate from
+    the job executor because these are sub-millisecond to few-millisecond
+    calls made from inside the bot job.
+    
+    Args:
+        image: Preprocessed screenshot (same type as the templates)
+        template_images: List of template arrays
+        parallelism: Templates matched at once (default: current setting)
+    
+    Returns:
+        list: (max_loc, max_val) per template, in order
+    """
+    workers = parallelism or _settings['parallelism']
+    if workers <= 1 or len(template_images) < 2:
+        return [_match_one(image, template) for template in template_images]
+    pool = _get_pool(workers)
+    return list(pool.map(lambda template: _match_one(image, template), template_images))
+
+
+# =============================================================================
+# THREAD SETTINGS
+# =============================================================================
+
+def _usable_cores():
+    """Cores available to vision work after leaving some to Tk and input."""
+    return max(1, (os.cpu_count() or 1) - RESERVED_CORES)
+
+
+def _candidates():
+    """(threads, parallelism) pairs to benchmark, within the usable cores."""
+    cores = _usable_cores()
+    thread_counts = sorted({1, 2, 4, cores} & set(range(1, cores + 1)))
+    pairs = []
+    for parallelism in (1, 2, 4):
+        for threads in thread_counts:
+            if threads * parallelism <= cores:
+                pairs.append((threads, parallelism))
+    return pairs
+
+
+def run_benchmark(frame_binary, template_images, abort=None):
+    """
+    Time matching a few templates with each thread configuration.
+    
+    cv2.setNumThreads is process-wide, so the benchmark must not run while
+    the bot matches: abort is checked before every candidate, and the
+    original thread count is restored when it stops early.
+    
+    Args:
+        frame_binary: Preprocessed dummy frame
+        template_images: Binary templates to match
+        abort: Optional function returning True to stop the benchmark
+    
+    Returns:
+        dict or None: threads, parallelism, ms (fastest round) and results
+            {(threads, parallelism): ms}, or None if aborted
+    """
+    sample = template_images[:BENCHMARK_TEMPLATES]
+    original_threads = cv2.getNumThreads()
+    results = {}
+    for threads, parallelism in _candidates():
+        if abort is not None and abort():
+            cv2.setNumThreads(original_threads)
+            return None
+        cv2.setNumThreads(threads)
+        best = None
+        for _ in range(BENCHMARK_ROUNDS):
+            start = time.perf_counter()
+            match_many(frame_binary, sample, parallelism=parallelism)
+            elapsed = (time.perf_counter() - start) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        results[(threads, parallelism)] = best
+    
+    threads, parallelism = min(results, key=results.get)
+    return {'threads': threads, 'parallelism': parallelism,
+            'ms': results[(threads, parallelism)], 'results': results}
+
+
+def apply_settings():
+    """
+    Apply OPENCV_THREADS and MATCH_PARALLELISM.
+    
+    A value of 0 uses the benchmark result; before the benchmark ran,
+    OpenCV keeps its own thread count and matching is sequential.
+    
+    Returns:
+        dict: threads, parallelism and source ('config', 'benchmark' or 'default')
+    """
+    if not CV2_AVAILABLE:
+        return dict(_settings)
+    
+    threads = max(0, int(Config.OPENCV_THREADS))
+    parallelism = max(0, int(Config.MATCH_PARALLELISM))
+    if threads and parallelism:
+        source = 'config'
+    elif _benchmark is not None:
+        threads = threads or _benchmark['threads']
+        parallelism = parallelism or _benchmark['parallelism']
+        source = 'benchmark'
+    else:
+        source = 'config' if threads or parallelism else 'default'
+    
+    if threads:
+        cv2.setNumThreads(threads)
+    _settings.update(threads=cv2.getNumThreads(), parallelism=parallelism or 1, source=source)
+    return dict(_settings)
+
+
+def _on_config_changed(changed):
+    """Config subscriber - re-apply the thread settings."""
+    apply_settings()
+
+
+Config.subscribe(_on_config_changed, keys=('OPENCV_THREADS', 'MATCH_PARALLELISM'))
+
+
+def get_settings():
+    """Current thread settings (see apply_settings)."""
+    return dict(_settings)
+
+
+# =============================================================================
+# WARM-UP
+# =============================================================================
+
+def _run_pass(frame_rgb, entries):
+    """Run the detection pipeline once per template; return milliseconds."""
+    start = time.perf_counter()
+    gray = to_gray(frame_rgb)
+    binary = to_binary(gray)
+    match_many(binary, [entry.binary for entry in entries])
+    # Plain grayscale and color matching are used by a few checks as well
+    _match_one(gray, entries[0].image)
+    to_bgr(frame_rgb)
+    return (time.perf_counter() - start) * 1000
+
+
+def warm_up(folder, frame_size=None, abort_benchmark=None):
+    """
+    Load all templates, tune the thread settings and warm up OpenCV.
+    
+    Meant to run as a background job once the GUI is up. The dummy frame
+    has the screen's size so the first real checks reuse warmed-up code
+    paths for the same image sizes. Buffers are per thread, so the bot
+    thread reserves its own at the start of a run (see reserve_buffers).
+    
+    Args:
+        folder: Template image folder
+        frame_size: (width, height) of the dummy frame (default: 1920x1080)
+        abort_benchmark: Optional function returning True to skip the
+            benchmark (e.g. once a bot run has started)
+    
+    Returns:
+        dict: templates, first_ms (cold check), steady_ms (the same check
+            once warm), threads, parallelism, source, benchmark_ms (or
+            None when both settings are fixed) and benchmark_skipped
+    """
+    global _benchmark
+    if not CV2_AVAILABLE:
+        return None
+    
+    count = templates.register_folder(folder)
+    entries = templates.templates()
+    if not entries:
+        return None
+    
+    width, height = frame_size or DEFAULT_FRAME_SIZE
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+    
+    # Cold pass with one template (library initialisation, first
+    # allocations), then every registered template once
+    first_ms = _run_pass(frame, entries[:1])
+    _run_pass(frame, entries)
+    
+    benchmark_ms = None
+    skipped = False
+    if not (Config.OPENCV_THREADS and Config.MATCH_PARALLELISM):
+        binary = to_binary(to_gray(frame))
+        start = time.perf_counter()
+        result = run_benchmark(binary, [entry.binary for entry in entries], abort=abort_benchmark)
+        if result is None:
+            skipped = True
+        else:
+            _benchmark = result
+            benchmark_ms = (time.perf_counter() - start) * 1000
+    settings = apply_settings()
+    
+    steady_ms = _run_pass(frame, entries[:1])
+    
+    return {
+        'templates': count,
+        'first_ms': first_ms,
+        'steady_ms': steady_ms,
+        'threads': settings['threads'],
+        'parallelism': settings['parallelism'],
+        'source': settings['source'],
+        'benchmark_ms': benchmark_ms,
+        'benchmark_skipped': skipped,
+    }
+
+
+def reserve_buffers(frame_size):
+    """
+    Allocate the calling thread's buffers for frames up to frame_size.
+    
+    warm_up() runs on a job thread and buffers are per thread, so the bot
+    thread calls this when a run starts; its first checks then reuse
+    memory like every later one. The result buffer is sized for the
+    smallest registered template, which gives the largest result.
+    
+    Args:
+        frame_size: (width, height) of the largest frame to expect
+    """
+    width, height = frame_size
+    shapes = [entry.shape for entry in templates.templates()] or [(1, 1)]
+    t_height = min(shape[0] for shape in shapes)
+    t_width = min(shape[1] for shape in shapes)
+    buffers.get('gray', (height, width))
+    buffers.get('binary', (height, width))
+    buffers.get('bgr', (height, width, 3))
+    buffers.get('result', (max(1, height - t_height + 1), max(1, width - t_width + 1)), np.float32)
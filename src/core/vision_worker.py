@@ -0,0 +1,388 @@
+"""
+Optional vision worker process for the Magic Garden Bot.
+
+Capture and template matching are CPU-heavy NumPy/OpenCV work. In the
+bot process they compete with Tk and the input thread for the GIL and
+the cores. With VISION_WORKER_ENABLED a separate process does that work:
+- It captures the capture target into a shared-memory ring of frame
+  slots (multiprocessing.shared_memory) and matches every registered
+  detector template against each frame
+- Only compact results go back over a pipe: per frame its sequence
+  number, capture timestamp (time.monotonic, shared by all processes)
+  and (template id, x, y, score) per detector, in screen coordinates
+- The bot process never copies frames; read_frame() gives a zero-copy
+  view of a ring slot for the rare caller that needs pixels
+- detect() asks for a frame captured after the call, so a worker result
+  is never older than an in-process check would be; if the worker does
+  not answer in time the caller falls back to in-process detection
+"""
+
+import os
+import time
+import threading
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from . import capture
+from . import vision
+from .config import Config
+from .jobs import executor as job_executor
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+# Frame slots in the ring; a slot is only overwritten RING_SLOTS frames later
+RING_SLOTS = 3
+
+# Ring slot header: seq, height, width, left, top, capture time (ns)
+_HEADER_FIELDS = 6
+
+# Extra wait on top of one frame interval before detect() gives up (seconds)
+DETECT_TIMEOUT = 1.0
+
+# Seconds to wait for the worker process to exit on stop
+STOP_TIMEOUT = 2.0
+
+# OpenCV threads in the worker when OPENCV_THREADS is 0, so it keeps to one core
+WORKER_OPENCV_THREADS = 1
+
+# Config values copied into the worker process
+WORKER_CONFIG_KEYS = (
+    'CAPTURE_TARGET', 'CAPTURE_MONITOR', 'CAPTURE_RECT', 'CAPTURE_WINDOW_TITLE',
+    'CAPTURE_BACKEND', 'CAPTURE_REPLAY_PATH', 'OPENCV_THREADS', 'VISION_WORKER_FPS',
+)
+
+
+# =============================================================================
+# SHARED FRAME RING
+# =============================================================================
+
+def _attach(name):
+    """Attach to the bot's shared memory block (the bot process owns and unlinks it)."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before Python 3.13 attaching registers the block again, but with
+        # the resource tracker shared with the bot process, so that is harmless
+        return shared_memory.SharedMemory(name=name)
+
+
+class FrameRing:
+    """Fixed-size RGB frame slots with a small header, in shared memory."""
+    
+    def __init__(self, shm, slots, slot_bytes):
+        self.shm = shm
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        header_bytes = slots * _HEADER_FIELDS * 8
+        self.header = np.ndarray((slots, _HEADER_FIELDS), dtype=np.int64, buffer=shm.buf)
+        self.data = np.ndarray((slots, slot_bytes), dtype=np.uint8, buffer=shm.buf, offset=header_bytes)
+    
+    @staticmethod
+    def size(slots, slot_bytes):
+        """Bytes needed for a ring."""
+        return slots * (_HEADER_FIELDS * 8 + slot_bytes)
+    
+    def write(self, seq, frame, left, top, timestamp):
+        """
+        Copy a frame into its slot (worker side).
+        
+        Returns:
+            numpy.ndarray or None: The frame as stored in the ring, or None
+                if it does not fit into a slot
+        """
+        height, width = frame.shape[:2]
+        nbytes = height * width * 3
+        if nbytes > self.slot_bytes:
+            return None
+        slot = seq % self.slots
+        self.header[slot, 0] = 0  # Mark the slot as being written
+        stored = self.data[slot, :nbytes].reshape(height, width, 3)
+        np.copyto(stored, frame[:, :, :3])
+        self.header[slot] = (seq, height, width, left, top, int(timestamp * 1e9))
+        return stored
+    
+    def read(self, seq):
+        """
+        Zero-copy view of a frame (bot side).
+        
+        Returns:
+            tuple or None: (frame, (left, top)), or None once the slot was
+                reused. The view is overwritten RING_SLOTS frames later.
+        """
+        slot = seq % self.slots
+        stored_seq, height, width, left, top, _ = (int(v) for v in self.header[slot])
+        if stored_seq != seq:
+            return None
+        frame = self.data[slot, :height * width * 3].reshape(height, width, 3)
+        return frame, (left, top)
+    
+    def close(self):
+        # Drop the views before closing, or the buffer cannot be released
+        self.header = self.data = None
+        self.shm.close()
+
+
+# =============================================================================
+# WORKER PROCESS
+# =============================================================================
+
+def _worker_main(conn, shm_name, slots, slot_bytes, config_values, detectors, parent_pid):
+    """
+    Worker process entry point.
+    
+    Captures a frame every 1 / VISION_WORKER_FPS seconds, or at once when
+    the bot sends 'kick', and sends ('frame', seq, timestamp, capture_ms,
+    detect_ms, [(template_id, x, y, score)]) back.
+    """
+    for key, value in config_values.items():
+        setattr(Config, key, value)
+    if not Config.OPENCV_THREADS:
+        Config.OPENCV_THREADS = WORKER_OPENCV_THREADS
+    vision.apply_settings()
+    
+    ring = FrameRing(_attach(shm_name), slots, slot_bytes)
+    interval = 1.0 / max(0.1, float(Config.VISION_WORKER_FPS))
+    loaded = _load_detectors(detectors)
+    seq = 0
+    next_capture = time.monotonic()
+    
+    try:
+        while True:
+            # Sleep until the next frame is due; a 'kick' captures right away
+            stop = False
+            if conn.poll(max(0.0, next_capture - time.monotonic())):
+                # Several kicks may have queued up - one frame answers them all
+                while conn.poll(0):
+                    stop = stop or conn.recv()[0] == 'stop'
+            if stop or os.getppid() != parent_pid:
+                break  # Stopped, or the bot process is gone
+            
+            next_capture = time.monotonic() + interval
+            start = time.monotonic()
+            frame, (left, top) = capture.target.grab()
+            seq += 1
+            stored = ring.write(seq, frame, left, top, start)
+            if stored is not None:
+                frame = stored
+            captured = time.monotonic()
+            
+            binary = vision.to_binary(vision.to_gray(frame))
+            results = []
+            for template_id, template in loaded:
+                t_height, t_width = template.shape
+                if t_height > binary.shape[0] or t_width > binary.shape[1]:
+                    continue
+                (x, y), score = vision.match(binary, template.binary)
+                results.append((template_id, x + left, y + top, round(float(score), 4)))
+            done = time.monotonic()
+            
+            conn.send(('frame', seq, start, (captured - start) * 1000, (done - captured) * 1000, results))
+    except (EOFError, BrokenPipeError, ConnectionResetError, KeyboardInterrupt):
+        pass
+    finally:
+        ring.close()
+        conn.close()
+
+
+def _load_detectors(detectors):
+    """Load (template_id, path) pairs from the registry (worker side)."""
+    loaded = []
+    for template_id, path in detectors:
+        template = vision.templates.get(path)
+        if template is None:
+            print(f"Vision worker: could not load {path}")
+            continue
+        loaded.append((template_id, template))
+    return loaded
+
+
+# =============================================================================
+# BOT SIDE
+# =============================================================================
+
+class VisionWorker:
+    """Starts the worker process and keeps the latest result per template."""
+    
+    def __init__(self):
+        self._process = None
+        self._conn = None
+        self._ring = None
+        self._job = None
+        self._send_lock = threading.Lock()
+        self._results = threading.Condition()
+        self._latest = {}    # {template_id: (x, y, score, seq, timestamp)}
+        self._detectors = {}  # {template_id: path}
+        self.reset_stats()
+    
+    @property
+    def running(self):
+        return self._process is not None and self._process.is_alive()
+    
+    def handles(self, template_id):
+        """True if the running worker matches this template."""
+        return self.running and template_id in self._detectors
+    
+    def start(self, detectors):
+        """
+        Start the worker process.
+        
+        Args:
+            detectors: {template_id: template path} matched on every frame
+        
+        Returns:
+            bool: True if the worker started
+        """
+        if self.running:
+            return True
+        
+        left, top, right, bottom = capture.virtual_screen_bbox()
+        target = capture.target.bbox()
+        slot_bytes = max((right - left) * (bottom - top), (target[2] - target[0]) * (target[3] - target[1])) * 3
+        
+        try:
+            shm = shared_memory.SharedMemory(create=True, size=FrameRing.size(RING_SLOTS, slot_bytes))
+        except OSError as e:
+            print(f"Vision worker: could not allocate the frame ring: {e}")
+            return False
+        self._ring = FrameRing(shm, RING_SLOTS, slot_bytes)
+        self._ring.header[:] = 0
+        self._detectors = dict(detectors)
+        self._latest.clear()
+        
+        config_values = {key: getattr(Config, key) for key in WORKER_CONFIG_KEYS}
+        self._conn, child_conn = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(
+            target=_worker_main, name="vision-worker", daemon=True,
+            args=(child_conn, shm.name, RING_SLOTS, slot_bytes, config_values,
+                  list(self._detectors.items()), os.getpid()),
+        )
+        try:
+            self._process.start()
+        except Exception as e:
+            print(f"Vision worker: could not start: {e}")
+            self._process = None
+            self._release()
+            return False
+        child_conn.close()
+        
+        self._job = job_executor.submit("vision worker", self._listen, dedicated=True)
+        return True
+    
+    def stop(self):
+        """Stop the worker process and release the frame ring."""
+        process = self._process
+        if process is None:
+            return
+        self._send(('stop',))
+        process.join(STOP_TIMEOUT)
+        if process.is_alive():
+            process.terminate()
+            process.join(STOP_TIMEOUT)
+        self._process = None
+        if self._job is not None:
+            self._job.cancel()
+            self._job = None
+        self._release()
+    
+    def _release(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self._ring is not None:
+            shm = self._ring.shm
+            self._ring.close()
+            self._ring = None
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+        with self._results:
+            self._results.notify_all()
+    
+    def _send(self, message):
+        with self._send_lock:
+            if self._conn is None:
+                return
+            try:
+                self._conn.send(message)
+            except (OSError, EOFError):
+                pass
+    
+    def _listen(self):
+        """Job: receive frame results until the worker stops."""
+        conn, job = self._conn, self._job
+        try:
+            while self._process is not None and not (job and job.cancelled):
+                if not conn.poll(0.2):
+                    continue
+                _, seq, timestamp, capture_ms, detect_ms, results = conn.recv()
+                with self._results:
+                    for template_id, x, y, score in results:
+                        self._latest[template_id] = (x, y, score, seq, timestamp)
+                    self.frames += 1
+                    self.capture_ms += capture_ms
+                    self.detect_ms += detect_ms
+                    self._results.notify_all()
+        except (EOFError, OSError):
+            pass
+    
+    def detect(self, template_id, timeout=None):
+        """
+        Best match of a template in a frame captured after this call.
+        
+        Args:
+            template_id: Detector name passed to start()
+            timeout: Seconds to wait (default: one frame interval plus
+                DETECT_TIMEOUT)
+        
+        Returns:
+            tuple or None: (x, y, score, seq) in screen coordinates, or None
+                if the worker did not deliver in time
+        """
+        since = time.monotonic()
+        if timeout is None:
+            timeout = 1.0 / max(0.1, float(Config.VISION_WORKER_FPS)) + DETECT_TIMEOUT
+        deadline = since + timeout
+        self._send(('kick',))
+        
+        with self._results:
+            while True:
+                latest = self._latest.get(template_id)
+                if latest is not None and latest[4] >= since:
+                    self.detections += 1
+                    x, y, score, seq, _ = latest
+                    return x, y, score, seq
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.running:
+                    self.timeouts += 1
+                    return None
+                self._results.wait(remaining)
+    
+    def read_frame(self, seq):
+        """Zero-copy view of a recent frame (see FrameRing.read), or None."""
+        ring = self._ring
+        return ring.read(seq) if ring is not None else None
+    
+    def reset_stats(self):
+        self.frames = 0
+        self.detections = 0
+        self.timeouts = 0
+        self.capture_ms = 0.0
+        self.detect_ms = 0.0
+    
+    def summary(self):
+        """One-line summary for the log."""
+        if not self.frames:
+            return "no frames"
+        return (f"{self.frames} frames (capture {self.capture_ms / self.frames:.1f} ms, "
+                f"match {self.detect_ms / self.frames:.1f} ms), {self.detections} detections, "
+                f"{self.timeouts} fallback(s)")
+
+
+# Process-wide worker handle
+worker = VisionWorker()
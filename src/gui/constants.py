@@ -5,6 +5,8 @@ This module centralizes all hardcoded data, color palettes, and configuration
 defaults to improve maintainability and reduce duplication.
 """
 
+from src.core.config import FIELD_RANGES
+
 # =============================================================================
 # COLOR PALETTES
 # =============================================================================
@@ -88,12 +90,13 @@ DEFAULT_CONFIGS = {
 }
 
 # Configuration field definitions: (label, config_key, min_val, max_val, tooltip)
+# The limits come from config.FIELD_RANGES, which Config.validate() enforces
 CONFIG_DEFINITIONS = [
-    ("Columns", "COLUMNS", 1, 20, "Number of columns in the garden grid."),
-    ("Harvest Count", "HARVEST_COUNT", 1, 10, "How many times to click each crop tile."),
-    ("Move Delay (s)", "MOVE_DELAY", 0.05, 1.0, "Time in seconds between grid movements (Recommended: 0.12s)."),
-    ("Harvest Delay (s)", "HARVEST_DELAY", 0.05, 1.0, "Time to wait after clicking a crop."),
-    ("Loop Cooldown (s)", "LOOP_COOLDOWN", 0, 10, "Pause time between full garden cycles."),
+    ("Columns", "COLUMNS", *FIELD_RANGES['COLUMNS'], "Number of columns in the garden grid."),
+    ("Harvest Count", "HARVEST_COUNT", *FIELD_RANGES['HARVEST_COUNT'], "How many times to click each crop tile."),
+    ("Move Delay (s)", "MOVE_DELAY", *FIELD_RANGES['MOVE_DELAY'], "Time in seconds between grid movements (Recommended: 0.12s)."),
+    ("Harvest Delay (s)", "HARVEST_DELAY", *FIELD_RANGES['HARVEST_DELAY'], "Time to wait after clicking a crop."),
+    ("Loop Cooldown (s)", "LOOP_COOLDOWN", *FIELD_RANGES['LOOP_COOLDOWN'], "Pause time between full garden cycles."),
 ]
 
 
@@ -107,6 +110,18 @@ INVENTORY_COLUMNS = 4
 # View modes for inventory display
 VIEW_MODES = ["Grid", "Tier", "A-Z"]
 
+# Mini map views: label -> per-plot metric key (None = position only)
+MINIMAP_VIEWS = {
+    "Position": None,
+    "Time": "time",
+    "Presses": "presses",
+    "Sells": "sells",
+}
+
+# UI refresh intervals in milliseconds
+UI_REFRESH_ACTIVE_MS = 100   # While the bot is running
+UI_REFRESH_IDLE_MS = 1000    # While idle or minimised
+
 # Button dimensions
 BUTTON_HEIGHT = 40
 BUTTON_WIDTH_SMALL = 60
@@ -5,11 +5,12 @@ This module handles bot control logic and configuration management,
 separating business logic from UI concerns.
 """
 
-import threading
 import time
 from tkinter import messagebox
 
-from src.core import state, config, game_actions
+from src.core import state, config
+from src.core.cancellation import Cancelled
+from src.core.jobs import executor as job_executor
 from src.gui.constants import DEFAULT_CONFIGS
 
 
@@ -30,11 +31,11 @@ class BotController:
         """
         self.gui = gui_ref
         self.current_mode = 'farm'
+        self._job = None
     
     def start_farming(self):
         """Start the bot in Farming Mode (Harvesting)."""
-        config.Config.HARVESTING_ENABLED = True
-        config.Config.save()
+        config.Config.set('HARVESTING_ENABLED', True)
         self.gui.log("Starting Farming Mode...", "info")
         self.start_bot(mode='farm')
     
@@ -46,22 +47,28 @@ class BotController:
             seeds_per_trip_var: StringVar containing seeds per trip value
             autobuy_interval_var: StringVar containing autobuy interval value
         """
-        # Disable harvesting, enable autobuy for shop mode
-        config.Config.HARVESTING_ENABLED = False
-        config.Config.AUTOBUY_ENABLED = True
-        
         # Save shop settings from UI
         try:
-            config.Config.SEEDS_PER_TRIP = int(seeds_per_trip_var.get())
+            seeds_per_trip = max(1, int(seeds_per_trip_var.get()))
         except (ValueError, AttributeError):
-            config.Config.SEEDS_PER_TRIP = 1
+            seeds_per_trip = 1
         
         try:
-            config.Config.AUTOBUY_INTERVAL = int(autobuy_interval_var.get())
+            autobuy_interval = max(10, int(autobuy_interval_var.get()))  # Minimum 10 seconds
         except (ValueError, AttributeError):
-            config.Config.AUTOBUY_INTERVAL = 180
+            autobuy_interval = 180
         
-        config.Config.save()
+        # Disable harvesting, enable autobuy for shop mode
+        try:
+            config.Config.update({
+                'HARVESTING_ENABLED': False,
+                'AUTOBUY_ENABLED': True,
+                'SEEDS_PER_TRIP': seeds_per_trip,
+                'AUTOBUY_INTERVAL': autobuy_interval,
+            })
+        except ValueError as e:
+            self.gui.log(f"⚠️ Invalid shop settings: {e}", "error")
+            return
         seeds_count = len(config.Config.SELECTED_SEEDS)
         self.gui.log(
             f"Starting Shop Mode: {seeds_count} seed type(s), "
@@ -70,24 +77,39 @@ class BotController:
         )
         self.start_bot(mode='shop')
     
+    def start_calibration(self):
+        """Start delay calibration (auto-tunes MOVE_DELAY and HARVEST_DELAY)."""
+        self.gui.log("Starting delay calibration - stand on the top-left plot (0, 0)...", "info")
+        self.start_bot(mode='calibrate')
+    
     def start_bot(self, mode='farm'):
         """
         Start the automation loop in a separate thread.
         
         Args:
-            mode: 'farm' for harvesting loop, 'shop' for dedicated shop loop
+            mode: 'farm' for harvesting loop, 'shop' for dedicated shop loop,
+                'calibrate' for a one-off delay calibration run
         """
         if state.bot_running:
             return
+        if self._job is not None and not self._job.done():
+            # Never let two bot threads send input at the same time
+            self.gui.log("Previous run is still stopping - try again in a moment.", "warning")
+            return
         
         self.current_mode = mode
         state.bot_running = True
+        state.bot_paused = False
+        state.cancel_token.reset()
         state.stats['start_time'] = time.time()
+        state.notify_stats_changed()
         self.gui.update_button_states()
         
-        # Start automation in a background thread
-        thread = threading.Thread(target=self._run_automation, daemon=True)
-        thread.start()
+        # Start automation as a background job; cancelling the job (e.g. on
+        # exit) stops the run like the STOP button
+        self._job = job_executor.submit(
+            "bot", self._run_automation, on_cancel=state.cancel_token.cancel, dedicated=True
+        )
         
         self.gui.status_label.set_status("RUNNING")
         self.gui.log("Automation started.", "success")
@@ -98,14 +120,84 @@ class BotController:
             return
         
         state.bot_running = False
+        state.bot_paused = False
+        state.cancel_token.cancel()
+        state.notify_stats_changed()
         self.gui.update_button_states()
         
         self.gui.status_label.set_status("STOPPING...")
         self.gui.log("Stopping automation...", "warning")
     
+    def toggle_pause(self):
+        """Pause the bot at the next safe point, or resume it."""
+        if not state.bot_running:
+            return
+        
+        state.bot_paused = not state.bot_paused
+        if state.bot_paused:
+            state.cancel_token.pause()
+        else:
+            state.cancel_token.resume()
+        state.notify_stats_changed()
+        self.gui.update_button_states()
+        
+        if state.bot_paused:
+            # Keep the progress if the app is closed while paused
+            from src.core import checkpoint
+            checkpoint.flush_checkpoint()
+            self.gui.log("⏸ Paused.", "warning")
+        else:
+            self.gui.log("▶ Resumed.", "success")
+    
+    def _finish_run(self):
+        """Mark the run as stopped (also when it ended on its own) and refresh the controls."""
+        if not state.bot_running:
+            return
+        state.bot_running = False
+        state.notify_stats_changed()
+        job_executor.call_in_tk(self.gui.update_button_states)
+    
     def _run_automation(self):
+        """Bot thread entry point - runs the selected mode until stopped."""
+        # Usually already imported by the startup warm-up
+        from src.core import game_actions
+        
+        try:
+            game_actions.reset_trip_state()
+            # The warm-up ran on a job thread - give this thread its own buffers
+            game_actions.automation.reserve_vision_buffers()
+            if game_actions.automation.start_vision_worker():
+                self.gui.log("Vision worker process started.", "info")
+            self._run_mode(game_actions)
+        except Cancelled:
+            # The stopped trip is abandoned - no pending journal prompt or
+            # return leg may fire later
+            game_actions.reset_trip_state()
+        finally:
+            if game_actions.automation.vision_worker.worker.running:
+                game_actions.automation.stop_vision_worker()
+                self.gui.log(f"Vision worker: {game_actions.automation.vision_worker.worker.summary()}", "info")
+            # How long the thread kept running after STOP was pressed
+            latency = state.cancel_token.stop_latency()
+            if latency is not None:
+                state.stats['stop_latency_ms'] = latency * 1000
+                self.gui.log(f"⏹ Automation stopped ({latency * 1000:.0f}ms after STOP).", "info")
+            self.gui.log(f"Background jobs: {job_executor.summary()}", "info")
+            self._finish_run()
+    
+    def _run_mode(self, game_actions):
         """Main bot loop executed in a separate thread."""
-        time.sleep(3)  # Grace period for user to switch to game window
+        # Grace period for user to switch to game window
+        state.cancel_token.wait(3)
+        
+        if self.current_mode == 'calibrate':
+            from src.core import calibration
+            try:
+                calibration.run_calibration(logger=self.gui.log)
+            except Exception as e:
+                self.gui.log(f"Calibration error: {e}", "error")
+                state.stats['errors'] += 1
+            return
         
         if self.current_mode == 'shop':
             # Dedicated shop-only loop
@@ -116,6 +208,12 @@ class BotController:
         # Farm mode - original harvest loop behavior
         self.gui.log("Starting Farming loop...", "success")
         
+        # Continue an interrupted cycle where it left off
+        start_index = 0
+        if config.Config.HARVESTING_ENABLED:
+            start_index = game_actions.resume_from_checkpoint(logger=self.gui.log)
+        game_actions.sell_policy.start_run()
+        
         while state.bot_running:
             try:
                 state.stats['cycles'] += 1
@@ -124,7 +222,8 @@ class BotController:
                     cycle_start = time.time()
                     self.gui.log(f"━━━ Cycle #{state.stats['cycles']} started ━━━", "info")
                     
-                    game_actions.harvest_loop(logger=self.gui.log)
+                    game_actions.harvest_loop(logger=self.gui.log, start_index=start_index)
+                    start_index = 0
                     
                     # Record duration
                     duration = time.time() - cycle_start
@@ -136,17 +235,30 @@ class BotController:
                         f"✓ Cycle #{state.stats['cycles']} complete! ({duration:.1f}s)", 
                         "success"
                     )
+                    
+                    settle = game_actions.automation.get_settle_stats()
+                    if settle['count']:
+                        self.gui.log(
+                            f"Move settle: avg {settle['avg_ms']:.0f}ms, "
+                            f"p95 {settle['p95_ms']:.0f}ms, "
+                            f"{settle['timeouts']} timeout(s) in {settle['count']} moves",
+                            "info"
+                        )
+                    self.gui.log(f"Scheduler: {game_actions.scheduler.summary()}", "info")
+                    self.gui.log(f"Selling: {game_actions.sell_policy.summary()}", "info")
+                    self.gui.log(f"Vision: {game_actions.vision.buffers.summary()}", "info")
+                    self.gui.log(f"Capture: {game_actions.capture.summary()}", "info")
                     if config.Config.LOOP_COOLDOWN > 0:
                         self.gui.log(
                             f"Waiting {config.Config.LOOP_COOLDOWN}s before next cycle...", 
                             "info"
                         )
-                    time.sleep(config.Config.LOOP_COOLDOWN)
+                    game_actions.wait_for_next_cycle(config.Config.LOOP_COOLDOWN, logger=self.gui.log)
                     
             except Exception as e:
                 self.gui.log(f"An unexpected error occurred in bot thread: {e}", "error")
                 state.stats['errors'] += 1
-                time.sleep(2)
+                state.cancel_token.wait(2)
 
 
 class ConfigController:
@@ -170,27 +282,38 @@ class ConfigController:
         """
         Save current configuration values.
         
+        Values are validated against config.FIELD_RANGES and applied in one
+        update, so running loops are notified once with all changes.
+        
         Args:
             config_vars: Dictionary of {config_key: StringVar}
         """
+        values = {}
+        for key, var in config_vars.items():
+            str_value = var.get().strip()
+            if str_value == "":
+                self.gui.log(f"Config error: {key} is empty.", "error")
+                return
+            values[key] = str_value
+        
         try:
-            for key, var in config_vars.items():
-                str_value = var.get().strip()
-                if str_value == "":
-                    self.gui.log(f"Config error: {key} is empty.", "error")
-                    return
-                value = float(str_value)
-                # Convert to int if it's a whole number
-                setattr(config.Config, key, int(value) if value.is_integer() else value)
-            config.Config.save()
-            self.gui.log("Configuration saved!", "success")
-            messagebox.showinfo("Success", "Configuration saved successfully!")
-        except ValueError:
-            self.gui.log("Config error: Invalid number format.", "error")
-            messagebox.showerror(
-                "Error", 
-                "Invalid configuration value. Please enter numbers only."
+            changed = config.Config.update(values)
+        except ValueError as e:
+            message = str(e)
+            if message.startswith("could not convert"):
+                message = "Invalid configuration value. Please enter numbers only."
+            self.gui.log(f"Config error: {message}", "error")
+            messagebox.showerror("Error", message)
+            return
+        
+        if changed and state.bot_running:
+            self.gui.log(
+                f"Configuration saved! Applying {', '.join(changed)} at the next plot.",
+                "success"
             )
+        else:
+            self.gui.log("Configuration saved!", "success")
+        messagebox.showinfo("Success", "Configuration saved successfully!")
     
     def save_shop_settings(self, seeds_per_trip_var, autobuy_interval_var, 
                            shop_search_attempts_var):
@@ -207,22 +330,23 @@ class ConfigController:
             seeds_per_trip = int(seeds_per_trip_var.get())
             if seeds_per_trip < 1:
                 seeds_per_trip = 1
-            config.Config.SEEDS_PER_TRIP = seeds_per_trip
             
             # Save autobuy interval
             autobuy_interval = int(autobuy_interval_var.get())
             if autobuy_interval < 10:
                 autobuy_interval = 10  # Minimum 10 seconds
-            config.Config.AUTOBUY_INTERVAL = autobuy_interval
             
             # Save search attempts
             search_attempts = int(shop_search_attempts_var.get())
             if search_attempts < 1:
                 search_attempts = 1
-            config.Config.SHOP_SEARCH_ATTEMPTS = search_attempts
             
-            # Save to disk
-            config.Config.save()
+            # Apply and save to disk
+            config.Config.update({
+                'SEEDS_PER_TRIP': seeds_per_trip,
+                'AUTOBUY_INTERVAL': autobuy_interval,
+                'SHOP_SEARCH_ATTEMPTS': search_attempts,
+            })
             
             self.gui.log(
                 f"✓ Shop settings saved: {seeds_per_trip} seeds/trip, "
@@ -258,10 +382,28 @@ class ConfigController:
             "(Tile 0,0) before starting again.\n\nContinue?"
         ):
             for key in ['total_harvests', 'total_sells', 'total_moves', 
-                        'errors', 'inventory_checks', 'cycles']:
+                        'errors', 'inventory_checks', 'cycles',
+                        'position_corrections', 'merged_trips',
+                        'planned_sells']:
                 state.stats[key] = 0
             state.stats['start_time'] = None
             
+            state.reset_plot_metrics()
+            
+            # Saved progress no longer matches the character's position
+            from src.core import checkpoint
+            checkpoint.clear_checkpoint()
+            if self.gui.automation_ready:
+                from src.core import automation, game_actions
+                from src.core.localization import localizer
+                automation.reset_settle_stats()
+                game_actions.scheduler.reset_stats()
+                # The character is moved by hand, so relearn cell fingerprints
+                localizer.reset()
+                game_actions.sell_policy.reset()
+                game_actions.vision.buffers.reset_stats()
+                game_actions.capture.reset_stats()
+            
             # Reset position to start
             state.current_position['row'] = 0
             state.current_position['col'] = 0
@@ -317,8 +459,10 @@ class SeedController:
         
         config.Config.save()
         
-        # Update button visuals
-        self.inventory_builder.update_button_visuals(config.Config.SELECTED_SEEDS)
+        # Update only the toggled seed's buttons
+        self.inventory_builder.update_seed_visual(
+            seed_name, seed_name in config.Config.SELECTED_SEEDS
+        )
         
         # Log selection
         if hasattr(self.gui, 'log_text'):
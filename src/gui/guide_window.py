@@ -40,9 +40,10 @@ class GuideWindow(ctk.CTkToplevel):
         self.grab_set()
         self.focus_force()
         
-        # Track nav buttons and pages
+        # Track nav buttons, pages and their (lazy) builders
         self.nav_buttons = {}
         self.pages = {}
+        self.page_builders = {}
         self.current_page = None
         
         # Build UI
@@ -218,12 +219,12 @@ class GuideWindow(ctk.CTkToplevel):
         )
         self.content_area.grid(row=0, column=1, sticky="nsew")
         
-        # Create page frames
+        # Register page builders
         self._create_pages()
     
     def _create_pages(self):
-        """Create all page frames (hidden initially)."""
-        page_builders = {
+        """Register page builders (pages are built on first navigation)."""
+        self.page_builders = {
             "about": self._populate_about,
             "quick_start": self._populate_quick_start,
             "settings": self._populate_settings,
@@ -231,10 +232,14 @@ class GuideWindow(ctk.CTkToplevel):
             "faq": self._populate_faq,
             "auto_shop": self._populate_auto_shop,
         }
-        
-        for key, builder in page_builders.items():
-            self.pages[key] = ctk.CTkFrame(self.content_area, fg_color="transparent")
-            builder(self.pages[key])
+    
+    def _get_page(self, name):
+        """Return the page frame for a name, building it on first use."""
+        if name not in self.pages and name in self.page_builders:
+            page = ctk.CTkFrame(self.content_area, fg_color="transparent")
+            self.page_builders[name](page)
+            self.pages[name] = page
+        return self.pages.get(name)
     
     def select_frame(self, name):
         """Switch to the selected page and highlight the nav button."""
@@ -247,8 +252,9 @@ class GuideWindow(ctk.CTkToplevel):
             btn.configure(fg_color="transparent", text_color=self.colors['text_secondary'])
         
         # Show selected page
-        if name in self.pages:
-            self.pages[name].pack(fill="both", expand=True, padx=15, pady=15)
+        page = self._get_page(name)
+        if page is not None:
+            page.pack(fill="both", expand=True, padx=15, pady=15)
             self.current_page = name
         
         # Highlight selected button
@@ -8,6 +8,7 @@ This module has been refactored for better maintainability and scalability.
 import customtkinter as ctk
 from tkinter import messagebox
 from datetime import datetime
+import threading
 import time
 import os
 
@@ -18,16 +19,18 @@ except ImportError:
     PIL_AVAILABLE = False
 
 from src.core import state, config
-from src.core.automation import CV2_AVAILABLE
+from src.core.startup_profiler import profiler
+from src.core.progress import ProgressTracker, poll_progress
+from src.core.jobs import executor as job_executor
 from src.gui.mini_map import MiniMapWidget
 from src.gui.status_badge import StatusBadge
 from src.gui.collapsible_frame import CollapsibleFrame
-from src.gui.guide_window import GuideWindow
 
 # Import refactored modules
 from src.gui.constants import (
     UI_COLORS, VIEW_MODES, INVENTORY_COLUMNS, 
-    FONT_FAMILY, get_seed_color_map
+    FONT_FAMILY, get_seed_color_map, MINIMAP_VIEWS,
+    UI_REFRESH_ACTIVE_MS, UI_REFRESH_IDLE_MS
 )
 from src.gui.ui_builders import (
     InventoryBuilder, StatisticsPanelBuilder, 
@@ -36,12 +39,11 @@ from src.gui.ui_builders import (
 )
 from src.gui.controllers import BotController, ConfigController, SeedController
 
-# Import update functionality
+# Import update functionality (dialogs are imported when first shown)
 from src.core.updater import (
     CURRENT_VERSION, check_for_updates_async, 
     download_update_async, apply_update
 )
-from src.gui.update_dialog import UpdateDialog, NoUpdateDialog
 
 
 class HarvestBotGUI:
@@ -50,6 +52,9 @@ class HarvestBotGUI:
     def __init__(self, root):
         self.root = root
         self.root.title("🌱 Magic Garden Bot")
+        
+        # Background job results are delivered on this Tk thread
+        job_executor.attach_tk(self.root)
         self.root.geometry("1100x700")
         self.root.resizable(True, True)
         
@@ -69,6 +74,18 @@ class HarvestBotGUI:
         # Guide window reference (singleton)
         self.guide_window = None
         
+        # UI refresh state: last rendered values and the pending after() id
+        self._ui_snapshot = {}
+        self._ui_after_id = None
+        self._ui_interval = UI_REFRESH_ACTIVE_MS
+        self._ui_wake_pending = False
+        
+        # Shop tab and shop view are built on first selection
+        self._shop_built = False
+        
+        # Set once the automation modules (OpenCV, pyautogui, ...) are loaded
+        self.automation_ready = False
+        
         # Initialize builders
         self.inventory_builder = InventoryBuilder(self.colors)
         
@@ -77,23 +94,113 @@ class HarvestBotGUI:
         self.config_controller = ConfigController(self)
         self.seed_controller = SeedController(self, self.inventory_builder)
         
-        # Check for OpenCV dependency
-        if not CV2_AVAILABLE:
+        # Load image assets
+        with profiler.phase("gui: assets"):
+            self.load_assets()
+        
+        # Build the UI
+        self._build_layout()
+        
+        # Follow grid size changes on the mini map
+        config.Config.subscribe(self._on_grid_size_changed, keys=('ROWS', 'COLUMNS'))
+        
+        # Show values changed outside the panel (e.g. by calibration)
+        config.Config.subscribe(self._on_config_values_changed, keys=self.config_vars.keys())
+        
+        # Start the UI update loop (woken early by stats changes when idle)
+        state.add_stats_listener(self._on_stats_changed)
+        self.update_ui()
+    
+    # =========================================================================
+    # STARTUP
+    # =========================================================================
+    
+    def on_first_paint(self, first_paint_ms):
+        """
+        Called once the window has been painted for the first time.
+        
+        Logs the startup timings and starts loading the heavy automation
+        modules in the background.
+        """
+        self.log(f"⏱ Startup: {profiler.summary()}", "info")
+        self._report_saved_progress()
+        self._warm_up_automation()
+    
+    def _report_saved_progress(self):
+        """Tell the user when an interrupted session can be resumed."""
+        from src.core import checkpoint
+        saved = checkpoint.load_checkpoint()
+        if saved:
+            self.log(
+                f"↩️ Saved progress found: cycle #{saved['cycle']} at plot "
+                f"({saved['row']}, {saved['col']}). Start resumes there - "
+                "use Reset to start over from (0, 0).",
+                "info"
+            )
+    
+    def _warm_up_automation(self):
+        """Import the automation modules as a background job."""
+        def _warm_up():
+            with profiler.phase("warm-up: automation imports"):
+                from src.core import game_actions  # noqa: F401
+        
+        job_executor.submit(
+            "warm-up", _warm_up,
+            on_done=lambda _, error: self._on_automation_ready(error)
+        )
+    
+    def _on_automation_ready(self, error=None):
+        """Report automation module status once the warm-up finished."""
+        profiler.mark("automation_ready")
+        profiler.write_report()
+        
+        if error is not None:
+            self.log(f"✗ Failed to load automation modules: {error}", "error")
+            return
+        
+        from src.core.automation import CV2_AVAILABLE
+        self.automation_ready = True
+        if CV2_AVAILABLE:
+            self.log("✓ OpenCV loaded successfully", "success")
+            self._warm_up_vision()
+        else:
+            self.log("✗ OpenCV NOT available - image detection disabled!", "error")
             messagebox.showerror(
                 "Missing Dependency",
                 "OpenCV (cv2) is not available!\n\n"
                 "Image detection will not work.\n"
                 "Please install: pip install opencv-python"
             )
+    
+    def _warm_up_vision(self):
+        """Load the templates and warm up OpenCV as a background job."""
+        def _warm_up():
+            from src.core.automation import warm_up_vision
+            with profiler.phase("warm-up: vision"):
+                return warm_up_vision()
+        
+        job_executor.submit(
+            "vision warm-up", _warm_up,
+            on_done=self._on_vision_ready
+        )
+    
+    def _on_vision_ready(self, result, error=None):
+        """Log the template warm-up and the chosen OpenCV thread settings."""
+        if error is not None:
+            self.log(f"⚠️ Vision warm-up failed: {error}", "warning")
+            return
+        if not result:
+            return
         
-        # Load image assets
-        self.load_assets()
-        
-        # Build the UI
-        self._build_layout()
-        
-        # Start the UI update loop
-        self.update_ui()
+        self.log(
+            f"⚡ Vision warm-up: {result['templates']} templates, first check "
+            f"{result['first_ms']:.0f} ms, steady {result['steady_ms']:.0f} ms "
+            f"(OpenCV threads {result['threads']}, parallel matches "
+            f"{result['parallelism']}, {result['source']})",
+            "info"
+        )
+        if result.get('benchmark_skipped'):
+            self.log("Thread benchmark skipped because the bot was already running.", "info")
     
     def load_assets(self):
         """Load image assets for the GUI."""
@@ -140,10 +247,12 @@ class HarvestBotGUI:
         self.main_container.grid_rowconfigure(0, weight=1)
         
         # Left Sidebar
-        self._build_sidebar()
+        with profiler.phase("gui: sidebar"):
+            self._build_sidebar()
         
         # Right Main Area (Map + Log)
-        self._build_main_area()
+        with profiler.phase("gui: main area"):
+            self._build_main_area()
     
     def _build_sidebar(self):
         """Build the left sidebar with fixed Top and scrollable Bottom sections."""
@@ -236,9 +345,8 @@ class HarvestBotGUI:
         self.tab_view.add("Farm")
         self.tab_view.add("Shop")
         
-        # Build tab contents
+        # Build tab contents (Shop tab is built on first selection)
         self._build_farm_tab()
-        self._build_shop_tab()
     
     def _build_farm_tab(self):
         """Build the Farm tab content."""
@@ -260,13 +368,19 @@ class HarvestBotGUI:
         )
         self.stop_button.grid(row=0, column=1, padx=(0, 5), sticky="ew")
         
+        self.pause_button = create_control_button(
+            farm_controls, "⏸", self.toggle_pause,
+            self.colors['blurple'], "#4752c4", state="disabled"
+        )
+        self.pause_button.grid(row=0, column=2, padx=(0, 5), sticky="ew")
+        
         self.reset_button = create_control_button(
             farm_controls, "🔄", self.reset_stats,
             self.colors['blurple'], "#4752c4"
         )
-        self.reset_button.grid(row=0, column=2, sticky="ew")
+        self.reset_button.grid(row=0, column=3, sticky="ew")
         
-        farm_controls.grid_columnconfigure((0, 1, 2), weight=1)
+        farm_controls.grid_columnconfigure((0, 1, 2, 3), weight=1)
         
         # Status Banner
         self._build_status_banner(farm_tab)
@@ -294,8 +408,10 @@ class HarvestBotGUI:
             self.config_frame.content_frame,
             self.autobuy_enabled_var,
             self._on_autobuy_toggle,
-            self.save_config
+            self.save_config,
+            self.calibrate_delays
         )
+        self.calibrate_button = config_builder.calibrate_button
     
     def _build_status_banner(self, parent):
         """Build the status banner section."""
@@ -462,17 +578,39 @@ class HarvestBotGUI:
         )
         self.view_header_label.grid(row=0, column=0, sticky="w", padx=15, pady=(10, 5))
         
-        # Farm View
+        # Farm View (Shop View is built on first selection)
         self._build_farm_view()
-        
-        # Shop View
-        self._build_shop_view()
     
     def _build_farm_view(self):
         """Build the farm view with mini map."""
         self.farm_view = ctk.CTkFrame(self.view_container, fg_color="transparent")
         self.farm_view.grid(row=1, column=0, sticky="nsew", padx=10, pady=10)
         
+        # Map view switcher (position only or per-plot heatmap)
+        map_mode_frame = ctk.CTkFrame(self.farm_view, fg_color="transparent")
+        map_mode_frame.pack(fill="x", pady=(0, 5))
+        
+        ctk.CTkLabel(
+            map_mode_frame,
+            text="Show:",
+            font=ctk.CTkFont(family=FONT_FAMILY, size=11),
+            text_color=self.colors['text_muted']
+        ).pack(side="left", padx=(5, 10))
+        
+        self.map_view_mode = ctk.StringVar(value="Position")
+        ctk.CTkSegmentedButton(
+            map_mode_frame,
+            values=list(MINIMAP_VIEWS),
+            variable=self.map_view_mode,
+            command=self._on_map_view_change,
+            font=ctk.CTkFont(family=FONT_FAMILY, size=10),
+            fg_color=self.colors['card_bg'],
+            selected_color=self.colors['blurple'],
+            selected_hover_color="#4752c4",
+            unselected_color=self.colors['sidebar_bg'],
+            unselected_hover_color=self.colors['text_muted']
+        ).pack(side="left")
+        
         # Mini Map Widget
         self.mini_map = MiniMapWidget(
             self.farm_view, 
@@ -567,19 +705,15 @@ class HarvestBotGUI:
         self.log_text.tag_config("warning", foreground="#FAA61A")
         self.log_text.tag_config("error", foreground=self.colors['red'])
         
-        # Initial log messages
+        # Initial log message (OpenCV status is logged after warm-up)
         self.log("Bot initialized. Ready to start!", "info")
-        if CV2_AVAILABLE:
-            self.log("✓ OpenCV loaded successfully", "success")
-        else:
-            self.log("✗ OpenCV NOT available - image detection disabled!", "error")
     
     # =========================================================================
     # INVENTORY MANAGEMENT
     # =========================================================================
     
     def _create_inventory_slots(self):
-        """Create interactive inventory button grid based on current view mode."""
+        """Show the inventory button grid for the current view mode."""
         view_mode = self.shop_view_mode.get() if hasattr(self, 'shop_view_mode') else "Tier"
         self.inventory_builder.create_inventory_slots(
             self.inventory_container,
@@ -591,8 +725,13 @@ class HarvestBotGUI:
         self.seed_controller.initialize_selected_seeds()
         self.inventory_builder.update_button_visuals(config.Config.SELECTED_SEEDS)
     
+    def _on_map_view_change(self, mode):
+        """Switch the mini map between position and heatmap views."""
+        self.mini_map.set_metric(MINIMAP_VIEWS.get(mode))
+        self.mini_map.update_metrics(*state.snapshot_plot_metrics())
+    
     def _on_view_mode_change(self, mode):
-        """Handle view mode change and rebuild inventory."""
+        """Handle view mode change (cached layouts are swapped, not rebuilt)."""
         self._create_inventory_slots()
     
     def select_seed(self, seed_name):
@@ -603,17 +742,31 @@ class HarvestBotGUI:
     # TAB SWITCHING
     # =========================================================================
     
+    def _ensure_shop_built(self):
+        """Build the Shop tab and shop inventory view on first use."""
+        if self._shop_built:
+            return
+        
+        with profiler.phase("gui: shop (lazy)") as record:
+            self._build_shop_tab()
+            self._build_shop_view()
+            self._shop_built = True
+            self.update_button_states()
+        self.log(f"⏱ Shop view built in {record['ms']:.0f}ms", "info")
+    
     def on_tab_change(self, selected_tab=None):
         """Handle tab switching to swap views and sidebar content."""
         current_tab = self.tab_view.get()
         
         if current_tab == "Shop":
+            self._ensure_shop_built()
             self.farm_view.grid_remove()
             self.shop_view.grid(row=1, column=0, sticky="nsew", padx=10, pady=10)
             self.view_header_label.configure(text="🛒 SHOP INVENTORY")
             self.shop_stats_container.pack(fill="x")
         else:
-            self.shop_view.grid_remove()
+            if self._shop_built:
+                self.shop_view.grid_remove()
             self.farm_view.grid(row=1, column=0, sticky="nsew", padx=10, pady=10)
             self.view_header_label.configure(text="🌱 LIVE FIELD")
             self.shop_stats_container.pack_forget()
@@ -633,24 +786,41 @@ class HarvestBotGUI:
             self.autobuy_interval_var
         )
     
+    def calibrate_delays(self):
+        """Auto-tune the move and harvest delays."""
+        self.bot_controller.start_calibration()
+    
     def stop_bot(self):
         """Stop the automation loop."""
         self.bot_controller.stop_bot()
     
+    def toggle_pause(self):
+        """Pause or resume the automation loop."""
+        self.bot_controller.toggle_pause()
+    
     def update_button_states(self):
         """Update enable/disable state of buttons based on bot_running."""
         if state.bot_running:
             self.start_button.configure(state="disabled", fg_color="gray")
-            self.shop_start_button.configure(state="disabled", fg_color="gray")
             self.stop_button.configure(state="normal", fg_color=self.colors['red'])
-            self.shop_stop_button.configure(state="normal", fg_color=self.colors['red'])
             self.reset_button.configure(state="disabled", fg_color="gray")
+            self.calibrate_button.configure(state="disabled")
+            self.pause_button.configure(
+                state="normal", fg_color=self.colors['blurple'],
+                text="▶" if state.bot_paused else "⏸"
+            )
+            if self._shop_built:
+                self.shop_start_button.configure(state="disabled", fg_color="gray")
+                self.shop_stop_button.configure(state="normal", fg_color=self.colors['red'])
         else:
             self.start_button.configure(state="normal", fg_color=self.colors['green'])
-            self.shop_start_button.configure(state="normal", fg_color=self.colors['green'])
             self.stop_button.configure(state="disabled", fg_color="gray")
-            self.shop_stop_button.configure(state="disabled", fg_color="gray")
             self.reset_button.configure(state="normal", fg_color=self.colors['blurple'])
+            self.calibrate_button.configure(state="normal")
+            self.pause_button.configure(state="disabled", fg_color="gray", text="⏸")
+            if self._shop_built:
+                self.shop_start_button.configure(state="normal", fg_color=self.colors['green'])
+                self.shop_stop_button.configure(state="disabled", fg_color="gray")
     
     # =========================================================================
     # LOGGING
@@ -688,64 +858,139 @@ class HarvestBotGUI:
             return sum(times) / len(times)
         return 0.0
     
+    def _set_label(self, key, widget, text):
+        """Configure a label only if its text changed since the last refresh."""
+        if self._ui_snapshot.get(key) != text:
+            self._ui_snapshot[key] = text
+            widget.configure(text=text)
+    
+    def _get_autobuy_remaining(self):
+        """Seconds until the next auto-buy, or None if none is scheduled."""
+        if (state.bot_running and config.Config.AUTOBUY_ENABLED and 
+            'last_buy_time' in state.stats):
+            elapsed = time.time() - state.stats['last_buy_time']
+            return max(0, config.Config.AUTOBUY_INTERVAL - elapsed)
+        return None
+    
+    def _get_next_buy_text(self):
+        """Format the Next Buy stat box value."""
+        remaining = self._get_autobuy_remaining()
+        return "--" if remaining is None else f"{int(remaining)}s"
+    
     def update_ui(self):
-        """Periodically update all dynamic UI elements."""
+        """
+        Periodically update dynamic UI elements.
+        
+        Only widgets whose value changed since the last refresh are
+        reconfigured. The refresh rate drops while the bot is idle or
+        the window is minimised.
+        """
+        self._ui_after_id = None
         s = state.stats
+        labels = self.stat_labels
         
         # Update stat labels
-        self.stat_labels['cycles'].configure(text=str(s['cycles']))
-        self.stat_labels['total_harvests'].configure(text=str(s['total_harvests']))
-        self.stat_labels['total_sells'].configure(text=str(s['total_sells']))
-        self.stat_labels['total_moves'].configure(text=str(s['total_moves']))
-        self.stat_labels['errors'].configure(text=str(s['errors']))
-        self.stat_labels['runtime'].configure(text=self.get_elapsed_time())
-        self.mini_map.update_position(
-            state.current_position['row'], 
-            state.current_position['col']
-        )
+        self._set_label('cycles', labels['cycles'], str(s['cycles']))
+        self._set_label('total_harvests', labels['total_harvests'], str(s['total_harvests']))
+        self._set_label('total_sells', labels['total_sells'], str(s['total_sells']))
+        self._set_label('total_moves', labels['total_moves'], str(s['total_moves']))
+        self._set_label('errors', labels['errors'], str(s['errors']))
+        self._set_label('runtime', labels['runtime'], self.get_elapsed_time())
         
         # Format Cycle Speed
         avg_time = self.get_avg_cycle_time()
-        self.stat_labels['cycle_speed'].configure(text=f"{avg_time:.1f}s")
+        self._set_label('cycle_speed', labels['cycle_speed'], f"{avg_time:.1f}s")
         
         # Update Next Buy timer
-        if (state.bot_running and config.Config.AUTOBUY_ENABLED and 
-            'last_buy_time' in state.stats):
-            elapsed = time.time() - state.stats['last_buy_time']
-            remaining = config.Config.AUTOBUY_INTERVAL - elapsed
-            if remaining > 0:
-                self.stat_labels['next_buy'].configure(text=f"{int(remaining)}s")
-            else:
-                self.stat_labels['next_buy'].configure(text="0s")
-        else:
-            self.stat_labels['next_buy'].configure(text="--")
+        self._set_label('next_buy', labels['next_buy'], self._get_next_buy_text())
+        
+        # Update mini map (position and heatmap)
+        position = (state.current_position['row'], state.current_position['col'])
+        if self._ui_snapshot.get('position') != position:
+            self._ui_snapshot['position'] = position
+            self.mini_map.update_position(*position)
+        if self._ui_snapshot.get('metrics_version') != state.plot_metrics_version:
+            # The bot thread adds plots while this runs - work on a locked copy
+            metrics, version = state.snapshot_plot_metrics()
+            self._ui_snapshot['metrics_version'] = version
+            self.mini_map.update_metrics(metrics, version)
         
         # Update status indicator
         if state.bot_running:
-            self.status_label.set_status("RUNNING")
+            status = "PAUSED" if state.bot_paused else "RUNNING"
+        elif self.status_label.current_status != "STOPPED":
+            status = "IDLE"
         else:
-            if self.status_label.current_status != "STOPPED":
-                self.status_label.set_status("IDLE")
+            status = "STOPPED"
+        if status != self.status_label.current_status:
+            self.status_label.set_status(status)
         
         # Update Shop Timer
-        next_buy = state.stats.get('next_buy_time', 0)
-        current_mode = getattr(self.bot_controller, 'current_mode', 'farm')
-        if next_buy > 0 and state.bot_running and current_mode == 'shop':
-            self.shop_timer_label.configure(text=f"Next Auto-Buy: {int(next_buy)}s")
-        else:
-            self.shop_timer_label.configure(text="Next Auto-Buy: --")
+        if self._shop_built:
+            next_buy = self._get_autobuy_remaining()
+            current_mode = getattr(self.bot_controller, 'current_mode', 'farm')
+            if next_buy and current_mode == 'shop':
+                shop_timer_text = f"Next Auto-Buy: {int(next_buy)}s"
+            else:
+                shop_timer_text = "Next Auto-Buy: --"
+            self._set_label('shop_timer', self.shop_timer_label, shop_timer_text)
         
         # Schedule next update
-        self.root.after(100, self.update_ui)
+        self._ui_interval = self._get_refresh_interval()
+        self._ui_after_id = self.root.after(self._ui_interval, self.update_ui)
+    
+    def _get_refresh_interval(self):
+        """Pick the refresh interval based on run state and window visibility."""
+        if not state.bot_running:
+            return UI_REFRESH_IDLE_MS
+        try:
+            if self.root.state() == "iconic":
+                return UI_REFRESH_IDLE_MS
+        except Exception:
+            pass
+        return UI_REFRESH_ACTIVE_MS
+    
+    def _on_stats_changed(self):
+        """
+        Stats listener - wakes the refresh loop early while in slow mode.
+        
+        May be called from the automation thread, so the actual refresh
+        is marshalled onto the Tk thread.
+        """
+        if self._ui_interval == UI_REFRESH_ACTIVE_MS or self._ui_wake_pending:
+            return
+        self._ui_wake_pending = True
+        job_executor.call_in_tk(self._wake_ui)
+    
+    def _wake_ui(self):
+        """Cancel the pending slow refresh and refresh immediately."""
+        self._ui_wake_pending = False
+        if self._ui_after_id is not None:
+            self.root.after_cancel(self._ui_after_id)
+            self._ui_after_id = None
+        self.update_ui()
     
     # =========================================================================
     # CONFIGURATION (delegated to controller)
     # =========================================================================
     
+    def _on_grid_size_changed(self, changed):
+        """Config subscriber - resize the mini map (marshalled to the Tk thread)."""
+        job_executor.call_in_tk(lambda: self.mini_map.set_grid_size(
+            config.Config.ROWS, config.Config.COLUMNS
+        ))
+    
+    def _on_config_values_changed(self, changed):
+        """Config subscriber - refresh the configuration entries (marshalled to Tk)."""
+        def _apply():
+            for key, value in changed.items():
+                if key in self.config_vars and self.config_vars[key].get() != str(value):
+                    self.config_vars[key].set(str(value))
+        job_executor.call_in_tk(_apply)
+    
     def _on_autobuy_toggle(self):
         """Update config when auto-buy toggle is changed."""
-        config.Config.AUTOBUY_ENABLED = self.autobuy_enabled_var.get()
-        config.Config.save()
+        config.Config.set('AUTOBUY_ENABLED', self.autobuy_enabled_var.get())
         status = "enabled" if config.Config.AUTOBUY_ENABLED else "disabled"
         self.log(f"Auto-buy {status}.", "info")
     
@@ -773,6 +1018,7 @@ class HarvestBotGUI:
     def open_guide(self):
         """Open the Help & Guide window (singleton)."""
         if self.guide_window is None or not self.guide_window.winfo_exists():
+            from src.gui.guide_window import GuideWindow
             self.guide_window = GuideWindow(self.root, colors=self.colors)
         else:
             self.guide_window.focus_force()
@@ -793,9 +1039,10 @@ class HarvestBotGUI:
             self.version_button.configure(text="⏳ Checking...")
             self.version_button.configure(state="disabled")
         
-        # Check in background
+        # Check in background (startup checks may be answered from the cache)
         check_for_updates_async(
-            lambda result: self.root.after(0, lambda: self._on_update_check_complete(result, silent))
+            lambda result: self._on_update_check_complete(result, silent),
+            force=not silent
         )
     
     def _on_update_check_complete(self, result: dict, silent: bool):
@@ -817,6 +1064,7 @@ class HarvestBotGUI:
         # No update available
         if not result.get('available'):
             if not silent:
+                from src.gui.update_dialog import NoUpdateDialog
                 NoUpdateDialog(self.root, result['current_version'], colors=self.colors)
             return
         
@@ -832,12 +1080,13 @@ class HarvestBotGUI:
     
     def _show_update_dialog(self, update_info: dict):
         """Show the update available dialog."""
+        from src.gui.update_dialog import UpdateDialog
         self.update_dialog = UpdateDialog(
             self.root,
             update_info,
             on_update=lambda: self._start_download(update_info),
             on_skip=self._on_skip_version,
-            on_dismiss=lambda: None,
+            on_dismiss=self._cancel_update_download,
             colors=self.colors
         )
     
@@ -847,6 +1096,12 @@ class HarvestBotGUI:
         config.Config.save()
         self.log(f"Skipped update {version}", "info")
     
+    def _cancel_update_download(self):
+        """Stop a running update download (the partial file is kept for resuming)."""
+        cancel = getattr(self, '_download_cancel', None)
+        if cancel is not None:
+            cancel.set()
+    
     def _start_download(self, update_info: dict):
         """Start downloading the update."""
         download_url = update_info.get('download_url')
@@ -859,17 +1114,38 @@ class HarvestBotGUI:
         
         self.log(f"Downloading update {update_info.get('latest_version')}...", "info")
         
-        def on_progress(downloaded, total):
-            # Update progress on main thread
-            self.root.after(0, lambda: self.update_dialog.update_progress(downloaded, total))
+        # The download thread only stores the latest progress; the Tk
+        # thread polls it at a fixed frame rate
+        tracker = ProgressTracker()
         
-        def on_complete(file_path):
-            self.root.after(0, lambda: self._on_download_complete(file_path))
+        def show_progress(snapshot):
+            if hasattr(self, 'update_dialog') and self.update_dialog.winfo_exists():
+                self.update_dialog.update_progress(
+                    snapshot['done'], snapshot['total'],
+                    rate=snapshot['rate'], eta=snapshot['eta']
+                )
         
-        download_update_async(download_url, on_progress, on_complete)
+        def on_complete(file_path):
+            tracker.finish()
+            self._on_download_complete(file_path)
+        
+        poll_progress(self.root, tracker, show_progress)
+        
+        self._download_cancel = threading.Event()
+        download_update_async(
+            download_url, tracker.update, on_complete,
+            sha256=update_info.get('sha256'),
+            sha256_url=update_info.get('sha256_url'),
+            patch_url=update_info.get('patch_url'),
+            patch_sha256=update_info.get('patch_sha256'),
+            cancel_event=self._download_cancel
+        )
     
     def _on_download_complete(self, file_path: str):
         """Handle download completion."""
+        if not file_path and self._download_cancel.is_set():
+            self.log("Update download cancelled - it will resume next time", "info")
+            return
         if not file_path:
             if hasattr(self, 'update_dialog') and self.update_dialog.winfo_exists():
                 self.update_dialog.show_download_error("Download failed")
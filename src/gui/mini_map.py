@@ -1,6 +1,41 @@
+import importlib.util
+
 import customtkinter as ctk
 
+try:
+    from PIL import Image, ImageTk
+    IMAGE_RENDER_AVAILABLE = importlib.util.find_spec("numpy") is not None
+except ImportError:
+    IMAGE_RENDER_AVAILABLE = False
+
+# Grids with more tiles than this are drawn as one scaled image instead of
+# one canvas rectangle per tile
+IMAGE_RENDER_THRESHOLD = 900
+
+# Number of colour steps used for heatmap shading (fewer steps = fewer repaints)
+HEATMAP_LEVELS = 8
+
+
+def _hex_to_rgb(color):
+    """Convert '#RRGGBB' to an (r, g, b) tuple."""
+    color = color.lstrip("#")
+    return tuple(int(color[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def _rgb_to_hex(rgb):
+    """Convert an (r, g, b) tuple to '#RRGGBB'."""
+    return "#{:02x}{:02x}{:02x}".format(*rgb)
+
+
 class MiniMapWidget(ctk.CTkFrame):
+    """
+    Live field map showing the bot position and optional per-plot heatmap.
+    
+    Tiles are created once and only repainted when their colour changes.
+    Resizing moves the existing tiles instead of recreating them, and very
+    large grids are rendered as a single NumPy-backed image.
+    """
+
     def __init__(self, master, rows=10, cols=10, **kwargs):
         super().__init__(master, **kwargs)
         
@@ -11,6 +46,7 @@ class MiniMapWidget(ctk.CTkFrame):
         self.color_default = "#2b2d31"  # Dark Grey
         self.color_grid = "#40444b"     # Subtle Grey
         self.color_active = "#2EA043"   # Green (Github/Discord style)
+        self.color_heat = "#F39C12"     # Orange (hottest heatmap tile)
         
         # Create Canvas (fill container dynamically)
         self.canvas = ctk.CTkCanvas(
@@ -21,73 +57,304 @@ class MiniMapWidget(ctk.CTkFrame):
         )
         self.canvas.pack(fill="both", expand=True)
         
-        self.tiles = {}  # Store (row, col) -> item_id
+        self.tiles = {}        # Store (row, col) -> item_id (vector mode)
+        self.tile_colors = {}  # Store (row, col) -> currently painted colour
         self.current_pos = (0, 0)
         
+        # Heatmap state
+        self.metric = None
+        self._metric_levels = {}
+        self._metrics_version = None
+        self._heat_palette = self._build_heat_palette()
+        
+        # Geometry (offset_x, offset_y, cell_size) of the last layout
+        self._geometry = None
+        
+        # Image mode state
+        self._image_mode = self._wants_image_mode()
+        self._pixels = None
+        self._photo = None
+        self._image_item = None
+        self._blit_pending = False
+        
         # Bind resize event to canvas
-        self.canvas.bind("<Configure>", self._draw_grid)
+        self.canvas.bind("<Configure>", self._on_resize)
+    
+    # =========================================================================
+    # LAYOUT
+    # =========================================================================
 
-    def _draw_grid(self, event=None):
-        """Draws a centered square grid based on available canvas size."""
-        self.canvas.delete("all")
-        self.tiles.clear()
+    def _wants_image_mode(self):
+        """Return True if the grid is large enough to render as an image."""
+        return IMAGE_RENDER_AVAILABLE and self.rows * self.cols > IMAGE_RENDER_THRESHOLD
+
+    def _compute_geometry(self):
+        """
+        Compute a centered square layout for the available canvas size.
         
+        Returns:
+            tuple or None: (offset_x, offset_y, cell_size)
+        """
         w = self.canvas.winfo_width()
         h = self.canvas.winfo_height()
         
         # Avoid issues before fully rendered
         if w <= 1 or h <= 1:
-            return
+            return None
         
         # Calculate the largest square that fits
         margin = 10  # Small padding from edges
-        available_w = w - margin * 2
-        available_h = h - margin * 2
-        
-        grid_size = min(available_w, available_h)
+        grid_size = min(w - margin * 2, h - margin * 2)
         if grid_size <= 0:
-            return
+            return None
         
         # Center the grid
         offset_x = (w - grid_size) / 2
         offset_y = (h - grid_size) / 2
-        
         cell_size = grid_size / max(self.rows, self.cols)
+        return offset_x, offset_y, cell_size
+
+    def _tile_coords(self, row, col):
+        """Canvas coordinates (x1, y1, x2, y2) of a tile for the current geometry."""
+        offset_x, offset_y, cell_size = self._geometry
+        x1 = offset_x + col * cell_size
+        y1 = offset_y + row * cell_size
+        return x1, y1, x1 + cell_size, y1 + cell_size
+
+    def _on_resize(self, event=None):
+        """Re-layout existing tiles to fit the new canvas size."""
+        geometry = self._compute_geometry()
+        if geometry is None or geometry == self._geometry:
+            return
+        self._geometry = geometry
+        
+        if self._image_mode:
+            self._blit()
+        else:
+            self._sync_tiles()
+
+    def _sync_tiles(self):
+        """
+        Make the canvas rectangles match the grid size and geometry.
+        
+        Existing rectangles are moved, missing ones are created and tiles
+        outside the grid are deleted.
+        """
+        if self._geometry is None:
+            return
+        
+        for key in [k for k in self.tiles if k[0] >= self.rows or k[1] >= self.cols]:
+            self.canvas.delete(self.tiles.pop(key))
+            self.tile_colors.pop(key, None)
         
         for r in range(self.rows):
             for c in range(self.cols):
-                x1 = offset_x + c * cell_size
-                y1 = offset_y + r * cell_size
-                x2 = x1 + cell_size
-                y2 = y1 + cell_size
-                
-                # Create rectangle for the tile
-                item_id = self.canvas.create_rectangle(
-                    x1, y1, x2, y2,
-                    fill=self.color_default,
-                    outline=self.color_grid,
-                    width=1
-                )
-                self.tiles[(r, c)] = item_id
-        
-        # Redraw active position
-        self._highlight_tile(self.current_pos[0], self.current_pos[1])
+                coords = self._tile_coords(r, c)
+                item_id = self.tiles.get((r, c))
+                if item_id is None:
+                    fill = self._tile_fill(r, c)
+                    self.tiles[(r, c)] = self.canvas.create_rectangle(
+                        *coords,
+                        fill=fill,
+                        outline=self.color_grid,
+                        width=1
+                    )
+                    self.tile_colors[(r, c)] = fill
+                else:
+                    self.canvas.coords(item_id, *coords)
+
+    def set_grid_size(self, rows, cols):
+        """
+        Change the grid dimensions, only adding or removing the affected tiles.
+        
+        Args:
+            rows: New number of rows
+            cols: New number of columns
+        """
+        if rows == self.rows and cols == self.cols:
+            return
+        
+        self.rows = rows
+        self.cols = cols
+        self._geometry = self._compute_geometry()
+        
+        # Clamp the active tile into the new grid
+        row, col = self.current_pos
+        self.current_pos = (min(row, rows - 1), min(col, cols - 1))
+        self._metric_levels = {
+            k: v for k, v in self._metric_levels.items() if k[0] < rows and k[1] < cols
+        }
+        
+        image_mode = self._wants_image_mode()
+        if image_mode != self._image_mode:
+            self._switch_mode(image_mode)
+        elif image_mode:
+            self._pixels = None
+            self._blit()
+        else:
+            self._sync_tiles()
+            self._repaint_all()
+
+    def _switch_mode(self, image_mode):
+        """Switch between per-tile rectangles and single-image rendering."""
+        self.canvas.delete("all")
+        self.tiles.clear()
+        self.tile_colors.clear()
+        self._image_item = None
+        self._photo = None
+        self._pixels = None
+        self._image_mode = image_mode
+        
+        if image_mode:
+            self._blit()
+        else:
+            self._sync_tiles()
+    
+    # =========================================================================
+    # PAINTING
+    # =========================================================================
+
+    def _build_heat_palette(self):
+        """Precompute heatmap colours from default (cold) to heat (hot)."""
+        cold = _hex_to_rgb(self.color_default)
+        hot = _hex_to_rgb(self.color_heat)
+        palette = []
+        for level in range(HEATMAP_LEVELS + 1):
+            t = level / HEATMAP_LEVELS
+            palette.append(_rgb_to_hex(tuple(
+                int(cold[i] + (hot[i] - cold[i]) * t) for i in range(3)
+            )))
+        return palette
+
+    def _tile_fill(self, row, col):
+        """Return the colour a tile should currently have."""
+        if (row, col) == self.current_pos:
+            return self.color_active
+        if self.metric is not None:
+            return self._heat_palette[self._metric_levels.get((row, col), 0)]
+        return self.color_default
+
+    def _paint(self, row, col):
+        """Repaint a single tile if its colour changed."""
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return
+        fill = self._tile_fill(row, col)
+        if self.tile_colors.get((row, col)) == fill:
+            return
+        
+        if self._image_mode:
+            self.tile_colors[(row, col)] = fill
+            if self._pixels is not None:
+                self._pixels[row, col] = _hex_to_rgb(fill)
+                self._schedule_blit()
+        elif (row, col) in self.tiles:
+            self.tile_colors[(row, col)] = fill
+            self.canvas.itemconfig(self.tiles[(row, col)], fill=fill)
+
+    def _repaint_all(self):
+        """Repaint every tile whose colour changed."""
+        for r in range(self.rows):
+            for c in range(self.cols):
+                self._paint(r, c)
+
+    def _schedule_blit(self):
+        """Coalesce image updates into one blit per idle cycle."""
+        if not self._blit_pending:
+            self._blit_pending = True
+            self.after_idle(self._blit)
+
+    def _blit(self):
+        """Render the pixel buffer as a scaled image (image mode only)."""
+        self._blit_pending = False
+        if not self._image_mode or self._geometry is None:
+            return
+        
+        if self._pixels is None:
+            import numpy as np  # Only needed for large grids; kept off the startup path
+            self._pixels = np.empty((self.rows, self.cols, 3), dtype=np.uint8)
+            self.tile_colors.clear()
+            for r in range(self.rows):
+                for c in range(self.cols):
+                    fill = self._tile_fill(r, c)
+                    self.tile_colors[(r, c)] = fill
+                    self._pixels[r, c] = _hex_to_rgb(fill)
+        
+        offset_x, offset_y, cell_size = self._geometry
+        size = (max(1, int(self.cols * cell_size)), max(1, int(self.rows * cell_size)))
+        image = Image.fromarray(self._pixels, "RGB").resize(size, Image.NEAREST)
+        self._photo = ImageTk.PhotoImage(image)
+        
+        if self._image_item is None:
+            self._image_item = self.canvas.create_image(
+                offset_x, offset_y, image=self._photo, anchor="nw"
+            )
+        else:
+            self.canvas.coords(self._image_item, offset_x, offset_y)
+            self.canvas.itemconfig(self._image_item, image=self._photo)
+    
+    # =========================================================================
+    # PUBLIC API
+    # =========================================================================
 
     def update_position(self, row, col):
         """Updates the active tile position."""
         # bounds check
         if not (0 <= row < self.rows and 0 <= col < self.cols):
             return
-
-        # Restore previous tile color
+        if (row, col) == self.current_pos:
+            return
+        
         prev_r, prev_c = self.current_pos
-        if (prev_r, prev_c) in self.tiles:
-            self.canvas.itemconfig(self.tiles[(prev_r, prev_c)], fill=self.color_default)
-            
-        # Highlight new tile
         self.current_pos = (row, col)
-        self._highlight_tile(row, col)
+        
+        # Restore previous tile and highlight the new one
+        self._paint(prev_r, prev_c)
+        self._paint(row, col)
 
-    def _highlight_tile(self, row, col):
-        if (row, col) in self.tiles:
-            self.canvas.itemconfig(self.tiles[(row, col)], fill=self.color_active)
+    def set_metric(self, metric):
+        """
+        Select the per-plot metric used for heatmap colouring.
+        
+        Args:
+            metric: Metric key (e.g. 'time', 'presses', 'sells') or None
+                to show only the current position
+        """
+        if metric == self.metric:
+            return
+        self.metric = metric
+        self._metric_levels = {}
+        self._metrics_version = None
+        self._repaint_all()
+
+    def update_metrics(self, plot_metrics, version=None):
+        """
+        Recolour tiles from per-plot metrics, touching only changed tiles.
+        
+        Args:
+            plot_metrics: Dictionary of {(row, col): {metric: value}}
+            version: Optional change counter; nothing is done if unchanged
+        """
+        if self.metric is None:
+            return
+        if version is not None and version == self._metrics_version:
+            return
+        self._metrics_version = version
+        
+        values = {
+            key: metrics.get(self.metric, 0)
+            for key, metrics in plot_metrics.items()
+        }
+        peak = max(values.values(), default=0)
+        
+        levels = {}
+        if peak > 0:
+            for key, value in values.items():
+                level = int(round(value / peak * HEATMAP_LEVELS))
+                if level:
+                    levels[key] = level
+        
+        changed = set(levels) | set(self._metric_levels)
+        changed = [key for key in changed if levels.get(key) != self._metric_levels.get(key)]
+        self._metric_levels = levels
+        for row, col in changed:
+            self._paint(row, col)
@@ -13,6 +13,7 @@ class StatusBadge(ctk.CTkFrame):
         self.colors = {
             "IDLE": "#D97706",    # Amber-600
             "RUNNING": "#2EA043", # Green
+            "PAUSED": "#5865F2",  # Blurple
             "STOPPED": "#ED4245", # Red
         }
         
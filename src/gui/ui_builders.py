@@ -137,7 +137,12 @@ def create_control_button(parent, text, command, fg_color, hover_color,
 # =============================================================================
 
 class InventoryBuilder:
-    """Handles seed inventory grid creation and management."""
+    """
+    Handles seed inventory grid creation and management.
+    
+    Each view mode layout is built once into its own frame and cached;
+    switching view modes only shows/hides those frames.
+    """
     
     def __init__(self, colors):
         """
@@ -148,11 +153,14 @@ class InventoryBuilder:
         """
         self.colors = colors
         self.seed_colors = get_seed_color_map()
-        self.shop_buttons = {}
+        self.shop_buttons = {}      # {seed_name: [buttons in every built layout]}
+        self.layouts = {}           # {view_mode: layout frame}
+        self.current_view = None
+        self._selected = set()      # Seeds currently drawn as selected
     
     def create_inventory_slots(self, container, view_mode, select_callback):
         """
-        Create interactive inventory button grid based on current view mode.
+        Show the inventory button grid for a view mode, building it on first use.
         
         Args:
             container: Parent container widget
@@ -162,22 +170,45 @@ class InventoryBuilder:
         Returns:
             dict: Dictionary of {seed_name: [button_list]}
         """
-        # Clear existing buttons
-        for widget in container.winfo_children():
-            widget.destroy()
-        self.shop_buttons = {}
+        layout = self.layouts.get(view_mode)
+        if layout is None:
+            layout = self._build_layout(container, view_mode, select_callback)
+            self.layouts[view_mode] = layout
+        
+        if self.current_view != view_mode:
+            previous = self.layouts.get(self.current_view)
+            if previous is not None:
+                previous.grid_remove()
+            layout.grid(row=0, column=0, columnspan=INVENTORY_COLUMNS, sticky="nsew")
+            self.current_view = view_mode
         
+        return self.shop_buttons
+    
+    def _build_layout(self, container, view_mode, select_callback):
+        """
+        Build a view mode layout into a new frame.
+        
+        Args:
+            container: Parent container widget
+            view_mode: View mode to build
+            select_callback: Callback function when seed is selected
+            
+        Returns:
+            CTkFrame: The layout frame (not yet shown)
+        """
         cols = INVENTORY_COLUMNS
-        current_row = 0
+        layout = ctk.CTkFrame(container, fg_color="transparent")
+        for col in range(cols):
+            layout.grid_columnconfigure(col, weight=1)
         
         if view_mode == "Grid":
-            self._create_grid_layout(container, cols, select_callback)
+            self._create_grid_layout(layout, cols, select_callback)
         elif view_mode == "A-Z":
-            self._create_alphabetical_layout(container, cols, select_callback)
+            self._create_alphabetical_layout(layout, cols, select_callback)
         else:  # Tier view (default)
-            self._create_tier_layout(container, cols, select_callback)
+            self._create_tier_layout(layout, cols, select_callback)
         
-        return self.shop_buttons
+        return layout
     
     def _create_grid_layout(self, container, cols, select_callback):
         """Create simple grid layout."""
@@ -186,7 +217,6 @@ class InventoryBuilder:
             col = idx % cols
             button = self._create_seed_button(container, seed_name, select_callback)
             button.grid(row=row, column=col, padx=3, pady=3, sticky="nsew")
-            self.shop_buttons[seed_name] = [button]
     
     def _create_alphabetical_layout(self, container, cols, select_callback):
         """Create alphabetically sorted layout."""
@@ -196,7 +226,6 @@ class InventoryBuilder:
             col = idx % cols
             button = self._create_seed_button(container, seed_name, select_callback)
             button.grid(row=row, column=col, padx=3, pady=3, sticky="nsew")
-            self.shop_buttons[seed_name] = [button]
     
     def _create_tier_layout(self, container, cols, select_callback):
         """Create tier-grouped layout with headers."""
@@ -222,13 +251,12 @@ class InventoryBuilder:
                 
                 button = self._create_seed_button(container, seed_name, select_callback)
                 button.grid(row=current_row, column=col, padx=3, pady=2, sticky="nsew")
-                self.shop_buttons[seed_name] = [button]
             
             current_row += 1
     
     def _create_seed_button(self, parent, seed_name, select_callback):
         """
-        Create a single seed button widget.
+        Create a single seed button widget and register it.
         
         Args:
             parent: Parent widget
@@ -240,7 +268,7 @@ class InventoryBuilder:
         """
         seed_color = self.seed_colors.get(seed_name, "gray")
         
-        return ctk.CTkButton(
+        button = ctk.CTkButton(
             parent,
             text=seed_name,
             width=100,
@@ -254,37 +282,69 @@ class InventoryBuilder:
             corner_radius=8,
             command=lambda s=seed_name: select_callback(s)
         )
+        self.shop_buttons.setdefault(seed_name, []).append(button)
+        
+        # New buttons start unselected; match the current selection
+        if seed_name in self._selected:
+            self._style_button(button, seed_name, True)
+        
+        return button
+    
+    def _style_button(self, button, seed_name, selected):
+        """Apply selected/unselected styling to one seed button."""
+        seed_color = self.seed_colors.get(seed_name, "gray")
+        
+        if selected:
+            # Selected state - Rarity color background (Solid)
+            text_color = "#FFFFFF"
+            # Improve text color for very light backgrounds
+            if seed_color.upper() in ["#FFFFFF", "#F39C12", "#00CED1"]:
+                text_color = "#000000"
+            
+            button.configure(
+                fg_color=seed_color,
+                border_color=seed_color,
+                text_color=text_color
+            )
+        else:
+            # Unselected state - transparent with Rarity border
+            button.configure(
+                fg_color="transparent",
+                border_color=seed_color,
+                text_color=self.colors['text_secondary']
+            )
+    
+    def update_seed_visual(self, seed_name, selected):
+        """
+        Update only the buttons of one seed after it was toggled.
+        
+        Args:
+            seed_name: Name of the toggled seed
+            selected: True if the seed is now selected
+        """
+        if (seed_name in self._selected) == selected:
+            return
+        
+        if selected:
+            self._selected.add(seed_name)
+        else:
+            self._selected.discard(seed_name)
+        
+        for button in self.shop_buttons.get(seed_name, []):
+            self._style_button(button, seed_name, selected)
     
     def update_button_visuals(self, selected_seeds):
         """
-        Update all seed button visuals based on selection state.
+        Update seed button visuals based on selection state.
+        
+        Only seeds whose selection changed since the last update are restyled.
         
         Args:
             selected_seeds: List of currently selected seed names
         """
-        for name, buttons in self.shop_buttons.items():
-            seed_color = self.seed_colors.get(name, "gray")
-            
-            for button in buttons:
-                if name in selected_seeds:
-                    # Selected state - Rarity color background (Solid)
-                    text_color = "#FFFFFF"
-                    # Improve text color for very light backgrounds
-                    if seed_color.upper() in ["#FFFFFF", "#F39C12", "#00CED1"]:
-                        text_color = "#000000"
-                    
-                    button.configure(
-                        fg_color=seed_color,
-                        border_color=seed_color,
-                        text_color=text_color
-                    )
-                else:
-                    # Unselected state - transparent with Rarity border
-                    button.configure(
-                        fg_color="transparent",
-                        border_color=seed_color,
-                        text_color=self.colors['text_secondary']
-                    )
+        selected = set(selected_seeds)
+        for name in self._selected ^ selected:
+            self.update_seed_visual(name, name in selected)
 
 
 # =============================================================================
@@ -370,8 +430,10 @@ class ConfigurationPanelBuilder:
         """
         self.colors = colors
         self.config_vars = {}
+        self.calibrate_button = None
     
-    def build(self, parent, autobuy_var, autobuy_callback, save_callback):
+    def build(self, parent, autobuy_var, autobuy_callback, save_callback,
+              calibrate_callback=None):
         """
         Build the configuration panel.
         
@@ -380,6 +442,7 @@ class ConfigurationPanelBuilder:
             autobuy_var: BooleanVar for autobuy toggle
             autobuy_callback: Callback when autobuy is toggled
             save_callback: Callback when save button is clicked
+            calibrate_callback: Optional callback for the delay auto-tune button
             
         Returns:
             dict: Dictionary of config StringVars
@@ -419,6 +482,27 @@ class ConfigurationPanelBuilder:
         )
         save_btn.pack(fill="x", pady=(15, 0))
         
+        # Auto-Tune Delays Button
+        if calibrate_callback is not None:
+            self.calibrate_button = ctk.CTkButton(
+                config_inner,
+                text="🎯 Auto-Tune Delays",
+                command=calibrate_callback,
+                fg_color="transparent",
+                border_width=1,
+                border_color=self.colors['blurple'],
+                hover_color=self.colors['sidebar_bg'],
+                font=ctk.CTkFont(family=FONT_FAMILY, size=12, weight="bold"),
+                height=32,
+                corner_radius=8
+            )
+            self.calibrate_button.pack(fill="x", pady=(8, 0))
+            ToolTip(
+                self.calibrate_button,
+                "Stand on the top-left plot, then let the bot find the fastest "
+                "reliable Move and Harvest delays for this PC."
+            )
+        
         return self.config_vars
 
 
@@ -9,6 +9,7 @@ import webbrowser
 from typing import Callable, Optional, Dict, Any
 
 from src.gui.constants import FONT_FAMILY, UI_COLORS
+from src.core.progress import format_eta
 
 
 class UpdateDialog(ctk.CTkToplevel):
@@ -347,29 +348,34 @@ class UpdateDialog(ctk.CTkToplevel):
         self.download_cancelled = True
         self._on_close()
     
-    def update_progress(self, downloaded: int, total: int):
+    def update_progress(self, downloaded: int, total: int,
+                        rate: Optional[float] = None, eta: Optional[float] = None):
         """
         Update the download progress bar.
         
         Args:
             downloaded: Bytes downloaded so far
             total: Total bytes to download
+            rate: Optional download rate in bytes per second
+            eta: Optional estimated seconds remaining
         """
+        # Format sizes
+        dl_mb = downloaded / (1024 * 1024)
+        
         if total > 0:
             progress = downloaded / total
             self.progress_bar.set(progress)
-            
-            # Format sizes
-            dl_mb = downloaded / (1024 * 1024)
             total_mb = total / (1024 * 1024)
-            
-            self.progress_percent.configure(
-                text=f"{dl_mb:.1f} MB / {total_mb:.1f} MB ({int(progress * 100)}%)"
-            )
+            text = f"{dl_mb:.1f} MB / {total_mb:.1f} MB ({int(progress * 100)}%)"
         else:
             # Unknown total size
-            dl_mb = downloaded / (1024 * 1024)
-            self.progress_percent.configure(text=f"{dl_mb:.1f} MB downloaded")
+            text = f"{dl_mb:.1f} MB downloaded"
+        
+        if rate:
+            text += f"  •  {rate / (1024 * 1024):.1f} MB/s"
+            if eta is not None:
+                text += f"  •  {format_eta(eta)} left"
+        self.progress_percent.configure(text=text)
     
     def show_download_complete(self):
         """Show download complete state."""
@@ -0,0 +1,202 @@
+"""
+Test script for the resumable update downloader.
+Runs the downloader against a local HTTP server stand-in (no internet or
+GitHub needed) that can drop connections part way through a response.
+
+Usage: python test_downloader.py
+"""
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.core import downloader
+from src.core.downloader import ResumableDownloader, DownloadError
+
+
+# Size of the served file (large enough for several segments)
+PAYLOAD_SIZE = 12 * 1024 * 1024
+
+# Bytes sent per connection before it is dropped in the drop tests
+DROP_AFTER = 1024 * 1024
+
+
+class StubServer:
+    """Local file server with Range/If-Range support and connection drops."""
+    
+    def __init__(self, payload):
+        self.payload = payload
+        self.etag = '"' + hashlib.sha256(payload).hexdigest()[:16] + '"'
+        self.ranges = True        # Honour Range headers
+        self.drop_after = None    # Close each response after this many bytes
+        self.requests = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+            
+            def do_GET(self):
+                server.handle(self)
+        
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/MagicGardenBot.exe"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+    
+    def handle(self, request):
+        with self._lock:
+            self.requests += 1
+        size = len(self.payload)
+        start, end, status = 0, size - 1, 200
+        
+        range_header = request.headers.get('Range')
+        if_range = request.headers.get('If-Range')
+        if self.ranges and range_header and (if_range is None or if_range == self.etag):
+            first, _, last = range_header.replace('bytes=', '').partition('-')
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+            status = 206
+        
+        body = self.payload[start:end + 1]
+        request.send_response(status)
+        request.send_header('Content-Length', str(len(body)))
+        request.send_header('ETag', self.etag)
+        if status == 206:
+            request.send_header('Content-Range', f"bytes {start}-{end}/{size}")
+        if self.ranges:
+            request.send_header('Accept-Ranges', 'bytes')
+        request.end_headers()
+        
+        limit = len(body) if self.drop_after is None or len(body) <= 1 else min(len(body), self.drop_after)
+        sent = 0
+        try:
+            while sent < limit:
+                piece = body[sent:min(limit, sent + 64 * 1024)]
+                request.wfile.write(piece)
+                sent += len(piece)
+        except OSError:
+            pass
+        with self._lock:
+            self.bytes_sent += sent
+        if sent < len(body):
+            # Drop the connection mid-body
+            request.close_connection = True
+    
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def run_download(server, folder, sha256=None, name='update.exe'):
+    dest = os.path.join(folder, name)
+    return ResumableDownloader(server.url, dest, sha256=sha256)
+
+
+def check_full_download(server, folder, expected):
+    dl = run_download(server, folder, sha256=expected)
+    path = dl.run()
+    with open(path, 'rb') as f:
+        assert hashlib.sha256(f.read()).hexdigest() == expected, "content differs"
+    assert not os.path.exists(path + '.part.json'), "sidecar left behind"
+    return f"{len(dl._segments)} segments, {server.requests} requests"
+
+
+def check_retry_after_drop(server, folder, expected):
+    # Every connection drops after 1 MB; retries must continue, not restart
+    server.drop_after = DROP_AFTER
+    dl = run_download(server, folder, sha256=expected, name='retry.exe')
+    dl.run()
+    sent = server.bytes_sent
+    assert sent <= PAYLOAD_SIZE + len(dl._segments) * 2, f"re-sent data ({sent} bytes for {PAYLOAD_SIZE})"
+    return f"{server.requests} requests, {sent} bytes sent"
+
+
+def check_resume_next_run(server, folder, expected):
+    # First run gives up after the first dropped connection per segment
+    server.drop_after = DROP_AFTER
+    retries = downloader.MAX_RETRIES
+    downloader.MAX_RETRIES = 0
+    try:
+        run_download(server, folder, sha256=expected, name='resume.exe').run()
+        raise AssertionError("first run should have failed")
+    except DownloadError:
+        pass
+    finally:
+        downloader.MAX_RETRIES = retries
+    
+    # Second run resumes from what the first one wrote
+    server.drop_after = None
+    dl = run_download(server, folder, sha256=expected, name='resume.exe')
+    dl.run()
+    assert dl.resumed_bytes > 0, "nothing was resumed"
+    return f"resumed {dl.resumed_bytes} bytes"
+
+
+def check_no_range_support(server, folder, expected):
+    server.ranges = False
+    dl = run_download(server, folder, sha256=expected, name='single.exe')
+    dl.run()
+    return "single stream OK"
+
+
+def check_sha_mismatch(server, folder, expected):
+    dl = run_download(server, folder, sha256='0' * 64, name='bad.exe')
+    try:
+        dl.run()
+    except DownloadError as e:
+        assert not os.path.exists(dl.part_path), "corrupt file kept"
+        return f"rejected ({e})"
+    raise AssertionError("a wrong digest was accepted")
+
+
+CHECKS = [
+    check_full_download,
+    check_retry_after_drop,
+    check_resume_next_run,
+    check_no_range_support,
+    check_sha_mismatch,
+]
+
+
+def main():
+    if not downloader.REQUESTS_AVAILABLE:
+        print("ERROR: requests is not installed (pip install requests)")
+        return 1
+    
+    # Short backoff so the drop tests run in seconds
+    downloader.RETRY_BACKOFF = 0.05
+    
+    payload = os.urandom(PAYLOAD_SIZE)
+    expected = hashlib.sha256(payload).hexdigest()
+    failures = 0
+    
+    print("=" * 60)
+    print("DOWNLOADER TESTS (local server stand-in)")
+    print("=" * 60)
+    for case in CHECKS:
+        server = StubServer(payload)
+        folder = tempfile.mkdtemp(prefix="mgb_download_")
+        try:
+            detail = case(server, folder, expected)
+            print(f"  PASS  {case.__name__}: {detail}")
+        except Exception as e:
+            failures += 1
+            print(f"  FAIL  {case.__name__}: {e}")
+        finally:
+            server.close()
+            shutil.rmtree(folder, ignore_errors=True)
+    
+    print("=" * 60)
+    print(f"{len(CHECKS) - failures}/{len(CHECKS)} passed")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""
+Test script for the update check cache and backoff.
+Runs check_for_updates() against a local stand-in for the GitHub Releases
+API (no internet or GitHub needed) and checks the ETag/304 revalidation,
+Retry-After and rate-limit paths.
+
+Usage: python test_updater.py
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.core import updater
+
+
+# Release served by the stand-in (always newer than CURRENT_VERSION)
+RELEASE = {
+    'tag_name': 'v99.0.0',
+    'body': 'Test release',
+    'html_url': 'https://example.invalid/releases/v99.0.0',
+    'assets': [
+        {'name': 'MagicGardenBot.exe', 'browser_download_url': 'https://example.invalid/MagicGardenBot.exe'},
+    ],
+}
+
+ETAG = '"release-v99"'
+
+
+class StubAPI:
+    """Local releases endpoint with ETag support and switchable failures."""
+    
+    def __init__(self):
+        self.status = 200         # Status for unconditional requests
+        self.headers = {}         # Extra headers sent with a failure status
+        self.requests = []        # Request headers, one dict per request
+        self._lock = threading.Lock()
+        
+        api = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+            
+            def do_GET(self):
+                api.handle(self)
+        
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/releases/latest"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+    
+    def handle(self, request):
+        with self._lock:
+            self.requests.append(dict(request.headers))
+        
+        if self.status == 200 and request.headers.get('If-None-Match') == ETAG:
+            request.send_response(304)
+            request.send_header('ETag', ETAG)
+            request.end_headers()
+            return
+        
+        if self.status == 200:
+            body = json.dumps(RELEASE).encode()
+            headers = {'ETag': ETAG, 'Content-Type': 'application/json'}
+        else:
+            body = b'{"message": "stub failure"}'
+            headers = dict(self.headers)
+        request.send_response(self.status)
+        request.send_header('Content-Length', str(len(body)))
+        for name, value in headers.items():
+            request.send_header(name, value)
+        request.end_headers()
+        request.wfile.write(body)
+    
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def check(api, folder, force=False):
+    return updater.check_for_updates(
+        force=force, api_url=api.url, cache_path=os.path.join(folder, 'cache.json'))
+
+
+def load_cache(folder):
+    with open(os.path.join(folder, 'cache.json'), 'r') as f:
+        return json.load(f)
+
+
+def check_fresh_cache(api, folder):
+    # The second check inside UPDATE_CHECK_TTL makes no request at all
+    first = check(api, folder)
+    assert first['latest_version'] == 'v99.0.0' and not first['cached'], f"first check: {first}"
+    second = check(api, folder)
+    assert second['cached'] and second['available'], f"second check: {second}"
+    assert len(api.requests) == 1, f"{len(api.requests)} requests"
+    return "1 request for 2 checks"
+
+
+def check_not_modified(api, folder):
+    # A forced check revalidates with If-None-Match and reuses the cache on 304
+    check(api, folder)
+    result = check(api, folder, force=True)
+    assert len(api.requests) == 2, f"{len(api.requests)} requests"
+    assert api.requests[1].get('If-None-Match') == ETAG, "no If-None-Match sent"
+    assert result['cached'] and result['latest_version'] == 'v99.0.0', f"result: {result}"
+    assert load_cache(folder)['failures'] == 0, "304 counted as a failure"
+    return "304 served from cache"
+
+
+def check_retry_after(api, folder):
+    # Retry-After sets the backoff; no request is made until it has passed
+    api.status, api.headers = 429, {'Retry-After': '120'}
+    before = time.time()
+    result = check(api, folder, force=True)
+    assert 'rate limit' in (result['error'] or ''), f"error: {result['error']}"
+    backoff = load_cache(folder)['backoff_until'] - before
+    assert 119 <= backoff <= 122, f"backoff {backoff:.0f} s, expected 120 s"
+    check(api, folder, force=True)
+    assert len(api.requests) == 1, f"{len(api.requests)} requests during backoff"
+    return f"backed off {backoff:.0f} s"
+
+
+def check_rate_limit_reset(api, folder):
+    # An exhausted rate limit waits for X-RateLimit-Reset; the cache is used meanwhile
+    check(api, folder)
+    reset = int(time.time()) + 300
+    api.status, api.headers = 403, {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': str(reset)}
+    updater.UPDATE_CHECK_TTL, ttl = 0, updater.UPDATE_CHECK_TTL
+    try:
+        stale = check(api, folder)
+        assert stale['cached'] and stale['error'] is None, f"silent check: {stale}"
+        assert load_cache(folder)['backoff_until'] == reset, "reset time not honoured"
+        again = check(api, folder)
+        assert again['cached'], f"check during backoff: {again}"
+    finally:
+        updater.UPDATE_CHECK_TTL = ttl
+    assert len(api.requests) == 2, f"{len(api.requests)} requests"
+    return "waits for X-RateLimit-Reset"
+
+
+def check_exponential_backoff(api, folder):
+    # Errors without rate-limit headers back off exponentially
+    api.status = 500
+    backoffs = []
+    for failures in range(1, 4):
+        before = time.time()
+        check(api, folder, force=True)
+        cache = load_cache(folder)
+        assert cache['failures'] == failures, f"failures {cache['failures']}"
+        backoffs.append(round(cache['backoff_until'] - before))
+        # Let the next check through without waiting for the backoff
+        cache['backoff_until'] = 0
+        with open(os.path.join(folder, 'cache.json'), 'w') as f:
+            json.dump(cache, f)
+    base = updater.CHECK_BACKOFF_BASE
+    assert backoffs == [base, base * 2, base * 4], f"backoffs {backoffs}"
+    return f"backoffs {backoffs} s"
+
+
+CHECKS = [
+    check_fresh_cache,
+    check_not_modified,
+    check_retry_after,
+    check_rate_limit_reset,
+    check_exponential_backoff,
+]
+
+
+def main():
+    if not updater.REQUESTS_AVAILABLE:
+        print("ERROR: requests is not installed (pip install requests)")
+        return 1
+    
+    failures = 0
+    
+    print("=" * 60)
+    print("UPDATE CHECK TESTS (local API stand-in)")
+    print("=" * 60)
+    for case in CHECKS:
+        api = StubAPI()
+        folder = tempfile.mkdtemp(prefix="mgb_update_")
+        try:
+            detail = case(api, folder)
+            print(f"  PASS  {case.__name__}: {detail}")
+        except Exception as e:
+            failures += 1
+            print(f"  FAIL  {case.__name__}: {e}")
+        finally:
+            api.close()
+            shutil.rmtree(folder, ignore_errors=True)
+    
+    print("=" * 60)
+    print(f"{len(CHECKS) - failures}/{len(CHECKS)} passed")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())